@@ -25,7 +25,12 @@ setup(
         "langchain_anthropic>=0.1.0",
         "uvicorn>=0.27.0",
         "fastapi>=0.109.0",
+        "aiofiles>=24.0.0",
+        "numpy>=1.26.0",
     ],
+    entry_points={
+        "console_scripts": ["memory-agent=memory_agent.__main__:main"],
+    },
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Programming Language :: Python :: 3",
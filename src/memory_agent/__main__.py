@@ -0,0 +1,92 @@
+"""
+Příkazová řádka Memory Agenta.
+
+Použití:
+    python -m memory_agent compile-snapshot [DATA_PATH] [-o VÝSTUP]
+    python -m memory_agent migrate-shards DATA_PATH VÝSTUP [--prefix-length N]
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from memory_agent.sharded_store import DEFAULT_PREFIX_LENGTH, migrate_to_shards
+from memory_agent.snapshot import compile_snapshot
+from memory_agent.tools import MockMCPConnector
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Sestaví parser argumentů příkazové řádky.
+
+    Returns:
+        argparse.ArgumentParser: Parser s podpříkazy Memory Agenta
+    """
+    parser = argparse.ArgumentParser(
+        prog="memory_agent", description="Nástroje pro správu dat Memory Agenta"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    snapshot_parser = subparsers.add_parser(
+        "compile-snapshot",
+        help="Zkompiluje adresář mock dat do binárního snapshotu",
+    )
+    snapshot_parser.add_argument(
+        "data_path",
+        nargs="?",
+        default=MockMCPConnector.MOCK_DATA_PATH,
+        help="Adresář s JSON daty (výchozí je MOCK_DATA_PATH)",
+    )
+    snapshot_parser.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="Cílový soubor snapshotu (výchozí je index.snapshot v adresáři dat)",
+    )
+
+    shards_parser = subparsers.add_parser(
+        "migrate-shards",
+        help="Převede plochý adresář dat na shardované uspořádání s manifestem",
+    )
+    shards_parser.add_argument("data_path", help="Plochý adresář s JSON daty")
+    shards_parser.add_argument("output_path", help="Cílový shardovaný adresář")
+    shards_parser.add_argument(
+        "--prefix-length",
+        type=int,
+        default=DEFAULT_PREFIX_LENGTH,
+        help="Počet hexadecimálních znaků hashe ID v názvu shardu (výchozí 2)",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Spustí příkaz Memory Agenta.
+
+    Args:
+        argv: Argumenty příkazové řádky (výchozí je sys.argv[1:])
+
+    Returns:
+        int: Návratový kód procesu
+    """
+    args = build_parser().parse_args(argv)
+
+    if args.command == "compile-snapshot":
+        header = compile_snapshot(args.data_path, args.output)
+        print(
+            f"Snapshot {header['path']}: {header['entity_count']} entit, "
+            f"{header['record_count']} záznamů, hash {header['content_hash']}"
+        )
+    elif args.command == "migrate-shards":
+        summary = migrate_to_shards(
+            args.data_path, args.output_path, args.prefix_length
+        )
+        print(
+            f"Shardovaný adresář {summary['path']}: {summary['entity_count']} entit, "
+            f"{summary['record_count']} záznamů v {summary['shard_count']} shardech"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,12 +5,88 @@ Podporuje detekci typu analýzy a extrakci názvu společnosti z dotazů.
 
 import asyncio
 import json
-from typing import Any, Dict, Tuple
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
 
-from .tools import AsyncMockMCPConnector, MockMCPConnector
+from .async_runner import get_background_runner
+from .connector_registry import get_connector_registry
+from .document_cache import freeze
+from .keyword_automaton import KeywordAutomaton
+from .query_parse import QueryParse, QueryParseCache, normalize_query
 
 # Constants
 RELATIONSHIP_SLICE_LIMIT = 100  # Limit the number of relationships to process
+ANALYZE_COMPANY_TIMEOUT = 30.0  # Termín (s) pro analyze_company ze sync kódu
+DEFAULT_MAX_CONCURRENCY = 32  # Společnosti načítané souběžně v analyze_companies_async
+
+# Klíčová slova typů analýzy s vahami (česky i anglicky, bez ohledu na diakritiku).
+# Pořadí typů rozhoduje při shodném skóre: riziko má přednost před dodavateli.
+# Samostatné slovo z fráze stejného typu ("chain" ze "supply chain") se
+# nepřidává, jinak by se jedna fráze započítala dvakrát.
+ANALYSIS_TYPE_KEYWORDS: Dict[str, Dict[str, float]] = {
+    "risk_comparison": {
+        "risk_comparison": 3.0,
+        "risk": 1.0,
+        "rizik": 1.0,
+        "rizic": 1.0,
+        "compliance": 1.0,
+        "sanction": 1.0,
+        "sankce": 1.0,
+        "bezpečnost": 1.0,
+        "security": 1.0,
+        "regulace": 1.0,
+        "regulation": 1.0,
+        "aml": 1.0,
+        "kyc": 1.0,
+        "fatf": 1.0,
+        "ofac": 1.0,
+        "embargo": 1.0,
+        "reputace": 1.0,
+    },
+    "supplier_analysis": {
+        "supplier_analysis": 3.0,
+        "supplier": 1.0,
+        "dodavatel": 1.0,
+        "supply chain": 1.0,
+        "řetězec": 1.0,
+        "relationship": 1.0,
+        "vztah": 1.0,
+        "dodávky": 1.0,
+        "tier": 1.0,
+        "odběratel": 1.0,
+        "procurement": 1.0,
+        "logistics": 1.0,
+        "logistika": 1.0,
+        "distributor": 1.0,
+        "vendor": 1.0,
+        "nákup": 1.0,
+    },
+}
+
+# Jeden automat nad klíčovými slovy všech typů analýzy
+_ANALYSIS_TYPE_AUTOMATON = KeywordAutomaton(
+    (
+        (keyword, analysis_type, weight)
+        for analysis_type, keywords in ANALYSIS_TYPE_KEYWORDS.items()
+        for keyword, weight in keywords.items()
+    )
+)
+_ANALYSIS_TYPE_AUTOMATON.compile()
+
+
+def rank_analysis_types(query: str) -> List[Tuple[str, float]]:
+    """
+    Ohodnotí typy analýzy podle klíčových slov v dotazu jedním průchodem.
+
+    Args:
+        query: Uživatelský dotaz
+
+    Returns:
+        List[Tuple[str, float]]: Dvojice (typ analýzy, jistota 0-1) seřazené
+        od nejpravděpodobnějšího typu; prázdný seznam, pokud dotaz neobsahuje
+        žádné klíčové slovo
+    """
+    return _ANALYSIS_TYPE_AUTOMATON.rank(query)
 
 
 def detect_analysis_type(query: str) -> str:
@@ -23,52 +99,129 @@ def detect_analysis_type(query: str) -> str:
     Returns:
         str: Typ analýzy (general, risk_comparison, supplier_analysis)
     """
-    query_lower = query.lower()
-
-    # Risk analysis keywords
-    risk_keywords = [
-        "risk",
-        "rizik",
-        "rizic",
-        "compliance",
-        "sanctions",
-        "sankce",
-        "bezpečnost",
-        "security",
-        "regulace",
-        "regulation",
-        "aml",
-        "kyc",
-        "fatf",
-        "ofac",
-        "embargo",
-        "reputace",
-    ]
+    ranked = rank_analysis_types(query)
+    return ranked[0][0] if ranked else "general"
 
-    # Supplier analysis keywords
-    supplier_keywords = [
-        "supplier",
-        "dodavatel",
-        "supply chain",
-        "relationships",
-        "vztahy",
-        "dodávky",
-        "tier",
-        "odběratel",
-        "procurement",
-        "logistics",
-        "logistika",
-        "distributor",
-        "vendor",
-        "nákup",
-    ]
 
-    if any(keyword in query_lower for keyword in risk_keywords):
-        return "risk_comparison"
-    elif any(keyword in query_lower for keyword in supplier_keywords):
-        return "supplier_analysis"
+def _build_query_parse(query: str, mentions: Iterable[Dict[str, Any]]) -> QueryParse:
+    """
+    Sestaví rozbor dotazu z nalezených zmínek a skóre typů analýzy.
+
+    Bez zmínky z gazetteeru se název vezme ze vzoru "Název; typ", případně
+    se krátký dotaz považuje za název společnosti.
+
+    Args:
+        query: User query about company
+        mentions: Zmínky společností z find_company_mentions
+
+    Returns:
+        QueryParse: Neměnný rozbor dotazu
+    """
+    frozen_mentions = tuple(freeze(mention) for mention in mentions)
+    company_name, entity_id = "", None
+    if frozen_mentions:
+        # Kanonický název entity, ne zápis z dotazu (ten zůstává v mentions)
+        company_name = frozen_mentions[0]["name"]
+        entity_id = frozen_mentions[0]["entity_id"]
+    elif ";" in query:
+        # Pattern: "CompanyName; analysis_type"
+        company_name = query.split(";", 1)[0].strip()
     else:
-        return "general"
+        # Use the query as company name if it's short and likely a company name
+        query_lower = query.lower()
+        if len(query.split()) <= 3 and not any(
+            word in query_lower
+            for word in [
+                "what",
+                "tell",
+                "about",
+                "analyze",
+                "risk",
+                "supplier",
+                "chain",
+            ]
+        ):
+            company_name = query.strip()
+
+    ranking = tuple(rank_analysis_types(query))
+    return QueryParse(
+        query=normalize_query(query),
+        company_name=company_name,
+        entity_id=entity_id,
+        mentions=frozen_mentions,
+        analysis_type=ranking[0][0] if ranking else "general",
+        confidence=ranking[0][1] if ranking else 0.0,
+        ranking=ranking,
+    )
+
+
+# Procesní cache rozborů dotazů sdílená uzly grafu i nástroji agenta
+_query_parse_cache = QueryParseCache()
+
+
+def get_query_parse_cache() -> QueryParseCache:
+    """
+    Vrátí procesní cache rozborů dotazů (např. pro statistiky zásahů).
+
+    Returns:
+        QueryParseCache: Sdílená instance cache
+    """
+    return _query_parse_cache
+
+
+def parse_query(query: str) -> QueryParse:
+    """
+    Rozebere dotaz: zmínky společností z gazetteeru a typ analýzy.
+
+    Výsledek se ukládá do LRU cache pod identitou indexu (cesta k datům
+    a procesně jedinečné číslo indexu) a normalizovaným dotazem, takže
+    opakovaný dotaz (i v rámci jednoho běhu grafu) se nerozebírá znovu a po
+    obnovení dat, přestavění registru nebo nad jinými daty se nepoužije
+    zastaralý rozbor.
+
+    Args:
+        query: User query about company
+
+    Returns:
+        QueryParse: Neměnný rozbor dotazu
+    """
+    # Pozice zmínek se vztahují k normalizovanému dotazu (QueryParse.query)
+    query = normalize_query(query)
+    connector = get_connector_registry().get()
+    try:
+        return _query_parse_cache.get_or_parse(
+            (connector.index_identity(), query),
+            lambda: _build_query_parse(query, connector.find_company_mentions(query)),
+        )
+    except Exception:
+        # Rozbor bez dat se neukládá, aby se po jejich zpřístupnění zopakoval
+        return _build_query_parse(query, ())
+
+
+async def parse_query_async(query: str) -> QueryParse:
+    """
+    Asynchronní verze parse_query; sdílí s ní cache rozborů.
+
+    Args:
+        query: User query about company
+
+    Returns:
+        QueryParse: Neměnný rozbor dotazu
+    """
+    query = normalize_query(query)
+    connector = get_connector_registry().get_async()
+    try:
+        key = (await connector.index_identity(), query)
+    except Exception:
+        return _build_query_parse(query, ())
+    parsed = _query_parse_cache.get(key)
+    if parsed is not None:
+        return parsed
+    try:
+        mentions = await connector.find_company_mentions(query)
+    except Exception:
+        return _build_query_parse(query, ())
+    return _query_parse_cache.put(key, _build_query_parse(query, mentions))
 
 
 def analyze_company_query(query: str) -> Tuple[str, str]:
@@ -81,79 +234,8 @@ def analyze_company_query(query: str) -> Tuple[str, str]:
     Returns:
         Tuple[str, str]: (company_name, analysis_type)
     """
-    # Normalize query for analysis
-    query_lower = query.lower().strip()
-
-    # Known company patterns from mock data
-    company_name_mapping = {
-        "mb tool": "MB TOOL",
-        "bos automotive": "BOS AUTOMOTIVE",
-        "adis tachov": "ADIS TACHOV",
-        "flídr plast": "Flídr plast",
-        "flidr plast": "Flídr plast",
-    }
-
-    # Try to find company name in query
-    company_name = ""
-    for company, formatted_name in company_name_mapping.items():
-        if company in query_lower:
-            company_name = formatted_name
-            break
-
-    # If no known company found, try to extract from simple patterns
-    if not company_name:
-        # Pattern: "CompanyName; analysis_type"
-        if ";" in query:
-            parts = query.split(";", 1)
-            company_name = parts[0].strip()
-        else:
-            # Use the query as company name if it's short and likely a company name
-            words = query.strip().split()
-            if len(words) <= 3 and not any(
-                word in query_lower
-                for word in [
-                    "what",
-                    "tell",
-                    "about",
-                    "analyze",
-                    "risk",
-                    "supplier",
-                    "chain",
-                ]
-            ):
-                company_name = query.strip()
-
-    # Determine analysis type
-    analysis_type = "general"  # default
-
-    # Risk analysis keywords
-    if any(
-        keyword in query_lower
-        for keyword in ["risk", "rizik", "compliance", "sanction", "sankce"]
-    ):
-        analysis_type = "risk_comparison"
-
-    # Supplier analysis keywords
-    elif any(
-        keyword in query_lower
-        for keyword in [
-            "supplier",
-            "dodavatel",
-            "chain",
-            "řetězec",
-            "vztah",
-            "relationship",
-        ]
-    ):
-        analysis_type = "supplier_analysis"
-
-    # Explicit type specification
-    elif "risk_comparison" in query_lower:
-        analysis_type = "risk_comparison"
-    elif "supplier_analysis" in query_lower:
-        analysis_type = "supplier_analysis"
-
-    return company_name, analysis_type
+    parsed = parse_query(query)
+    return parsed.company_name, parsed.analysis_type
 
 
 def get_analysis_prompt(analysis_type: str) -> str:
@@ -290,7 +372,182 @@ def format_analysis_data(
     }
 
 
-async def analyze_company_async(query: str) -> str:
+@dataclass(slots=True)
+class CompanyAnalysis:
+    """
+    Výsledek analýzy společnosti předávaný v rámci procesu.
+
+    Drží jen načtená data; formátovaná data a prompt analýzy se z nich
+    sestaví až na vyžádání, do JSONu se kódují jen s include_prompt.
+
+    Attributes:
+        query: User query about company
+        analysis_type: Typ analýzy (general, risk_comparison, supplier_analysis)
+        analysis_complete: True, pokud se data společnosti načetla
+        company_name: Název společnosti z dotazu
+        company_data: Data společnosti z MockMCPConnector
+        internal_data: Interní (finanční) data společnosti
+        relationships_data: Vztahy společnosti
+        error: Popis chyby, pokud analýza neproběhla
+        suggestion: Rada pro úpravu dotazu
+        query_type: Typ dotazu
+    """
+
+    query: str
+    analysis_type: str = "general"
+    analysis_complete: bool = False
+    company_name: str = ""
+    company_data: Optional[Dict[str, Any]] = None
+    internal_data: Dict[str, Any] = field(default_factory=dict)
+    relationships_data: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+    suggestion: Optional[str] = None
+    query_type: str = "company"
+
+    def formatted_data(self) -> Dict[str, str]:
+        """Vrátí data naformátovaná pro prompt analýzy."""
+        return format_analysis_data(
+            self.company_data or {}, self.internal_data, self.relationships_data
+        )
+
+    def analysis_prompt(self) -> str:
+        """Vrátí prompt analýzy podle typu analýzy."""
+        return get_analysis_prompt(self.analysis_type).format(
+            company_name=self.company_name, **self.formatted_data()
+        )
+
+    def to_dict(self, include_prompt: bool = False) -> Dict[str, Any]:
+        """
+        Převede výsledek na slovník pro serializaci.
+
+        Args:
+            include_prompt: Přidat formatted_data a analysis_prompt (duplikují
+                            data společnosti)
+
+        Returns:
+            Dict[str, Any]: Výsledek bez nevyplněných polí
+        """
+        result: Dict[str, Any] = {
+            "query_type": self.query_type,
+            "analysis_type": self.analysis_type,
+            "analysis_complete": self.analysis_complete,
+            "query": self.query,
+        }
+        if self.error is not None:
+            result["error"] = self.error
+        if self.suggestion is not None:
+            result["suggestion"] = self.suggestion
+        if self.analysis_complete:
+            result["company_name"] = self.company_name
+            result["company_data"] = self.company_data
+            result["internal_data"] = self.internal_data
+            result["relationships_data"] = self.relationships_data
+            if include_prompt:
+                result["formatted_data"] = self.formatted_data()
+                result["analysis_prompt"] = self.analysis_prompt()
+        return result
+
+    def to_json(self, include_prompt: bool = False) -> str:
+        """
+        Zakóduje výsledek do kompaktního JSONu (pro nástroj / LLM).
+
+        Args:
+            include_prompt: Přidat formatted_data a analysis_prompt
+
+        Returns:
+            str: JSON bez odsazení a bez escapování ne-ASCII znaků
+        """
+        return json.dumps(
+            self.to_dict(include_prompt), separators=(",", ":"), ensure_ascii=False
+        )
+
+
+def _missing_company_result(query: str, analysis_type: str) -> CompanyAnalysis:
+    """Výsledek pro dotaz, ze kterého nelze určit společnost."""
+    return CompanyAnalysis(
+        query=query,
+        analysis_type=analysis_type,
+        error="Could not extract company name from query",
+        suggestion="Please specify a company name or use format: 'Company Name; analysis_type'",
+    )
+
+
+def _error_result(query: str, error: Exception) -> CompanyAnalysis:
+    """Výsledek pro dotaz, jehož analýza selhala."""
+    return CompanyAnalysis(query=query, error=str(error))
+
+
+def _analysis_result(
+    query: str,
+    parsed: QueryParse,
+    company_data: Dict[str, Any],
+    internal_data: Dict[str, Any],
+    relationships_data: list,
+) -> CompanyAnalysis:
+    """
+    Sestaví výsledek analýzy z načtených dat společnosti.
+
+    Args:
+        query: User query about company
+        parsed: Rozbor dotazu
+        company_data: Company data from MockMCPConnector
+        internal_data: Internal company data
+        relationships_data: Company relationships data
+
+    Returns:
+        CompanyAnalysis: Dokončená analýza
+    """
+    return CompanyAnalysis(
+        query=query,
+        analysis_type=parsed.analysis_type,
+        analysis_complete=True,
+        company_name=parsed.company_name,
+        company_data=company_data,
+        internal_data=internal_data,
+        relationships_data=relationships_data,
+    )
+
+
+async def _fetch_company_data(
+    connector: Any, parsed: QueryParse
+) -> Tuple[Dict[str, Any], Dict[str, Any], list]:
+    """
+    Načte data společnosti z rozboru dotazu.
+
+    Finanční data a vztahy se načítají souběžně; jejich chyba se nahradí
+    prázdnými daty, chyba načtení samotné společnosti se propaguje.
+
+    Args:
+        connector: Asynchronní MCP konektor
+        parsed: Rozbor dotazu se společností
+
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, Any], list]: (company_data,
+        internal_data, relationships_data)
+    """
+    # Zmínka z gazetteeru nese rovnou ID, jinak se hledá podle názvu
+    if parsed.entity_id:
+        company_data = await connector.get_company_by_id(parsed.entity_id)
+    else:
+        company_data = await connector.get_company_by_name(parsed.company_name)
+
+    company_id = company_data.get("id") if company_data else None
+    if not company_id:
+        return company_data, {}, []
+
+    internal_data, relationships_data = await asyncio.gather(
+        connector.get_company_financials(company_id),
+        connector.get_company_relationships(company_id),
+        return_exceptions=True,
+    )
+    if isinstance(internal_data, Exception):
+        internal_data = {"message": "Financial data not available"}
+    if isinstance(relationships_data, Exception):
+        relationships_data = []
+    return company_data, internal_data, relationships_data
+
+
+async def analyze_company_async(query: str) -> CompanyAnalysis:
     """
     Asynchronní verze analyze_company pro použití v async kontextech.
     Analyze company data and return structured information.
@@ -300,88 +557,92 @@ async def analyze_company_async(query: str) -> str:
         query: User query about company
 
     Returns:
-        JSON string with company analysis results
+        CompanyAnalysis: Company analysis results (JSON přes to_json())
     """
     try:
         # Parse query to extract company name and analysis type
-        company_name, analysis_type = analyze_company_query(query)
-
-        if not company_name:
-            return json.dumps(
-                {
-                    "error": "Could not extract company name from query",
-                    "query_type": "company",
-                    "analysis_type": analysis_type,
-                    "analysis_complete": False,
-                    "query": query,
-                    "suggestion": "Please specify a company name or use format: 'Company Name; analysis_type'",
-                }
-            )
+        parsed = await parse_query_async(query)
+        if not parsed.company_name:
+            return _missing_company_result(query, parsed.analysis_type)
 
-        # Inicializace async mock MCP connectoru
-        connector = AsyncMockMCPConnector()
+        # Sdílený async mock MCP connector z registru
+        connector = get_connector_registry().get_async()
+        data = await _fetch_company_data(connector, parsed)
+        return _analysis_result(query, parsed, *data)
 
-        # Načtení dat pomocí async metod
-        company_data = await connector.get_company_by_name(query)
+    except Exception as e:
+        return _error_result(query, e)
 
-        # Získání ID společnosti pro další dotazy
-        company_id = company_data.get("id") if company_data else None
 
-        internal_data = {}
-        relationships_data = []
+async def analyze_companies_async(
+    queries: Iterable[str], max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+) -> AsyncIterator[Tuple[int, CompanyAnalysis]]:
+    """
+    Analyzuje více dotazů najednou a vrací výsledky v pořadí dokončení.
 
-        if company_id:
-            try:
-                internal_data = await connector.get_company_financials(company_id)
-            except Exception:
-                internal_data = {"message": "Financial data not available"}
+    Všechny dotazy se nejprve rozeberou, dotazy na stejnou entitu (nebo
+    stejný nenalezený název) sdílí jedno načtení dat. Načítání běží
+    souběžně, nejvýše max_concurrency společností najednou. Pokud volající
+    přestane výsledky odebírat, rozpracovaná načtení se zruší.
 
-            try:
-                relationships_data = await connector.get_company_relationships(
-                    company_id
-                )
-            except Exception:
-                relationships_data = []
-
-        # Format data for analysis
-        formatted_data = format_analysis_data(
-            company_data, internal_data, relationships_data
-        )
+    Args:
+        queries: User queries about companies
+        max_concurrency: Maximální počet společností načítaných souběžně
+
+    Yields:
+        Tuple[int, CompanyAnalysis]: Pořadí dotazu v queries a výsledek stejný
+        jako z analyze_company_async
 
-        # Get specialized prompt based on analysis type
-        prompt_template = get_analysis_prompt(analysis_type)
+    Raises:
+        ValueError: Pokud max_concurrency není kladné
+    """
+    if max_concurrency <= 0:
+        raise ValueError("max_concurrency musí být kladné")
 
-        # Generate analysis prompt
-        analysis_prompt = prompt_template.format(
-            company_name=company_name, **formatted_data
+    queries = list(queries)
+    groups: Dict[Tuple[str, str], List[Tuple[int, QueryParse]]] = {}
+    for position, query in enumerate(queries):
+        try:
+            parsed = await parse_query_async(query)
+        except Exception as e:
+            yield position, _error_result(query, e)
+            continue
+        if not parsed.company_name:
+            yield position, _missing_company_result(query, parsed.analysis_type)
+            continue
+        key = (
+            ("id", parsed.entity_id)
+            if parsed.entity_id
+            else ("name", normalize_query(parsed.company_name).casefold())
         )
+        groups.setdefault(key, []).append((position, parsed))
 
-        # Strukturované vrácení dat
-        result = {
-            "query_type": "company",
-            "analysis_type": analysis_type,
-            "company_name": company_name,
-            "company_data": company_data,
-            "internal_data": internal_data,
-            "relationships_data": relationships_data,
-            "analysis_prompt": analysis_prompt,
-            "formatted_data": formatted_data,
-            "analysis_complete": True,
-            "query": query,
-        }
+    connector = get_connector_registry().get_async()
+    semaphore = asyncio.Semaphore(max_concurrency)
 
-        return json.dumps(result, indent=2)
+    async def fetch(key: Tuple[str, str], parsed: QueryParse) -> Tuple[Any, ...]:
+        async with semaphore:
+            try:
+                return key, await _fetch_company_data(connector, parsed), None
+            except Exception as e:
+                return key, None, e
 
-    except Exception as e:
-        return json.dumps(
-            {
-                "error": str(e),
-                "query_type": "company",
-                "analysis_type": "general",
-                "analysis_complete": False,
-                "query": query,
-            }
-        )
+    tasks = [
+        asyncio.create_task(fetch(key, members[0][1]))
+        for key, members in groups.items()
+    ]
+    try:
+        for completed in asyncio.as_completed(tasks):
+            key, data, error = await completed
+            for position, parsed in groups[key]:
+                query = queries[position]
+                if error is not None:
+                    yield position, _error_result(query, error)
+                else:
+                    yield position, _analysis_result(query, parsed, *data)
+    finally:
+        for task in tasks:
+            task.cancel()
 
 
 def analyze_company(query: str) -> str:
@@ -394,44 +655,36 @@ def analyze_company(query: str) -> str:
         query: User query about company
 
     Returns:
-        JSON string with company analysis results
+        Compact JSON string with company analysis results
     """
     try:
-        # Pokusíme se spustit async verzi
-        try:
-            # Pokud již běží event loop, použijeme to_thread
-            loop = asyncio.get_running_loop()
-            # Spustíme async verzi v thread poolu
-            future = asyncio.run_coroutine_threadsafe(
-                analyze_company_async(query), loop
-            )
-            return future.result(timeout=30)  # 30s timeout
-        except RuntimeError:
-            # Pokud neběží event loop, spustíme nový
-            return asyncio.run(analyze_company_async(query))
+        # Async verze běží na sdíleném event loopu v pozadí, takže funguje
+        # stejně z vlákna s běžícím loopem i bez něj
+        # JSON se kóduje jen zde, na hranici nástroje pro LLM
+        return (
+            get_background_runner()
+            .run(analyze_company_async(query), ANALYZE_COMPANY_TIMEOUT)
+            .to_json()
+        )
+    except TimeoutError as e:
+        # Po termínu už nemá smysl spouštět pomalejší synchronní cestu
+        return _error_result(query, e).to_json()
     except Exception:
         # Fallback na synchronní verzi při chybě
         try:
             # Parse query to extract company name and analysis type
-            company_name, analysis_type = analyze_company_query(query)
-
-            if not company_name:
-                return json.dumps(
-                    {
-                        "error": "Could not extract company name from query",
-                        "query_type": "company",
-                        "analysis_type": analysis_type,
-                        "analysis_complete": False,
-                        "query": query,
-                        "suggestion": "Please specify a company name or use format: 'Company Name; analysis_type'",
-                    }
-                )
-
-            # Inicializace synchronní mock MCP connectoru
-            connector = MockMCPConnector()
-
-            # Načtení dat pomocí různých metod podle potřeby
-            company_data = connector.get_company_by_name(query)
+            parsed = parse_query(query)
+            if not parsed.company_name:
+                return _missing_company_result(query, parsed.analysis_type).to_json()
+
+            # Sdílený synchronní mock MCP connector z registru
+            connector = get_connector_registry().get()
+
+            # Zmínka z gazetteeru nese rovnou ID, jinak se hledá podle názvu
+            if parsed.entity_id:
+                company_data = connector.get_company_by_id(parsed.entity_id)
+            else:
+                company_data = connector.get_company_by_name(parsed.company_name)
 
             # Získání ID společnosti pro další dotazy
             company_id = company_data.get("id") if company_data else None
@@ -450,42 +703,9 @@ def analyze_company(query: str) -> str:
                 except Exception:
                     relationships_data = []
 
-            # Format data for analysis
-            formatted_data = format_analysis_data(
-                company_data, internal_data, relationships_data
-            )
-
-            # Get specialized prompt based on analysis type
-            prompt_template = get_analysis_prompt(analysis_type)
-
-            # Generate analysis prompt
-            analysis_prompt = prompt_template.format(
-                company_name=company_name, **formatted_data
-            )
-
-            # Strukturované vrácení dat
-            result = {
-                "query_type": "company",
-                "analysis_type": analysis_type,
-                "company_name": company_name,
-                "company_data": company_data,
-                "internal_data": internal_data,
-                "relationships_data": relationships_data,
-                "analysis_prompt": analysis_prompt,
-                "formatted_data": formatted_data,
-                "analysis_complete": True,
-                "query": query,
-            }
-
-            return json.dumps(result, indent=2)
+            return _analysis_result(
+                query, parsed, company_data, internal_data, relationships_data
+            ).to_json()
 
         except Exception as e:
-            return json.dumps(
-                {
-                    "error": str(e),
-                    "query_type": "company",
-                    "analysis_type": "general",
-                    "analysis_complete": False,
-                    "query": query,
-                }
-            )
+            return _error_result(query, e).to_json()
@@ -0,0 +1,226 @@
+"""
+Most ze synchronního kódu do asynchronního přes jeden dlouho běžící loop.
+
+Synchronní nástroje (např. analyze_company volaný ReAct agentem) potřebují
+spouštět korutiny. asyncio.run() vytváří pro každé volání nový event loop
+a nelze jej použít ve vlákně, kde loop už běží; naplánování korutiny na
+právě běžící loop a blokující čekání na výsledek ve stejném vlákně skončí
+až vypršením časového limitu. Korutiny se proto spouští na vlastním event
+loopu v pozadí, který běží v samostatném vlákně po celou dobu procesu.
+
+Termín (deadline) se předává do korutiny: korutina běží pod asyncio.timeout
+a přes remaining_time() může zjistit, kolik času zbývá. Termín se dědí
+z kontextu volajícího, takže vnořené volání nikdy nepřekročí termín
+vnějšího volání (asyncio.to_thread kontext do vlákna kopíruje).
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import logging
+import threading
+import time
+from typing import Any, Coroutine, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Rezerva (s) pro předání výsledku z loopu po vypršení termínu úlohy
+_RESULT_GRACE = 1.0
+
+# Absolutní termín (time.monotonic) aktuálního volání, nebo None
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "memory_agent_deadline", default=None
+)
+
+
+def remaining_time() -> Optional[float]:
+    """
+    Vrátí čas zbývající do termínu aktuálního volání.
+
+    Returns:
+        Optional[float]: Zbývající sekundy (nejméně 0), nebo None bez termínu
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def _effective_deadline(timeout: Optional[float]) -> Optional[float]:
+    """Vrátí dřívější z termínu podle timeoutu a termínu z kontextu."""
+    inherited = _deadline.get()
+    if timeout is None:
+        return inherited
+    deadline = time.monotonic() + timeout
+    return deadline if inherited is None else min(deadline, inherited)
+
+
+class BackgroundLoopRunner:
+    """
+    Event loop v pozadí pro spouštění korutin ze synchronního kódu.
+
+    Vlákno s loopem se spustí při prvním použití a běží až do close().
+    Všechny metody jsou thread-safe.
+    """
+
+    def __init__(self, name: str = "memory-agent-async"):
+        """
+        Inicializuje runner bez spuštění vlákna.
+
+        Args:
+            name: Název vlákna s event loopem
+        """
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Spustí vlákno s event loopem, pokud ještě neběží."""
+        loop = self._loop
+        if loop is not None:
+            return loop
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+
+                def run() -> None:
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(started.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+                self._thread.start()
+                started.wait()
+                self._loop = loop
+                logger.info(f"Spuštěn event loop v pozadí ({self.name})")
+            return self._loop
+
+    def in_loop_thread(self) -> bool:
+        """Ověří, zda aktuální vlákno je vlákno event loopu runneru."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def _submit(
+        self, coro: Coroutine[Any, Any, T], deadline: Optional[float]
+    ) -> "concurrent.futures.Future[T]":
+        """Naplánuje korutinu s termínem a kontextem volajícího."""
+        context = contextvars.copy_context()
+
+        async def run_with_deadline() -> T:
+            # Úloha v loopu má vlastní kontext; převezme proměnné volajícího
+            for variable, value in context.items():
+                variable.set(value)
+            _deadline.set(deadline)
+            if deadline is None:
+                return await coro
+            async with asyncio.timeout(remaining_time()):
+                return await coro
+
+        try:
+            return asyncio.run_coroutine_threadsafe(
+                run_with_deadline(), self._ensure_loop()
+            )
+        except BaseException:
+            coro.close()
+            raise
+
+    def submit(
+        self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None
+    ) -> "concurrent.futures.Future[T]":
+        """
+        Naplánuje korutinu na event loop v pozadí bez čekání na výsledek.
+
+        Args:
+            coro: Korutina ke spuštění
+            timeout: Maximální doba běhu v sekundách (None = jen termín
+                     z kontextu volajícího)
+
+        Returns:
+            concurrent.futures.Future[T]: Výsledek korutiny; cancel() zruší
+            běžící úlohu v loopu, po termínu skončí TimeoutError
+        """
+        return self._submit(coro, _effective_deadline(timeout))
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """
+        Spustí korutinu na event loopu v pozadí a počká na výsledek.
+
+        Pokud čekání přeruší výjimka (např. KeyboardInterrupt), úloha se
+        v loopu zruší.
+
+        Args:
+            coro: Korutina ke spuštění
+            timeout: Maximální doba běhu v sekundách (None = jen termín
+                     z kontextu volajícího)
+
+        Returns:
+            T: Výsledek korutiny
+
+        Raises:
+            RuntimeError: Pokud se volá z vlákna event loopu runneru (čekání
+                          by loop zablokovalo)
+            TimeoutError: Pokud korutina nedoběhne do termínu
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("BackgroundLoopRunner.run nelze volat z vlastního loopu")
+        deadline = _effective_deadline(timeout)
+        future = self._submit(coro, deadline)
+        # Termín ukončí úlohu už v loopu; rezerva pokryje předání výsledku
+        wait = None
+        if deadline is not None:
+            wait = max(0.0, deadline - time.monotonic()) + _RESULT_GRACE
+        try:
+            return future.result(wait)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError("Korutina nedoběhla do termínu") from None
+        except BaseException:
+            future.cancel()
+            raise
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Zruší běžící úlohy, zastaví event loop a počká na ukončení vlákna.
+
+        Args:
+            timeout: Maximální doba čekání na vlákno v sekundách
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None:
+            return
+
+        async def shutdown() -> None:
+            tasks = [
+                task
+                for task in asyncio.all_tasks()
+                if task is not asyncio.current_task()
+            ]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            loop.stop()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), loop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
+
+
+# Procesní runner sdílený synchronními nástroji
+_background_runner = BackgroundLoopRunner()
+
+
+def get_background_runner() -> BackgroundLoopRunner:
+    """
+    Vrátí procesní event loop v pozadí.
+
+    Returns:
+        BackgroundLoopRunner: Sdílená instance runneru
+    """
+    return _background_runner
@@ -0,0 +1,233 @@
+"""
+Gazetteer názvů společností pro rozpoznání zmínek v textu dotazu.
+
+Gazetteer obsahuje normalizované fráze (viz data_index.normalize_name)
+z názvů entit, jejich alternativních názvů, názvů bez právní formy
+("MB TOOL s.r.o." -> "mb tool") a identifikátorů (DUNS, IČO, DIČ).
+Text se rozdělí na slova a projde se jednou zleva: na každé pozici se
+frázi prodlužuje, dokud je prefixem některé fráze, a použije se nejdelší
+nalezená fráze (leftmost-longest). Zmínka rovnou nese ID entit, takže
+pro načtení dat není potřeba další vyhledávání podle názvu.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from unidecode import unidecode
+
+# Slova textu (písmena a číslice v libovolné abecedě)
+_WORD = re.compile(r"[^\W_]+")
+
+# Právní formy, které se odstraní z konce názvu (normalizované fráze)
+LEGAL_FORM_SUFFIXES = (
+    "spol s r o",
+    "s r o",
+    "s r",
+    "sro",
+    "a s",
+    "k s",
+    "v o s",
+    "zp",
+    "gmbh",
+    "ag",
+    "kg",
+    "se",
+    "sa",
+    "ltd",
+    "llc",
+    "inc",
+    "plc",
+)
+
+
+def _normalize_word(word: str) -> List[str]:
+    """Vrátí normalizovaná slova odpovídající jednomu slovu textu."""
+    return _WORD.findall(unidecode(word).lower())
+
+
+def _phrase_tokens(name: Any) -> Tuple[str, ...]:
+    """Vrátí normalizovaná slova názvu nebo identifikátoru."""
+    return tuple(
+        token for word in _WORD.findall(str(name)) for token in _normalize_word(word)
+    )
+
+
+def strip_legal_form(tokens: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    Odstraní právní formu z konce normalizovaného názvu.
+
+    Args:
+        tokens: Slova normalizovaného názvu
+
+    Returns:
+        Tuple[str, ...]: Slova názvu bez právní formy (původní slova, pokud
+        by po odstranění nic nezbylo)
+    """
+    for suffix in LEGAL_FORM_SUFFIXES:
+        suffix_tokens = tuple(suffix.split())
+        if (
+            len(tokens) > len(suffix_tokens)
+            and tokens[-len(suffix_tokens) :] == suffix_tokens
+        ):
+            return tokens[: -len(suffix_tokens)]
+    return tokens
+
+
+def display_name(label: str) -> str:
+    """
+    Vrátí název společnosti bez právní formy v původním zápisu.
+
+    Zachová velikost písmen i diakritiku ("Flídr plast s.r" -> "Flídr plast",
+    "ADIS TACHOV, zp" -> "ADIS TACHOV").
+
+    Args:
+        label: Název entity
+
+    Returns:
+        str: Název bez právní formy (celý název, pokud žádnou nemá)
+    """
+    words = [(match, _normalize_word(match.group())) for match in _WORD.finditer(label)]
+    core_length = len(strip_legal_form(tuple(t for _, tokens in words for t in tokens)))
+    count = 0
+    for match, tokens in words:
+        count += len(tokens)
+        if count >= core_length:
+            return label[: match.end()]
+    return label
+
+
+@dataclass(frozen=True)
+class CompanyMention:
+    """
+    Zmínka společnosti nalezená v textu.
+
+    Attributes:
+        text: Zmínka tak, jak je zapsaná v textu
+        start: Pozice prvního znaku zmínky v textu
+        end: Pozice za posledním znakem zmínky
+        phrase: Normalizovaná fráze gazetteeru
+        entity_ids: ID entit s touto frází (seřazená)
+    """
+
+    text: str
+    start: int
+    end: int
+    phrase: str
+    entity_ids: Tuple[str, ...]
+
+    @property
+    def entity_id(self) -> str:
+        """ID první entity se shodnou frází."""
+        return self.entity_ids[0]
+
+
+class CompanyGazetteer:
+    """
+    Fráze názvů a identifikátorů společností mapované na ID entit.
+
+    Kromě frází se ukládají i jejich vlastní prefixy (po slovech), aby se
+    prodlužování zmínky zastavilo hned, jakmile text nemůže pokračovat
+    žádnou frází.
+    """
+
+    def __init__(self):
+        """Inicializuje prázdný gazetteer."""
+        self._phrases: Dict[str, Tuple[str, ...]] = {}
+        self._prefixes: Set[str] = set()
+        self.max_tokens = 0
+
+    def __len__(self) -> int:
+        """Vrátí počet frází."""
+        return len(self._phrases)
+
+    def add(self, name: Any, entity_id: str) -> None:
+        """
+        Přidá název nebo identifikátor entity.
+
+        Args:
+            name: Název, alternativní název nebo hodnota identifikátoru
+            entity_id: ID entity
+        """
+        tokens = _phrase_tokens(name)
+        if not tokens:
+            return
+        phrase = " ".join(tokens)
+        entity_ids = self._phrases.get(phrase, ())
+        if entity_id not in entity_ids:
+            self._phrases[phrase] = tuple(sorted(entity_ids + (entity_id,)))
+        for length in range(1, len(tokens)):
+            self._prefixes.add(" ".join(tokens[:length]))
+        self.max_tokens = max(self.max_tokens, len(tokens))
+
+    def add_entity(
+        self, entity_id: str, detail: Dict[str, Any], aliases: Iterable[Any] = ()
+    ) -> None:
+        """
+        Přidá název, název bez právní formy, aliasy a identifikátory entity.
+
+        Args:
+            entity_id: ID entity
+            detail: Detail entity (label, identifiers)
+            aliases: Další názvy entity (např. alternate_names z vyhledávání)
+        """
+        names = [detail.get("label"), *aliases]
+        for name in names:
+            if not name:
+                continue
+            self.add(name, entity_id)
+            core = strip_legal_form(_phrase_tokens(name))
+            if core:
+                self.add(" ".join(core), entity_id)
+        for identifier in detail.get("identifiers") or []:
+            if isinstance(identifier, dict) and identifier.get("value"):
+                self.add(identifier["value"], entity_id)
+
+    def spot(self, text: str) -> List[CompanyMention]:
+        """
+        Najde zmínky společností v textu jedním průchodem zleva.
+
+        Překrývající se zmínky se nevracejí: na každé pozici vyhraje nejdelší
+        fráze a hledání pokračuje za ní.
+
+        Args:
+            text: Volný text (např. dotaz uživatele)
+
+        Returns:
+            List[CompanyMention]: Zmínky v pořadí výskytu v textu
+        """
+        tokens = [
+            (token, match.start(), match.end())
+            for match in _WORD.finditer(text)
+            for token in _normalize_word(match.group())
+        ]
+        mentions: List[CompanyMention] = []
+        position = 0
+        while position < len(tokens):
+            longest = None
+            phrase = ""
+            end = position
+            while end < len(tokens) and end - position < self.max_tokens:
+                phrase = f"{phrase} {tokens[end][0]}" if phrase else tokens[end][0]
+                if phrase in self._phrases:
+                    longest = (end, phrase)
+                if phrase not in self._prefixes:
+                    break
+                end += 1
+
+            if longest is None:
+                position += 1
+                continue
+            end, phrase = longest
+            start_char, end_char = tokens[position][1], tokens[end][2]
+            mentions.append(
+                CompanyMention(
+                    text=text[start_char:end_char],
+                    start=start_char,
+                    end=end_char,
+                    phrase=phrase,
+                    entity_ids=self._phrases[phrase],
+                )
+            )
+            position = end + 1
+        return mentions
@@ -0,0 +1,177 @@
+"""
+Posting listy záznamů společností podle ID, země a průmyslu.
+
+Záznam společnosti dostane při sestavení pořadové číslo (pozici) a každá
+hodnota filtru má seřazený seznam pozic záznamů, které ji obsahují
+(array("i"), 4 B na pozici). Dotaz se vyhodnotí průnikem posting listů
+bez procházení a kopírování záznamů; samotné záznamy se čtou až pro
+pozice, které se skutečně vrátí na stránce výsledků.
+"""
+
+import bisect
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+
+def _contains(positions: Sequence[int], position: int) -> bool:
+    """Ověří půlením, zda seřazený posting list obsahuje pozici."""
+    found = bisect.bisect_left(positions, position)
+    return found < len(positions) and positions[found] == position
+
+
+def _sorted_union(postings: Iterable[array]) -> array:
+    """Vrátí seřazené sjednocení posting listů bez duplicit."""
+    merged = set()
+    for positions in postings:
+        merged.update(positions)
+    return array("i", sorted(merged))
+
+
+class CompanyPostings:
+    """
+    Posting listy nad seznamem záznamů společností.
+
+    Obsahuje:
+    - ids: ID společnosti pro každou pozici
+    - postings podle ID, země (malými písmeny) a průmyslu (malými písmeny)
+
+    Průmysl se filtruje podřetězcem ("automotive" najde "Automotive Parts"),
+    proto se prochází rozlišené hodnoty průmyslu, kterých je řádově méně
+    než záznamů.
+    """
+
+    def __init__(self):
+        """Inicializuje prázdné posting listy."""
+        self.ids: List[Optional[str]] = []
+        self._by_id: Dict[str, array] = {}
+        self._by_country: Dict[str, array] = {}
+        self._by_industry: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        """Vrátí počet indexovaných záznamů."""
+        return len(self.ids)
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[Dict[str, Any]],
+        industries: Optional[Iterable[Optional[str]]] = None,
+    ) -> "CompanyPostings":
+        """
+        Sestaví posting listy ze záznamů společností.
+
+        Args:
+            records: Záznamy společností s poli "id" a "countries"
+            industries: Volitelně průmysl pro každý záznam (výchozí je pole
+                        "industry" záznamu)
+
+        Returns:
+            CompanyPostings: Sestavené posting listy
+        """
+        postings = cls()
+        if industries is None:
+            for record in records:
+                postings.add(record, record.get("industry"))
+        else:
+            for record, industry in zip(records, industries):
+                postings.add(record, industry)
+        return postings
+
+    def add(self, record: Dict[str, Any], industry: Optional[str] = None) -> int:
+        """
+        Přidá záznam společnosti na konec posting listů.
+
+        Args:
+            record: Záznam společnosti
+            industry: Průmysl společnosti (None = neznámý)
+
+        Returns:
+            int: Pozice záznamu
+        """
+        position = len(self.ids)
+        company_id = record.get("id")
+        self.ids.append(company_id)
+        if company_id:
+            self._by_id.setdefault(company_id, array("i")).append(position)
+        for country in {
+            str(country).lower() for country in record.get("countries") or []
+        }:
+            self._by_country.setdefault(country, array("i")).append(position)
+        if industry:
+            self._by_industry.setdefault(industry.lower(), array("i")).append(position)
+        return position
+
+    def industry_positions(self, terms: Iterable[str]) -> array:
+        """
+        Vrátí pozice záznamů, jejichž průmysl obsahuje některý z výrazů.
+
+        Args:
+            terms: Hledané výrazy (porovnávají se bez ohledu na velikost písmen)
+
+        Returns:
+            array: Seřazené pozice záznamů
+        """
+        lowered = [term.lower() for term in terms]
+        return _sorted_union(
+            positions
+            for industry, positions in self._by_industry.items()
+            if any(term in industry for term in lowered)
+        )
+
+    def candidates(
+        self,
+        company_id: Optional[str] = None,
+        country: Optional[str] = None,
+        industries: Optional[Sequence[str]] = None,
+    ) -> Sequence[int]:
+        """
+        Vrátí seřazené pozice záznamů, které splňují všechny zadané filtry.
+
+        Args:
+            company_id: Volitelné ID společnosti
+            country: Volitelný kód země
+            industries: Volitelné výrazy průmyslu (stačí shoda jednoho)
+
+        Returns:
+            Sequence[int]: Pozice záznamů (range, pokud není zadán žádný filtr)
+        """
+        postings: List[Sequence[int]] = []
+        if company_id:
+            postings.append(self._by_id.get(company_id, array("i")))
+        if country:
+            postings.append(self._by_country.get(country.lower(), array("i")))
+        if industries:
+            postings.append(self.industry_positions(industries))
+        if not postings:
+            return range(len(self.ids))
+
+        # Průnik množin pozic počítá C implementace set, výsledek je opět seřazený
+        postings.sort(key=len)
+        if len(postings) == 1:
+            return postings[0]
+        matched = set(postings[0])
+        for positions in postings[1:]:
+            matched.intersection_update(positions)
+        return array("i", sorted(matched))
+
+    def select(
+        self, company_ids: Iterable[str], candidates: Sequence[int]
+    ) -> List[int]:
+        """
+        Vrátí pozice zadaných společností, které jsou mezi kandidáty.
+
+        Pořadí odpovídá company_ids (např. seřazení podle podobnosti názvu).
+
+        Args:
+            company_ids: ID společností v požadovaném pořadí
+            candidates: Seřazené pozice kandidátů z candidates()
+
+        Returns:
+            List[int]: Pozice vybraných společností
+        """
+        selected = []
+        for company_id in company_ids:
+            for position in self._by_id.get(company_id, ()):
+                if _contains(candidates, position):
+                    selected.append(position)
+        return selected
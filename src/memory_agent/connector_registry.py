@@ -0,0 +1,149 @@
+"""
+Procesní registr sdílených instancí MockMCPConnector.
+
+Uzly grafu a analyzer si konektor nevytvářejí při každém volání, ale berou
+sdílenou instanci z registru podle datového adresáře. Index a cache uvnitř
+konektoru tak přežijí mezi požadavky a sestaví se jen jednou (případně
+předem voláním warm()).
+
+Synchronní a asynchronní konektor nad stejným adresářem sdílí jeden index.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from memory_agent.tools import AsyncMockMCPConnector, MockMCPConnector
+
+logger = logging.getLogger(__name__)
+
+# Klíč registru: (absolutní cesta k datům, cesta ke snapshotu)
+_RegistryKey = Tuple[str, Optional[str]]
+
+
+class ConnectorRegistry:
+    """
+    Registr sdílených konektorů klíčovaný datovým adresářem.
+
+    Všechny metody jsou thread-safe; konektor pro daný adresář se vytvoří
+    pouze jednou i při souběžném přístupu.
+    """
+
+    def __init__(self):
+        """Inicializuje prázdný registr."""
+        self._connectors: Dict[_RegistryKey, MockMCPConnector] = {}
+        self._async_connectors: Dict[_RegistryKey, AsyncMockMCPConnector] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(data_path: Optional[str], snapshot_path: Optional[str]) -> _RegistryKey:
+        """Sestaví klíč registru z cesty k datům a ke snapshotu."""
+        data_path = os.path.abspath(data_path or MockMCPConnector.MOCK_DATA_PATH)
+        return data_path, os.path.abspath(snapshot_path) if snapshot_path else None
+
+    def get(
+        self, data_path: Optional[str] = None, snapshot_path: Optional[str] = None
+    ) -> MockMCPConnector:
+        """
+        Vrátí sdílený synchronní konektor pro datový adresář.
+
+        Args:
+            data_path: Cesta k mock datům (výchozí MockMCPConnector.MOCK_DATA_PATH)
+            snapshot_path: Volitelná cesta ke kompilovanému snapshotu dat
+
+        Returns:
+            MockMCPConnector: Sdílená instance konektoru
+        """
+        key = self._key(data_path, snapshot_path)
+        connector = self._connectors.get(key)
+        if connector is not None:
+            return connector
+        with self._lock:
+            connector = self._connectors.get(key)
+            if connector is None:
+                connector = MockMCPConnector(key[0], key[1])
+                self._connectors[key] = connector
+            return connector
+
+    def get_async(
+        self, data_path: Optional[str] = None, snapshot_path: Optional[str] = None
+    ) -> AsyncMockMCPConnector:
+        """
+        Vrátí sdílený asynchronní konektor pro datový adresář.
+
+        Asynchronní konektor obaluje sdílený synchronní konektor, takže oba
+        používají stejný index.
+
+        Args:
+            data_path: Cesta k mock datům (výchozí MockMCPConnector.MOCK_DATA_PATH)
+            snapshot_path: Volitelná cesta ke kompilovanému snapshotu dat
+
+        Returns:
+            AsyncMockMCPConnector: Sdílená instance asynchronního konektoru
+        """
+        key = self._key(data_path, snapshot_path)
+        connector = self._async_connectors.get(key)
+        if connector is not None:
+            return connector
+        sync_connector = self.get(data_path, snapshot_path)
+        with self._lock:
+            connector = self._async_connectors.get(key)
+            if connector is None:
+                connector = AsyncMockMCPConnector(sync_connector=sync_connector)
+                self._async_connectors[key] = connector
+            return connector
+
+    def warm(
+        self, data_path: Optional[str] = None, snapshot_path: Optional[str] = None
+    ) -> MockMCPConnector:
+        """
+        Předem sestaví index sdíleného konektoru.
+
+        Args:
+            data_path: Cesta k mock datům (výchozí MockMCPConnector.MOCK_DATA_PATH)
+            snapshot_path: Volitelná cesta ke kompilovanému snapshotu dat
+
+        Returns:
+            MockMCPConnector: Sdílená instance konektoru s připraveným indexem
+        """
+        connector = self.get(data_path, snapshot_path)
+        start = time.perf_counter()
+        connector.warm()
+        logger.info(
+            f"Konektor pro {connector.data_path} připraven za "
+            f"{(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+        return connector
+
+    def close(self, data_path: Optional[str] = None) -> None:
+        """
+        Uzavře sdílené konektory a uvolní jejich indexy.
+
+        Args:
+            data_path: Cesta k mock datům; pokud není zadána, uzavřou se všechny
+        """
+        with self._lock:
+            if data_path is None:
+                keys = list(self._connectors)
+            else:
+                data_path = os.path.abspath(data_path)
+                keys = [key for key in self._connectors if key[0] == data_path]
+            for key in keys:
+                self._async_connectors.pop(key, None)
+                self._connectors.pop(key).close()
+
+
+# Procesní registr sdílený uzly grafu a analyzerem
+_connector_registry = ConnectorRegistry()
+
+
+def get_connector_registry() -> ConnectorRegistry:
+    """
+    Vrátí procesní registr sdílených konektorů.
+
+    Returns:
+        ConnectorRegistry: Sdílená instance registru
+    """
+    return _connector_registry
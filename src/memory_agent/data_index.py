@@ -0,0 +1,1901 @@
+"""
+In-memory index nad adresářem mock dat pro MockMCPConnector.
+
+Index se sestavuje jednou pro datový adresář: každý JSON soubor se parsuje
+pouze jednou a dotazy konektoru se pak obsluhují ze slovníků v paměti
+místo opakovaného procházení souborů přes glob.
+"""
+
+import bisect
+import copy
+import glob
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from unidecode import unidecode
+
+from memory_agent.company_gazetteer import CompanyGazetteer
+from memory_agent.company_postings import CompanyPostings
+from memory_agent.document_cache import freeze
+from memory_agent.hs_code_index import HSCodeIndex
+from memory_agent.risk_propagation import RiskPropagation
+from memory_agent.supply_chain_graph import SupplyChainGraph
+from memory_agent.trigram_index import DEFAULT_SIMILARITY_THRESHOLD, TrigramIndex
+
+if TYPE_CHECKING:
+    from memory_agent.graph_analysis import EntityGraph, SupplierDependencyIndex
+    from memory_agent.sharded_store import ShardStore
+
+logger = logging.getLogger(__name__)
+
+# Rodiny souborů, které patří ke konkrétní entitě (např. internal_mb_tool.json)
+FILE_FAMILIES = ("internal", "relationships", "supply_chain", "entity_search")
+
+ENTITY_DETAIL_PREFIX = "entity_detail_"
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalizuje název pro porovnávání (odstraní diakritiku, převede na malá písmena).
+
+    Args:
+        name: Název k normalizaci
+
+    Returns:
+        str: Normalizovaný název
+    """
+    # Odstranit diakritiku a převést na malá písmena
+    normalized = unidecode(name).lower()
+    # Odstranit nadbytečné mezery a speciální znaky
+    normalized = re.sub(r"[^a-z0-9]", " ", normalized)
+    normalized = re.sub(r"\s+", " ", normalized).strip()
+    return normalized
+
+
+# Aliasy typů identifikátorů, jak je zadávají uživatelé
+IDENTIFIER_TYPE_ALIASES = {
+    "duns": "duns_number",
+    "vat": "vat_number",
+    "dic": "vat_number",
+    "ico": "registration_number",
+    "registration": "registration_number",
+}
+
+
+def normalize_identifier_type(identifier_type: str) -> str:
+    """
+    Normalizuje typ identifikátoru (např. "DUNS" -> "duns_number").
+
+    Args:
+        identifier_type: Typ identifikátoru
+
+    Returns:
+        str: Normalizovaný typ identifikátoru
+    """
+    normalized = normalize_name(identifier_type).replace(" ", "_")
+    return IDENTIFIER_TYPE_ALIASES.get(normalized, normalized)
+
+
+def normalize_identifier(identifier_type: str, value: Any) -> str:
+    """
+    Normalizuje hodnotu identifikátoru pro přesné vyhledávání.
+
+    Odstraní mezery, pomlčky a další oddělovače a převede písmena na velká,
+    takže "cz 261 50 565" i "CZ-26150565" dají stejný klíč. DUNS číslo se
+    doplní úvodními nulami na 9 číslic.
+
+    Args:
+        identifier_type: Normalizovaný typ identifikátoru
+        value: Hodnota identifikátoru
+
+    Returns:
+        str: Normalizovaná hodnota
+    """
+    normalized = re.sub(r"[^0-9A-Za-z]", "", str(value)).upper()
+    if identifier_type == "duns_number" and normalized.isdigit():
+        normalized = normalized.zfill(9)
+    return normalized
+
+
+def _extract_items(document: Any, *keys: str) -> List[Dict[str, Any]]:
+    """
+    Vrátí seznam záznamů z prvního pole dokumentu, které je seznamem.
+
+    Args:
+        document: Parsovaný JSON dokument
+        keys: Klíče top-level polí v pořadí priority
+
+    Returns:
+        List[Dict[str, Any]]: Nalezené záznamy (prázdný seznam, pokud žádné nejsou)
+    """
+    if isinstance(document, list):
+        return [item for item in document if isinstance(item, dict)]
+    if isinstance(document, dict):
+        for key in keys:
+            items = document.get(key)
+            if isinstance(items, list):
+                return [item for item in items if isinstance(item, dict)]
+    return []
+
+
+def _extract_all_items(document: Any, *keys: str) -> List[Dict[str, Any]]:
+    """
+    Vrátí záznamy ze všech polí dokumentu, která jsou seznamem.
+
+    Na rozdíl od _extract_items se spojí záznamy všech zadaných polí, např.
+    "data" i "relationships" v relationships_*.json.
+
+    Args:
+        document: Parsovaný JSON dokument
+        keys: Klíče top-level polí v pořadí, ve kterém se záznamy vrátí
+
+    Returns:
+        List[Dict[str, Any]]: Nalezené záznamy (prázdný seznam, pokud žádné nejsou)
+    """
+    if not isinstance(document, dict):
+        return _extract_items(document)
+    items: List[Dict[str, Any]] = []
+    for key in keys:
+        if isinstance(document.get(key), list):
+            items.extend(item for item in document[key] if isinstance(item, dict))
+    return items
+
+
+def _source_id(item: Dict[str, Any]) -> Optional[str]:
+    """Vrátí ID zdrojové entity položky dodavatelského řetězce."""
+    source = item.get("source")
+    if isinstance(source, dict):
+        return source.get("id")
+    if isinstance(source, str):
+        return source
+    return None
+
+
+def _endpoint_id(endpoint: Any) -> Optional[str]:
+    """Vrátí ID entity z konce vztahu (objekt {"id": ...} nebo přímo ID)."""
+    if isinstance(endpoint, dict):
+        return endpoint.get("id")
+    if isinstance(endpoint, str):
+        return endpoint
+    return None
+
+
+def relationship_endpoints(
+    relationship: Dict[str, Any],
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Vrátí ID zdroje a cíle vztahu v libovolném z formátů exportu.
+
+    Podporuje formát {"source": {...}, "target": {...}} z pole "data"
+    i formát {"from_id": ..., "to_id": ...} z pole "relationships".
+
+    Args:
+        relationship: Záznam vztahu
+
+    Returns:
+        Tuple[Optional[str], Optional[str]]: ID zdrojové a cílové entity
+    """
+    source_id = _endpoint_id(relationship.get("source")) or relationship.get("from_id")
+    target_id = _endpoint_id(relationship.get("target")) or relationship.get("to_id")
+    return source_id, target_id
+
+
+# Procesně jedinečná čísla instancí indexu (každá generace má vlastní)
+_index_uids = itertools.count(1)
+
+# Pole záznamů vztahů v relationships_*.json (formát "data" i "relationships")
+RELATIONSHIP_ARRAY_KEYS = ("data", "relationships")
+
+# Klíče záznamu vztahu, které zpracovává normalize_relationship
+_RELATIONSHIP_FIELDS = frozenset(
+    (
+        "id",
+        "type",
+        "source",
+        "target",
+        "metadata",
+        "from_id",
+        "from_label",
+        "from_type",
+        "to_id",
+        "to_label",
+        "to_type",
+        "attributes",
+        "rev_attributes",
+    )
+)
+
+# Atributy koncové entity vztahu v kanonickém tvaru
+_ENDPOINT_FIELDS = ("id", "label", "type")
+
+
+def _attribute_value(attribute: Any) -> Any:
+    """
+    Zploští atribut formátu "relationships" na jeho hodnotu.
+
+    Atribut {"data": [{"value": ...}, ...], "limit": ..., "size": ...} se
+    převede na jedinou hodnotu, případně seznam hodnot; jiné hodnoty zůstanou.
+    """
+    if isinstance(attribute, dict) and isinstance(attribute.get("data"), list):
+        values = [
+            item.get("value")
+            for item in attribute["data"]
+            if isinstance(item, dict) and "value" in item
+        ]
+        return values[0] if len(values) == 1 else values
+    return attribute
+
+
+def _normalize_endpoint(
+    relationship: Dict[str, Any], side: str, prefix: str
+) -> Dict[str, Any]:
+    """Vrátí konec vztahu jako {"id", "label", "type"} z libovolného formátu."""
+    endpoint = relationship.get(side)
+    if isinstance(endpoint, str):
+        endpoint = {"id": endpoint}
+    if not isinstance(endpoint, dict):
+        endpoint = {}
+    normalized = {}
+    for key in _ENDPOINT_FIELDS:
+        value = endpoint.get(key, relationship.get(f"{prefix}_{key}"))
+        if value is not None:
+            normalized[key] = value
+    return normalized
+
+
+def normalize_relationship(relationship: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Převede vztah z libovolného formátu exportu na kanonický tvar.
+
+    Formát "data" ({"source": {...}, "target": {...}, "metadata": {...}})
+    i formát "relationships" ({"from_id", "to_id", "attributes": {...}}) dají
+    záznam {"id", "type", "source", "target", "metadata"}; atributy se
+    zploští do metadata, rev_attributes do reverse_metadata a ostatní
+    top-level klíče se zachovají.
+
+    Args:
+        relationship: Záznam vztahu
+
+    Returns:
+        Dict[str, Any]: Vztah v kanonickém tvaru
+    """
+    normalized: Dict[str, Any] = {}
+    if relationship.get("id") is not None:
+        normalized["id"] = relationship["id"]
+    normalized["type"] = relationship.get("type")
+    normalized["source"] = _normalize_endpoint(relationship, "source", "from")
+    normalized["target"] = _normalize_endpoint(relationship, "target", "to")
+
+    metadata = dict(relationship.get("metadata") or {})
+    for name, attribute in (relationship.get("attributes") or {}).items():
+        metadata.setdefault(name, _attribute_value(attribute))
+    normalized["metadata"] = metadata
+    reverse_metadata = {
+        name: _attribute_value(attribute)
+        for name, attribute in (relationship.get("rev_attributes") or {}).items()
+    }
+    if reverse_metadata:
+        normalized["reverse_metadata"] = reverse_metadata
+
+    for key, value in relationship.items():
+        if key not in _RELATIONSHIP_FIELDS:
+            normalized[key] = value
+    return normalized
+
+
+def merge_relationships(
+    relationship: Dict[str, Any], other: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Doplní kanonický vztah o údaje ze stejného vztahu v jiném formátu.
+
+    Hodnoty prvního záznamu mají přednost; chybějící atributy koncových
+    entit, metadata a další klíče se doplní z druhého záznamu.
+
+    Args:
+        relationship: Vztah v kanonickém tvaru
+        other: Tentýž vztah v kanonickém tvaru z jiného zdroje
+
+    Returns:
+        Dict[str, Any]: Nový sloučený vztah
+    """
+    merged = dict(relationship)
+    for key, value in other.items():
+        if key in ("source", "target", "metadata", "reverse_metadata"):
+            merged[key] = {**value, **merged.get(key, {})}
+        elif merged.get(key) is None:
+            merged[key] = value
+    return merged
+
+
+def relationship_key(
+    relationship: Dict[str, Any],
+) -> Optional[Tuple[Any, Optional[str], Optional[str]]]:
+    """
+    Vrátí klíč pro rozpoznání stejného vztahu v různých souborech a formátech.
+
+    Args:
+        relationship: Záznam vztahu v libovolném formátu
+
+    Returns:
+        Optional[Tuple]: (ID vztahu, ID zdroje, ID cíle), nebo None bez ID vztahu
+    """
+    edge_id = relationship.get("id")
+    if edge_id is None:
+        return None
+    return (edge_id, *relationship_endpoints(relationship))
+
+
+# Směry, ve kterých lze vztahy entity procházet
+EDGE_DIRECTIONS = ("both", "outgoing", "incoming")
+
+# Chybějící hodnota ve sloupcích EdgeStore
+_MISSING = -1
+
+# Kódy koncových entit vztahu bez názvů a typů
+_MISSING_ENDPOINTS = array("i", (_MISSING,) * 4)
+
+# Sekce atributů vztahu ve sloupci atributů EdgeStore (None = top-level klíče)
+_ATTRIBUTE_SECTIONS = ("metadata", "reverse_metadata", None)
+
+# Klíče kanonického vztahu uložené ve vlastních sloupcích nebo sekcích
+_CANONICAL_FIELDS = frozenset(
+    ("id", "type", "source", "target", "metadata", "reverse_metadata")
+)
+
+
+class _Interner:
+    """
+    Tabulka internovaných hodnot: každá hodnota je uložena jednou a hrany
+    odkazují na její celočíselný kód.
+    """
+
+    def __init__(self, values: Iterable[Any] = ()):
+        self.values: List[Any] = []
+        self._codes: Dict[Any, int] = {}
+        for value in values:
+            self.code(value)
+
+    @staticmethod
+    def _key(value: Any) -> Any:
+        """Vrátí hashovatelný klíč hodnoty (typ odliší 1, 1.0 a True)."""
+        if value.__class__ is str:
+            return value
+        if value is None or isinstance(value, (int, float)):
+            return value.__class__, value
+        return list, json.dumps(value, sort_keys=True, ensure_ascii=False)
+
+    def code(self, value: Any) -> int:
+        """Vrátí kód hodnoty, novou hodnotu nejprve uloží (zmrazenou)."""
+        key = value if value.__class__ is str else self._key(value)
+        code = self._codes.get(key)
+        if code is None:
+            code = len(self.values)
+            self._codes[key] = code
+            self.values.append(freeze(value))
+        return code
+
+    def find(self, value: Any) -> Optional[int]:
+        """Vrátí kód existující hodnoty, nebo None."""
+        return self._codes.get(self._key(value))
+
+
+class _EdgeRecords(Sequence):
+    """Záznamy vztahů, které se z řádků sloupcové tabulky dekódují až při přístupu."""
+
+    def __init__(self, store: "EdgeStore"):
+        self._store = store
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [
+                self._store.record(number)
+                for number in range(len(self._store))[position]
+            ]
+        if position < 0:
+            position += len(self._store)
+        if not 0 <= position < len(self._store):
+            raise IndexError("Pozice vztahu mimo rozsah")
+        return self._store.record(position)
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+
+class EdgeStore:
+    """
+    Sloupcové úložiště vztahů se seznamy sousednosti podle ID entity.
+
+    Vztahy z obou formátů exportu se při vložení převedou na kanonický tvar
+    (normalize_relationship) a uloží jako řádek sloupcové tabulky:
+
+    - ID entit, typy vztahů, názvy a hodnoty atributů jsou internované
+      a sloupce obsahují jen jejich celočíselné kódy (array("i"), 4 B na
+      hodnotu); jedinečná ID vztahů se ukládají přímo
+    - atributy hrany jsou jedna internovaná n-tice kódů (sekce, klíč,
+      hodnota), takže hrany se stejnými atributy sdílejí jeden objekt
+    - záznam vztahu se sestaví až při přístupu přes edges / record()
+
+    Tentýž vztah (stejné ID, zdroj a cíl) z více souborů nebo formátů se
+    uloží jednou a jeho údaje se sloučí. Odchozí i příchozí seznamy
+    sousednosti jsou rozdělené podle typu vztahu, takže dotaz stojí
+    O(stupeň entity), resp. jen počet vztahů daného typu.
+    """
+
+    def __init__(self):
+        """Inicializuje prázdné úložiště vztahů."""
+        self.entity_ids = _Interner()
+        self.types = _Interner()
+        self.values = _Interner()
+        self.sources = array("i")
+        self.targets = array("i")
+        self.type_codes = array("i")
+        self.edge_ids: List[Any] = []
+        # Názvy a typy koncových entit (kódy v values), čtyři kódy na hranu
+        self.endpoint_codes = array("i")
+        self.attributes: List[Tuple[int, ...]] = []
+        self.outgoing: Dict[int, Dict[int, array]] = {}
+        self.incoming: Dict[int, Dict[int, array]] = {}
+        self.edges = _EdgeRecords(self)
+        self._attribute_sets: Dict[Tuple[int, ...], Tuple[int, ...]] = {}
+        # ID vztahu -> pozice; vztahy se stejným ID a jinými konci zvlášť
+        self._positions: Dict[Any, int] = {}
+        self._shared_id_positions: Dict[Tuple[Any, int, int], int] = {}
+        # Seznamy sousednosti převzaté z kopie (copy) se před změnou zkopírují;
+        # None znamená, že úložiště všechny seznamy vlastní
+        self._copied_adjacency: Optional[Set[Tuple[bool, int]]] = None
+
+    def __len__(self) -> int:
+        """Vrátí počet řádků úložiště (včetně řádků odebraných vztahů)."""
+        return len(self.sources)
+
+    def _entity_code(self, entity_id: Optional[str]) -> int:
+        """Vrátí kód ID entity (_MISSING pro chybějící ID)."""
+        return self.entity_ids.code(entity_id) if entity_id else _MISSING
+
+    def _value_code(self, value: Any) -> int:
+        """Vrátí kód hodnoty (_MISSING pro None)."""
+        return _MISSING if value is None else self.values.code(value)
+
+    def add(self, relationship: Dict[str, Any]) -> Optional[int]:
+        """
+        Přidá vztah v libovolném formátu exportu do úložiště.
+
+        Vztah se stejným ID, zdrojem a cílem, který se objeví ve více souborech
+        nebo v obou formátech, se uloží pouze jednou a jeho údaje se sloučí.
+
+        Args:
+            relationship: Vztah ve formátu {"source": {...}, "target": {...}, ...}
+                          nebo {"from_id": ..., "to_id": ..., "attributes": ...}
+
+        Returns:
+            Optional[int]: Pozice nového nebo sloučeného vztahu, None pro vztah
+            bez zdroje i cíle
+        """
+        normalized = normalize_relationship(relationship)
+        source_id = normalized["source"].get("id")
+        target_id = normalized["target"].get("id")
+        if not source_id and not target_id:
+            return None
+
+        edge_id = normalized.get("id")
+        if edge_id is not None:
+            position = self._find(
+                edge_id, self._entity_code(source_id), self._entity_code(target_id)
+            )
+            if position is not None:
+                self._encode(
+                    position, merge_relationships(self.record(position), normalized)
+                )
+                return position
+
+        position = len(self)
+        self.sources.append(_MISSING)
+        self.targets.append(_MISSING)
+        self.type_codes.append(_MISSING)
+        self.edge_ids.append(None)
+        self.endpoint_codes.extend(_MISSING_ENDPOINTS)
+        self.attributes.append(())
+        self._encode(position, normalized)
+        self._index_position(position)
+        return position
+
+    def _find(self, edge_id: Any, source: int, target: int) -> Optional[int]:
+        """Vrátí pozici vztahu se stejným ID a konci, nebo None."""
+        position = self._positions.get(edge_id)
+        if (
+            position is not None
+            and self.sources[position] == source
+            and self.targets[position] == target
+        ):
+            return position
+        if not self._shared_id_positions:
+            return None
+        return self._shared_id_positions.get((edge_id, source, target))
+
+    def _adjacency_for_update(
+        self, outgoing: bool, entity_code: int
+    ) -> Dict[int, array]:
+        """Vrátí seznamy sousednosti entity, které lze změnit na místě."""
+        adjacency = self.outgoing if outgoing else self.incoming
+        by_type = adjacency.get(entity_code)
+        if self._copied_adjacency is None:
+            if by_type is None:
+                by_type = adjacency[entity_code] = {}
+            return by_type
+
+        key = (outgoing, entity_code)
+        if key not in self._copied_adjacency:
+            # Seznamy sdílené s původním úložištěm se před změnou zkopírují
+            by_type = adjacency[entity_code] = {
+                type_code: array("i", positions)
+                for type_code, positions in (by_type or {}).items()
+            }
+            self._copied_adjacency.add(key)
+        elif by_type is None:
+            by_type = adjacency[entity_code] = {}
+        return by_type
+
+    def _index_position(self, position: int) -> None:
+        """Zařadí vztah do seznamů sousednosti a mapy ID vztahů."""
+        source, target = self.sources[position], self.targets[position]
+        type_code = self.type_codes[position]
+        if source != _MISSING:
+            by_type = self._adjacency_for_update(True, source)
+            by_type.setdefault(type_code, array("i")).append(position)
+        if target != _MISSING:
+            by_type = self._adjacency_for_update(False, target)
+            by_type.setdefault(type_code, array("i")).append(position)
+
+        edge_id = self.edge_ids[position]
+        if edge_id is not None:
+            if edge_id in self._positions:
+                self._shared_id_positions[(edge_id, source, target)] = position
+            else:
+                self._positions[edge_id] = position
+
+    def remove(self, position: int) -> None:
+        """
+        Odebere vztah z úložiště.
+
+        Pozice ostatních vztahů se nemění: řádek zůstane jako prázdné místo
+        bez zdroje i cíle, které se nevrací v edges_for ani nevstupuje
+        do grafu entit.
+
+        Args:
+            position: Pozice vztahu
+        """
+        source, target = self.sources[position], self.targets[position]
+        type_code = self.type_codes[position]
+        for outgoing, entity_code in ((True, source), (False, target)):
+            if entity_code == _MISSING:
+                continue
+            by_type = self._adjacency_for_update(outgoing, entity_code)
+            positions = by_type.get(type_code)
+            if positions is not None and position in positions:
+                positions.remove(position)
+                if not positions:
+                    del by_type[type_code]
+            if not by_type:
+                adjacency = self.outgoing if outgoing else self.incoming
+                del adjacency[entity_code]
+
+        edge_id = self.edge_ids[position]
+        if edge_id is not None:
+            if self._positions.get(edge_id) == position:
+                del self._positions[edge_id]
+            else:
+                self._shared_id_positions.pop((edge_id, source, target), None)
+
+        self.sources[position] = _MISSING
+        self.targets[position] = _MISSING
+        self.edge_ids[position] = None
+        self.endpoint_codes[position * 4 : position * 4 + 4] = _MISSING_ENDPOINTS
+        self.attributes[position] = ()
+
+    def copy(self) -> "EdgeStore":
+        """
+        Vytvoří kopii úložiště, kterou lze měnit bez vlivu na originál.
+
+        Sloupce a mapy ID se zkopírují celé (kopie polí a slovníků v C),
+        seznamy sousednosti až při první změně dané entity. Internované
+        tabulky se pouze rozšiřují, proto je kopie sdílí.
+
+        Returns:
+            EdgeStore: Kopie úložiště
+        """
+        store = EdgeStore()
+        store.entity_ids = self.entity_ids
+        store.types = self.types
+        store.values = self.values
+        for name in ("sources", "targets", "type_codes", "endpoint_codes"):
+            setattr(store, name, array("i", getattr(self, name)))
+        store.edge_ids = list(self.edge_ids)
+        store.attributes = list(self.attributes)
+        store.outgoing = dict(self.outgoing)
+        store.incoming = dict(self.incoming)
+        store._attribute_sets = dict(self._attribute_sets)
+        store._positions = dict(self._positions)
+        store._shared_id_positions = dict(self._shared_id_positions)
+        store._copied_adjacency = set()
+        return store
+
+    def _encode(self, position: int, relationship: Dict[str, Any]) -> None:
+        """Zapíše kanonický vztah do řádku sloupcové tabulky."""
+        source, target = relationship["source"], relationship["target"]
+        self.sources[position] = self._entity_code(source.get("id"))
+        self.targets[position] = self._entity_code(target.get("id"))
+        self.type_codes[position] = self.types.code(relationship.get("type") or "")
+        self.edge_ids[position] = relationship.get("id")
+        start = position * 4
+        self.endpoint_codes[start : start + 4] = array(
+            "i",
+            (
+                self._value_code(source.get("label")),
+                self._value_code(source.get("type")),
+                self._value_code(target.get("label")),
+                self._value_code(target.get("type")),
+            ),
+        )
+
+        code = self.values.code
+        codes: List[int] = []
+        for section, name in enumerate(_ATTRIBUTE_SECTIONS):
+            if name is None:
+                items = (
+                    (key, value)
+                    for key, value in relationship.items()
+                    if key not in _CANONICAL_FIELDS
+                )
+            else:
+                items = (relationship.get(name) or {}).items()
+            for key, value in items:
+                codes += (section, code(key), code(value))
+        attributes = tuple(codes)
+        self.attributes[position] = self._attribute_sets.setdefault(
+            attributes, attributes
+        )
+
+    def _endpoint(self, entity_code: int, label_code: int, type_code: int) -> Dict:
+        """Dekóduje koncovou entitu vztahu."""
+        endpoint: Dict[str, Any] = {}
+        if entity_code != _MISSING:
+            endpoint["id"] = self.entity_ids.values[entity_code]
+        if label_code != _MISSING:
+            endpoint["label"] = self.values.values[label_code]
+        if type_code != _MISSING:
+            endpoint["type"] = self.values.values[type_code]
+        return endpoint
+
+    def record(self, position: int) -> Dict[str, Any]:
+        """
+        Dekóduje vztah z řádku sloupcové tabulky.
+
+        Args:
+            position: Pozice vztahu
+
+        Returns:
+            Dict[str, Any]: Nový záznam vztahu v kanonickém tvaru
+        """
+        relationship: Dict[str, Any] = {}
+        edge_id = self.edge_ids[position]
+        if edge_id is not None:
+            relationship["id"] = edge_id
+        type_name = self.types.values[self.type_codes[position]]
+        relationship["type"] = type_name or None
+        start = position * 4
+        source_label, source_type, target_label, target_type = self.endpoint_codes[
+            start : start + 4
+        ]
+        relationship["source"] = self._endpoint(
+            self.sources[position], source_label, source_type
+        )
+        relationship["target"] = self._endpoint(
+            self.targets[position], target_label, target_type
+        )
+        relationship["metadata"] = {}
+
+        values = self.values.values
+        attributes = self.attributes[position]
+        for offset in range(0, len(attributes), 3):
+            section, key, value = attributes[offset : offset + 3]
+            name = _ATTRIBUTE_SECTIONS[section]
+            if name is None:
+                relationship[values[key]] = values[value]
+            else:
+                relationship.setdefault(name, {})[values[key]] = values[value]
+        return relationship
+
+    def endpoints(self, position: int) -> Tuple[Optional[str], Optional[str], str]:
+        """
+        Vrátí ID zdroje, ID cíle a typ vztahu bez dekódování atributů.
+
+        Args:
+            position: Pozice vztahu
+
+        Returns:
+            Tuple[Optional[str], Optional[str], str]: Zdroj, cíl a typ vztahu
+        """
+        source, target = self.sources[position], self.targets[position]
+        return (
+            None if source == _MISSING else self.entity_ids.values[source],
+            None if target == _MISSING else self.entity_ids.values[target],
+            self.types.values[self.type_codes[position]],
+        )
+
+    def _positions_for(
+        self,
+        adjacency: Dict[int, Dict[int, array]],
+        entity_code: int,
+        type_code: Optional[int],
+    ) -> Iterable[int]:
+        """Vrátí pozice vztahů entity z jednoho seznamu sousednosti."""
+        by_type = adjacency.get(entity_code)
+        if not by_type:
+            return ()
+        if type_code is not None:
+            return by_type.get(type_code, ())
+        return [position for positions in by_type.values() for position in positions]
+
+    def edges_for(
+        self,
+        entity_id: str,
+        relationship_type: Optional[str] = None,
+        direction: str = "both",
+    ) -> List[Dict[str, Any]]:
+        """
+        Vrátí vztahy entity v pořadí, v jakém byly načteny.
+
+        Args:
+            entity_id: ID entity
+            relationship_type: Volitelný filtr typu vztahu (např. "has_supplier")
+            direction: "outgoing" (entita je zdroj), "incoming" (entita je cíl)
+                       nebo "both"
+
+        Returns:
+            List[Dict[str, Any]]: Vztahy entity v kanonickém tvaru
+
+        Raises:
+            ValueError: Pokud směr není podporován
+        """
+        if direction not in EDGE_DIRECTIONS:
+            raise ValueError(
+                f"Nepodporovaný směr vztahů '{direction}', povolené: {EDGE_DIRECTIONS}"
+            )
+
+        entity_code = self.entity_ids.find(entity_id)
+        type_code = None
+        if relationship_type is not None:
+            type_code = self.types.find(relationship_type)
+            if type_code is None:
+                return []
+        if entity_code is None:
+            return []
+
+        positions: List[int] = []
+        if direction in ("both", "outgoing"):
+            positions.extend(self._positions_for(self.outgoing, entity_code, type_code))
+        if direction in ("both", "incoming"):
+            positions.extend(self._positions_for(self.incoming, entity_code, type_code))
+
+        # Seřazení pozic zachová pořadí ze souborů a odstraní smyčky (zdroj == cíl)
+        return [self.record(position) for position in sorted(set(positions))]
+
+    def to_parts(self) -> Dict[str, Any]:
+        """
+        Převede úložiště na serializovatelnou podobu (tabulky a sloupce).
+
+        Returns:
+            Dict[str, Any]: Části úložiště pro EdgeStore.from_parts
+        """
+        return {
+            "entity_ids": self.entity_ids.values,
+            "types": self.types.values,
+            "values": self.values.values,
+            "sources": self.sources.tolist(),
+            "targets": self.targets.tolist(),
+            "type_codes": self.type_codes.tolist(),
+            "edge_ids": self.edge_ids,
+            "endpoint_codes": self.endpoint_codes.tolist(),
+            "attributes": [list(attributes) for attributes in self.attributes],
+        }
+
+    @classmethod
+    def from_parts(cls, parts: Dict[str, Any]) -> "EdgeStore":
+        """
+        Obnoví úložiště z výsledku to_parts a znovu sestaví seznamy sousednosti.
+
+        Args:
+            parts: Části úložiště
+
+        Returns:
+            EdgeStore: Obnovené úložiště
+        """
+        store = cls()
+        store.entity_ids = _Interner(parts["entity_ids"])
+        store.types = _Interner(parts["types"])
+        store.values = _Interner(parts["values"])
+        for name in ("sources", "targets", "type_codes", "endpoint_codes"):
+            setattr(store, name, array("i", parts[name]))
+        store.edge_ids = list(parts["edge_ids"])
+        store.attributes = [
+            store._attribute_sets.setdefault(tuple(codes), tuple(codes))
+            for codes in parts["attributes"]
+        ]
+        for position in range(len(store)):
+            store._index_position(position)
+        return store
+
+
+def source_signatures(data_path: str) -> Dict[str, List[int]]:
+    """
+    Vrátí podpisy (mtime_ns, velikost) JSON souborů datového adresáře.
+
+    Args:
+        data_path: Cesta k datovému adresáři
+
+    Returns:
+        Dict[str, List[int]]: Název souboru -> [mtime_ns, velikost]
+    """
+    signatures = {}
+    for entry in os.scandir(data_path):
+        if entry.name.endswith(".json") and entry.is_file():
+            stat = entry.stat()
+            signatures[entry.name] = [stat.st_mtime_ns, stat.st_size]
+    return signatures
+
+
+@dataclass(frozen=True)
+class SourceChanges:
+    """Přidané, změněné a odebrané soubory mezi dvěma manifesty podpisů."""
+
+    added: Tuple[str, ...] = ()
+    changed: Tuple[str, ...] = ()
+    removed: Tuple[str, ...] = ()
+
+    def __bool__(self) -> bool:
+        """Vrátí True, pokud se některý soubor změnil."""
+        return bool(self.added or self.changed or self.removed)
+
+    @classmethod
+    def between(
+        cls, previous: Dict[str, List[int]], current: Dict[str, List[int]]
+    ) -> "SourceChanges":
+        """
+        Porovná dva manifesty podpisů souborů (výsledky source_signatures).
+
+        Args:
+            previous: Podpisy souborů, ze kterých byl sestaven index
+            current: Aktuální podpisy souborů
+
+        Returns:
+            SourceChanges: Názvy přidaných, změněných a odebraných souborů
+        """
+        return cls(
+            added=tuple(sorted(set(current) - set(previous))),
+            changed=tuple(
+                sorted(
+                    name
+                    for name, signature in current.items()
+                    if name in previous and previous[name] != signature
+                )
+            ),
+            removed=tuple(sorted(set(previous) - set(current))),
+        )
+
+
+def _insert_sorted(mapping: Dict[Any, List[Any]], key: Any, value: Any) -> None:
+    """
+    Vloží hodnotu do seřazeného seznamu v mapě (bez duplicit).
+
+    Seznam se nahradí novým, protože jej může sdílet předchozí generace
+    indexu (DataIndex.apply_changes).
+    """
+    values = mapping.get(key, [])
+    if value not in values:
+        values = list(values)
+        bisect.insort(values, value)
+        mapping[key] = values
+
+
+def _remove_sorted(mapping: Dict[Any, List[Any]], key: Any, value: Any) -> None:
+    """Odebere hodnotu ze seznamu v mapě; prázdný seznam se z mapy odstraní."""
+    values = [item for item in mapping.get(key, ()) if item != value]
+    if values:
+        mapping[key] = values
+    else:
+        mapping.pop(key, None)
+
+
+class DataIndex:
+    """
+    Index entit a souvisejících souborů jednoho datového adresáře.
+
+    Obsahuje:
+    - entities: ID entity -> detail (entity_detail_*.json)
+    - label_index: normalizovaný název -> seznam ID entit
+    - name_index: trigramový index nad klíči label_index (sestaví se líně)
+    - supply_chain_graph: graf dodavatelů z cest supply_chain_items (líně)
+    - risk_propagation: řídká matice grafu dodavatelů pro propagaci rizika (líně)
+    - entity_graph: neorientovaný graf vztahů a dodavatelského řetězce (líně)
+    - hs_code_index: prefixový strom HS kódů produktů ze supply_chain_items
+      a hs_code_matches z internal_records (líně)
+    - search_postings, entity_postings: posting listy podle ID, země a průmyslu
+      nad general_search_results a entities (líně)
+    - supplier_dependencies: předpočítané jediné body selhání v dodavatelských
+      řetězcích společností ze supply_chain_items (líně)
+    - families: ID entity -> rodina souborů -> seznam cest
+    - identifier_index: typ identifikátoru -> normalizovaná hodnota -> seznam ID
+      entit (identifikátory z entity_detail a DUNS z internal_*.json)
+    - internal_records: ID entity -> interní data (internal_*.json)
+    - search_records: ID entity -> záznam z entity_search_*.json
+    - supply_chain_items: ID zdrojové entity -> položky dodavatelského řetězce
+    - relationships: seznamy sousednosti vztahů z relationships_*.json
+    - general_relationships: seznamy sousednosti vztahů z relationships.json
+
+    Index sestavený z JSON souborů si pamatuje, ze kterého souboru pochází
+    každá položka, takže apply_changes promítne změnu několika souborů
+    do nové generace indexu bez úplného přestavění.
+    """
+
+    def __init__(self, data_path: str):
+        """
+        Inicializuje prázdný index.
+
+        Args:
+            data_path: Cesta k adresáři s mock daty
+        """
+        self.data_path = data_path
+        self.entities: Dict[str, Dict[str, Any]] = {}
+        self.label_index: Dict[str, List[str]] = {}
+        self.families: Dict[str, Dict[str, List[str]]] = {}
+        self.identifier_index: Dict[str, Dict[str, List[str]]] = {}
+        self.internal_records: Dict[str, Dict[str, Any]] = {}
+        self.search_records: Dict[str, Dict[str, Any]] = {}
+        self.general_search_results: List[Dict[str, Any]] = []
+        self.supply_chain_items: Dict[str, List[Dict[str, Any]]] = {}
+        self.relationships = EdgeStore()
+        self.general_relationships = EdgeStore()
+        # Hash obsahu zdrojových souborů, pokud byl index načten ze snapshotu
+        self.content_hash: Optional[str] = None
+        # Čtení záznamů entit, pokud je adresář dat shardovaný
+        self.shards: Optional["ShardStore"] = None
+        # Podpisy souborů, ze kterých index vznikl, a pořadí generace indexu
+        self.signatures: Dict[str, List[int]] = {}
+        self.generation = 0
+        # Jedinečné v rámci procesu i napříč konektory a adresáři dat
+        self.uid = next(_index_uids)
+        # Původ položek podle souborů; vyplní jej jen build() (apply_changes)
+        self.tracks_sources = False
+        self._detail_files: Dict[str, str] = {}
+        self._entity_paths: Dict[str, List[str]] = {}
+        self._identifier_keys: Dict[str, List[Tuple[str, str]]] = {}
+        self._internal_docs: Dict[str, Dict[str, Any]] = {}
+        self._internal_by_company: Dict[str, List[str]] = {}
+        self._internal_by_duns: Dict[str, List[str]] = {}
+        self._search_files: Dict[str, List[str]] = {}
+        self._search_paths: Dict[str, List[str]] = {}
+        self._supply_chain_files: Dict[str, List[str]] = {}
+        self._supply_chain_paths: Dict[str, List[str]] = {}
+        self._edge_files: Dict[str, array] = {}
+        # Soubor, který vztah na dané pozici přidal, a další soubory se stejným
+        # vztahem (sloučeným do téže pozice)
+        self._edge_owners: List[Optional[str]] = []
+        self._edge_co_owners: Dict[int, Tuple[str, ...]] = {}
+        # Odvozené struktury se sestavují až při prvním použití
+        self._name_index: Optional[TrigramIndex] = None
+        self._supply_chain_graph: Optional[SupplyChainGraph] = None
+        self._risk_propagation: Optional[RiskPropagation] = None
+        self._entity_graph: Optional["EntityGraph"] = None
+        self._supplier_dependencies: Optional["SupplierDependencyIndex"] = None
+        self._hs_code_index: Optional[HSCodeIndex] = None
+        self._search_postings: Optional[CompanyPostings] = None
+        self._entity_postings: Optional[CompanyPostings] = None
+        self._gazetteer: Optional[CompanyGazetteer] = None
+        self._derived_lock = threading.Lock()
+
+    @classmethod
+    def build(cls, data_path: str, load_json: Callable[[str], Any]) -> "DataIndex":
+        """
+        Sestaví index z adresáře mock dat.
+
+        Args:
+            data_path: Cesta k adresáři s mock daty
+            load_json: Funkce pro načtení a parsování JSON souboru
+
+        Returns:
+            DataIndex: Sestavený index
+        """
+        index = cls(data_path)
+        # Podpisy se zjistí před čtením, pozdější změna se projeví při příštím
+        # porovnání manifestů
+        index.signatures = source_signatures(data_path)
+        index.tracks_sources = True
+        index._load_entity_details(load_json)
+        index._load_internal_records(load_json)
+        index._load_search_records(load_json)
+        index._load_supply_chain(load_json)
+        index._load_relationships(load_json)
+        logger.info(
+            f"Sestaven index mock dat pro {data_path}: {len(index.entities)} entit"
+        )
+        return index
+
+    def _glob(self, pattern: str) -> List[str]:
+        """Vrátí seřazený seznam souborů odpovídajících vzoru v datovém adresáři."""
+        return sorted(glob.glob(os.path.join(self.data_path, pattern)))
+
+    def _read_file(self, file_path: str, load_json: Callable[[str], Any]) -> Any:
+        """Načte soubor; chyba se zaloguje a vrátí se None."""
+        try:
+            return load_json(file_path)
+        except Exception as e:
+            logger.warning(f"Chyba při zpracování souboru {file_path}: {str(e)}")
+            return None
+
+    def _load_entity_details(self, load_json: Callable[[str], Any]) -> None:
+        """Načte entity_detail_*.json a sestaví mapu rodin souborů."""
+        for file_path in self._glob(f"{ENTITY_DETAIL_PREFIX}*.json"):
+            detail = self._read_detail_file(file_path, load_json)
+            if detail is not None and detail["id"] not in self.entities:
+                self._set_entity(detail["id"], detail, file_path)
+
+    def _read_detail_file(
+        self, file_path: str, load_json: Callable[[str], Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Načte detail entity a zaznamená, ze kterého souboru pochází."""
+        detail = self._read_file(file_path, load_json)
+        entity_id = detail.get("id") if isinstance(detail, dict) else None
+        if not entity_id:
+            return None
+        self._detail_files[file_path] = entity_id
+        _insert_sorted(self._entity_paths, entity_id, file_path)
+        return detail
+
+    def _set_entity(
+        self, entity_id: str, detail: Dict[str, Any], file_path: str
+    ) -> None:
+        """Zařadí detail entity do indexů názvů, identifikátorů a rodin souborů."""
+        self.entities[entity_id] = detail
+        # Stejný název může mít více entit (např. závody BOS AUTOMOTIVE)
+        _insert_sorted(
+            self.label_index, normalize_name(detail.get("label", "")), entity_id
+        )
+        for identifier in detail.get("identifiers", []):
+            self._add_identifier(
+                identifier.get("type"), identifier.get("value"), entity_id
+            )
+        self.families[entity_id] = self._family_map(file_path)
+
+    def _unset_entity(self, entity_id: str) -> None:
+        """Odebere entitu z indexů názvů a rodin souborů."""
+        detail = self.entities.pop(entity_id)
+        _remove_sorted(
+            self.label_index, normalize_name(detail.get("label", "")), entity_id
+        )
+        self.families.pop(entity_id, None)
+
+    def _family_map(self, detail_path: str) -> Dict[str, List[str]]:
+        """Vrátí soubory rodin patřící k souboru detailu entity."""
+        # Přípona souboru (např. "mb_tool") určuje rodinu souvisejících souborů
+        suffix = os.path.basename(detail_path)[len(ENTITY_DETAIL_PREFIX) : -5]
+        return {
+            family: self._glob(f"{family}_{suffix}.json") for family in FILE_FAMILIES
+        }
+
+    def _add_identifier(
+        self, identifier_type: Optional[str], value: Any, entity_id: str
+    ) -> None:
+        """Přidá identifikátor entity do indexu identifikátorů."""
+        if not identifier_type or value in (None, ""):
+            return
+        identifier_type = normalize_identifier_type(identifier_type)
+        key = normalize_identifier(identifier_type, value)
+        if not key:
+            return
+        _insert_sorted(
+            self.identifier_index.setdefault(identifier_type, {}), key, entity_id
+        )
+        _insert_sorted(self._identifier_keys, entity_id, (identifier_type, key))
+
+    def _index_identifiers(self, entity_id: str) -> None:
+        """Znovu zařadí identifikátory entity z detailu a interních dat."""
+        for identifier_type, key in self._identifier_keys.pop(entity_id, ()):
+            _remove_sorted(self.identifier_index[identifier_type], key, entity_id)
+        detail = self.entities.get(entity_id)
+        if detail is None:
+            return
+        for identifier in detail.get("identifiers", []):
+            self._add_identifier(
+                identifier.get("type"), identifier.get("value"), entity_id
+            )
+        internal_data = self.internal_records.get(entity_id)
+        if internal_data is not None:
+            self._add_identifier(
+                "duns_number", internal_data.get("duns_number"), entity_id
+            )
+
+    def _load_internal_records(self, load_json: Callable[[str], Any]) -> None:
+        """Propojí interní data s entitami přes DUNS číslo nebo company_id."""
+        for file_path in self._glob("internal_*.json"):
+            self._read_internal_file(file_path, load_json)
+
+        for company_id, paths in self._internal_by_company.items():
+            self.internal_records[company_id] = self._internal_docs[paths[0]]
+
+        # Spojení entity s interními daty přes index DUNS čísel
+        for duns_key, entity_ids in self.identifier_index.get(
+            "duns_number", {}
+        ).items():
+            paths = self._internal_by_duns.get(duns_key)
+            if not paths:
+                continue
+            for entity_id in entity_ids:
+                self.internal_records.setdefault(
+                    entity_id, self._internal_docs[paths[0]]
+                )
+
+        # DUNS z interních dat zpřístupní entitu i bez DUNS v entity_detail
+        for entity_id, internal_data in self.internal_records.items():
+            if entity_id in self.entities:
+                self._add_identifier(
+                    "duns_number", internal_data.get("duns_number"), entity_id
+                )
+
+    def _read_internal_file(
+        self, file_path: str, load_json: Callable[[str], Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Načte interní data a zařadí je podle company_id a DUNS čísla."""
+        internal_data = self._read_file(file_path, load_json)
+        if not isinstance(internal_data, dict):
+            return None
+        self._internal_docs[file_path] = internal_data
+        for mapping, key in self._internal_keys(internal_data):
+            _insert_sorted(mapping, key, file_path)
+        return internal_data
+
+    def _forget_internal_file(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Odebere interní data souboru z map podle company_id a DUNS čísla."""
+        internal_data = self._internal_docs.pop(file_path, None)
+        if internal_data is not None:
+            for mapping, key in self._internal_keys(internal_data):
+                _remove_sorted(mapping, key, file_path)
+        return internal_data
+
+    def _internal_keys(
+        self, internal_data: Dict[str, Any]
+    ) -> List[Tuple[Dict[str, List[str]], str]]:
+        """Vrátí mapy a klíče (company_id, DUNS), pod kterými se data hledají."""
+        keys = []
+        if internal_data.get("company_id"):
+            keys.append((self._internal_by_company, internal_data["company_id"]))
+        if internal_data.get("duns_number"):
+            duns_key = normalize_identifier("duns_number", internal_data["duns_number"])
+            keys.append((self._internal_by_duns, duns_key))
+        return keys
+
+    def _resolve_internal(self, key: str) -> Optional[Dict[str, Any]]:
+        """Vrátí interní data pro company_id nebo entitu (přes DUNS z detailu)."""
+        paths = self._internal_by_company.get(key)
+        if paths:
+            return self._internal_docs[paths[0]]
+        detail = self.entities.get(key)
+        for identifier in (detail or {}).get("identifiers", []):
+            if normalize_identifier_type(identifier.get("type") or "") != (
+                "duns_number"
+            ):
+                continue
+            duns_key = normalize_identifier("duns_number", identifier.get("value"))
+            paths = self._internal_by_duns.get(duns_key)
+            if paths:
+                return self._internal_docs[paths[0]]
+        return None
+
+    def _load_search_records(self, load_json: Callable[[str], Any]) -> None:
+        """Načte záznamy z entity_search_*.json a obecného entity_search.json."""
+        for file_path in self._glob("entity_search_*.json"):
+            for entity in self._read_search_file(file_path, load_json):
+                entity_id = entity.get("id")
+                if entity_id and entity_id not in self.search_records:
+                    self.search_records[entity_id] = entity
+        self._load_general_search(load_json)
+
+    def _read_search_file(
+        self, file_path: str, load_json: Callable[[str], Any]
+    ) -> List[Dict[str, Any]]:
+        """Načte výsledky entity_search_*.json a zaznamená ID entit v souboru."""
+        results = _extract_items(self._read_file(file_path, load_json), "results")
+        entity_ids = list(dict.fromkeys(e.get("id") for e in results if e.get("id")))
+        self._search_files[file_path] = entity_ids
+        for entity_id in entity_ids:
+            _insert_sorted(self._search_paths, entity_id, file_path)
+        return results
+
+    def _load_general_search(self, load_json: Callable[[str], Any]) -> None:
+        """Načte výsledky obecného entity_search.json."""
+        self.general_search_results = []
+        general_path = os.path.join(self.data_path, "entity_search.json")
+        if os.path.exists(general_path):
+            try:
+                general_data = load_json(general_path)
+                if isinstance(general_data, dict):
+                    self.general_search_results = _extract_items(
+                        general_data, "results"
+                    )
+            except Exception as e:
+                logger.warning(f"Chyba při zpracování obecného souboru: {str(e)}")
+
+    def _load_supply_chain(self, load_json: Callable[[str], Any]) -> None:
+        """Seskupí položky supply_chain_*.json podle zdrojové entity."""
+        for file_path in self._glob("supply_chain_*.json"):
+            for item in self._read_supply_chain_file(file_path, load_json):
+                self.supply_chain_items.setdefault(_source_id(item), []).append(item)
+
+    def _read_supply_chain_file(
+        self, file_path: str, load_json: Callable[[str], Any]
+    ) -> List[Dict[str, Any]]:
+        """Načte položky se zdrojovou entitou a zaznamená zdroje v souboru."""
+        items = [
+            item
+            for item in _extract_items(self._read_file(file_path, load_json), "data")
+            if _source_id(item)
+        ]
+        source_ids = list(dict.fromkeys(_source_id(item) for item in items))
+        self._supply_chain_files[file_path] = source_ids
+        for source_id in source_ids:
+            _insert_sorted(self._supply_chain_paths, source_id, file_path)
+        return items
+
+    def _load_relationships(self, load_json: Callable[[str], Any]) -> None:
+        """Načte vztahy ze souborů relationships_*.json a relationships.json."""
+        for file_path in self._glob("relationships_*.json"):
+            self._read_relationship_file(file_path, load_json)
+        self._load_general_relationships(load_json)
+
+    def _read_relationship_file(
+        self, file_path: str, load_json: Callable[[str], Any]
+    ) -> None:
+        """Přidá vztahy souboru do úložiště a zaznamená jejich pozice."""
+        relationships_data = self._read_file(file_path, load_json)
+        if relationships_data is None:
+            return
+        positions = array("i")
+        for relationship in _extract_all_items(
+            relationships_data, *RELATIONSHIP_ARRAY_KEYS
+        ):
+            position = self.relationships.add(relationship)
+            if position is None:
+                continue
+            if position == len(self._edge_owners):
+                self._edge_owners.append(file_path)
+            elif self._edge_owners[position] != file_path:
+                co_owners = self._edge_co_owners.get(position, ())
+                if file_path not in co_owners:
+                    self._edge_co_owners[position] = co_owners + (file_path,)
+            positions.append(position)
+        self._edge_files[file_path] = positions
+
+    def _load_general_relationships(self, load_json: Callable[[str], Any]) -> None:
+        """Načte vztahy obecného relationships.json."""
+        self.general_relationships = EdgeStore()
+        general_path = os.path.join(self.data_path, "relationships.json")
+        if os.path.exists(general_path):
+            try:
+                general_data = load_json(general_path)
+                if isinstance(general_data, dict):
+                    for relationship in _extract_all_items(
+                        general_data, *RELATIONSHIP_ARRAY_KEYS
+                    ):
+                        self.general_relationships.add(relationship)
+            except Exception as e:
+                logger.warning(
+                    f"Chyba při zpracování obecného souboru vztahů: {str(e)}"
+                )
+
+    def _copy_for_update(self) -> "DataIndex":
+        """
+        Vytvoří další generaci indexu, kterou lze měnit bez vlivu na tuto.
+
+        Slovníky se zkopírují (kopie v C, bez kopírování záznamů); seznamy
+        v nich se při změně nahrazují novými (_insert_sorted, _remove_sorted),
+        takže čtenáři předchozí generace vidí stále stejný stav. Odvozené
+        struktury se sdílejí, dokud je apply_changes nezahodí.
+        """
+        index = copy.copy(self)
+        for name in (
+            "entities",
+            "label_index",
+            "families",
+            "internal_records",
+            "search_records",
+            "supply_chain_items",
+            "_detail_files",
+            "_entity_paths",
+            "_identifier_keys",
+            "_internal_docs",
+            "_internal_by_company",
+            "_internal_by_duns",
+            "_search_files",
+            "_search_paths",
+            "_supply_chain_files",
+            "_supply_chain_paths",
+            "_edge_files",
+            "_edge_co_owners",
+        ):
+            setattr(index, name, dict(getattr(self, name)))
+        index.identifier_index = {
+            identifier_type: dict(values)
+            for identifier_type, values in self.identifier_index.items()
+        }
+        index.content_hash = None
+        index.generation = self.generation + 1
+        index.uid = next(_index_uids)
+        index._derived_lock = threading.Lock()
+        return index
+
+    def apply_changes(
+        self,
+        changes: SourceChanges,
+        signatures: Dict[str, List[int]],
+        load_json: Callable[[str], Any],
+    ) -> "DataIndex":
+        """
+        Vytvoří další generaci indexu se změnami zdrojových souborů.
+
+        Znovu se načtou jen přidané a změněné soubory; položky odebraných
+        a změněných souborů se z indexů odeberou podle zaznamenaného původu.
+        Soubory, které sdílejí klíč se změněným souborem (stejná entita,
+        zdroj dodavatelského řetězce nebo sloučený vztah), se dočtou přes
+        load_json, aby platilo stejné pořadí priority jako při build().
+        Tento index se nemění, takže jej čtenáři mohou dál používat.
+
+        Args:
+            changes: Změněné soubory (SourceChanges.between)
+            signatures: Aktuální podpisy souborů pro příští porovnání
+            load_json: Funkce pro načtení a parsování JSON souboru
+
+        Returns:
+            DataIndex: Nová generace indexu
+
+        Raises:
+            ValueError: Pokud index nezná původ položek (snapshot, shardy)
+        """
+        if not self.tracks_sources:
+            raise ValueError(
+                "Index načtený ze snapshotu nebo shardů nelze aktualizovat po souborech"
+            )
+        index = self._copy_for_update()
+        index.signatures = signatures
+        stale = {
+            os.path.join(self.data_path, name)
+            for name in changes.changed + changes.removed
+        }
+        fresh = [
+            os.path.join(self.data_path, name)
+            for name in changes.added + changes.changed
+        ]
+
+        def family_paths(prefix: str, paths: Iterable[str]) -> List[str]:
+            return sorted(
+                path for path in paths if os.path.basename(path).startswith(prefix)
+            )
+
+        entity_ids = index._update_entities(
+            family_paths(ENTITY_DETAIL_PREFIX, stale),
+            family_paths(ENTITY_DETAIL_PREFIX, fresh),
+            load_json,
+        )
+        internal_keys = index._update_internal(
+            family_paths("internal_", stale),
+            family_paths("internal_", fresh),
+            load_json,
+        )
+        index._link_internal(entity_ids | internal_keys)
+        index._update_search(
+            family_paths("entity_search_", stale),
+            family_paths("entity_search_", fresh),
+            load_json,
+        )
+        supply_chain_sources = index._update_supply_chain(
+            family_paths("supply_chain_", stale),
+            family_paths("supply_chain_", fresh),
+            load_json,
+        )
+        relationship_paths = family_paths("relationships_", stale) + family_paths(
+            "relationships_", fresh
+        )
+        if relationship_paths:
+            index._update_relationships(relationship_paths, load_json)
+
+        names = set(changes.added + changes.changed + changes.removed)
+        if "entity_search.json" in names:
+            index._load_general_search(load_json)
+        if "relationships.json" in names:
+            index._load_general_relationships(load_json)
+        index._update_families(stale | set(fresh))
+
+        # Odvozené struktury dotčených rodin se sestaví znovu při prvním použití
+        if entity_ids:
+            index._name_index = None
+            index._entity_postings = None
+        if entity_ids or "entity_search.json" in names:
+            index._search_postings = None
+        if (
+            entity_ids
+            or family_paths("entity_search_", stale)
+            or family_paths("entity_search_", fresh)
+            or "entity_search.json" in names
+        ):
+            index._gazetteer = None
+        if supply_chain_sources:
+            index._supply_chain_graph = None
+            index._supplier_dependencies = None
+        if entity_ids or supply_chain_sources:
+            index._risk_propagation = None
+        if entity_ids or internal_keys or supply_chain_sources:
+            index._hs_code_index = None
+        if supply_chain_sources or relationship_paths or "relationships.json" in names:
+            index._entity_graph = None
+        return index
+
+    def _update_entities(
+        self,
+        stale: List[str],
+        fresh: List[str],
+        load_json: Callable[[str], Any],
+    ) -> Set[str]:
+        """Promítne změny entity_detail_*.json; vrátí ID dotčených entit."""
+        entity_ids = set()
+        for file_path in stale:
+            entity_id = self._detail_files.pop(file_path, None)
+            if entity_id is not None:
+                _remove_sorted(self._entity_paths, entity_id, file_path)
+                entity_ids.add(entity_id)
+        details = {}
+        for file_path in fresh:
+            detail = self._read_detail_file(file_path, load_json)
+            if detail is not None:
+                details[file_path] = detail
+                entity_ids.add(detail["id"])
+
+        for entity_id in sorted(entity_ids):
+            if entity_id in self.entities:
+                self._unset_entity(entity_id)
+            # Entitu poskytuje první soubor v pořadí názvů, stejně jako v build()
+            for file_path in self._entity_paths.get(entity_id, ()):
+                detail = details.get(file_path)
+                if detail is None:
+                    detail = self._read_file(file_path, load_json)
+                if isinstance(detail, dict) and detail.get("id") == entity_id:
+                    self._set_entity(entity_id, detail, file_path)
+                    break
+        return entity_ids
+
+    def _update_internal(
+        self,
+        stale: List[str],
+        fresh: List[str],
+        load_json: Callable[[str], Any],
+    ) -> Set[str]:
+        """Promítne změny internal_*.json; vrátí klíče k novému propojení."""
+        documents = [self._forget_internal_file(file_path) for file_path in stale] + [
+            self._read_internal_file(file_path, load_json) for file_path in fresh
+        ]
+
+        keys = set()
+        duns_index = self.identifier_index.get("duns_number", {})
+        for internal_data in documents:
+            if internal_data is None:
+                continue
+            for mapping, key in self._internal_keys(internal_data):
+                if mapping is self._internal_by_company:
+                    keys.add(key)
+                else:
+                    keys.update(duns_index.get(key, ()))
+        return keys
+
+    def _link_internal(self, keys: Iterable[str]) -> None:
+        """Znovu propojí interní data a identifikátory zadaných entit."""
+        for key in keys:
+            internal_data = self._resolve_internal(key)
+            if internal_data is None:
+                self.internal_records.pop(key, None)
+            else:
+                self.internal_records[key] = internal_data
+            self._index_identifiers(key)
+
+    def _update_search(
+        self,
+        stale: List[str],
+        fresh: List[str],
+        load_json: Callable[[str], Any],
+    ) -> None:
+        """Promítne změny entity_search_*.json do search_records."""
+        entity_ids = set()
+        for file_path in stale:
+            for entity_id in self._search_files.pop(file_path, ()):
+                _remove_sorted(self._search_paths, entity_id, file_path)
+                entity_ids.add(entity_id)
+        records = {}
+        for file_path in fresh:
+            for entity in self._read_search_file(file_path, load_json):
+                if entity.get("id"):
+                    records.setdefault((file_path, entity["id"]), entity)
+                    entity_ids.add(entity["id"])
+
+        for entity_id in entity_ids:
+            self.search_records.pop(entity_id, None)
+            for file_path in self._search_paths.get(entity_id, ()):
+                entity = records.get((file_path, entity_id))
+                if entity is None:
+                    entity = next(
+                        (
+                            result
+                            for result in _extract_items(
+                                self._read_file(file_path, load_json), "results"
+                            )
+                            if result.get("id") == entity_id
+                        ),
+                        None,
+                    )
+                if entity is not None:
+                    self.search_records[entity_id] = entity
+                    break
+
+    def _update_supply_chain(
+        self,
+        stale: List[str],
+        fresh: List[str],
+        load_json: Callable[[str], Any],
+    ) -> Set[str]:
+        """Promítne změny supply_chain_*.json; vrátí ID dotčených zdrojů."""
+        source_ids = set()
+        for file_path in stale:
+            for source_id in self._supply_chain_files.pop(file_path, ()):
+                _remove_sorted(self._supply_chain_paths, source_id, file_path)
+                source_ids.add(source_id)
+        items_by_file = {}
+        for file_path in fresh:
+            items = self._read_supply_chain_file(file_path, load_json)
+            items_by_file[file_path] = items
+            source_ids.update(_source_id(item) for item in items)
+
+        for source_id in source_ids:
+            # Položky zdroje ze všech jeho souborů v pořadí názvů souborů
+            items = []
+            for file_path in self._supply_chain_paths.get(source_id, ()):
+                if file_path not in items_by_file:
+                    items_by_file[file_path] = [
+                        item
+                        for item in _extract_items(
+                            self._read_file(file_path, load_json), "data"
+                        )
+                        if _source_id(item)
+                    ]
+                items.extend(
+                    item
+                    for item in items_by_file[file_path]
+                    if _source_id(item) == source_id
+                )
+            if items:
+                self.supply_chain_items[source_id] = items
+            else:
+                self.supply_chain_items.pop(source_id, None)
+        return source_ids
+
+    def _update_relationships(
+        self, file_paths: List[str], load_json: Callable[[str], Any]
+    ) -> None:
+        """Promítne změny relationships_*.json do úložiště vztahů."""
+        # Vztah sloučený z více souborů se sestaví znovu ze všech jeho souborů
+        affected = set(file_paths)
+        pending = list(affected)
+        while pending:
+            for position in self._edge_files.get(pending.pop(), ()):
+                owners = (self._edge_owners[position],) + self._edge_co_owners.get(
+                    position, ()
+                )
+                for owner in owners:
+                    if owner is not None and owner not in affected:
+                        affected.add(owner)
+                        pending.append(owner)
+
+        self.relationships = self.relationships.copy()
+        self._edge_owners = list(self._edge_owners)
+        for file_path in affected:
+            for position in self._edge_files.pop(file_path, ()):
+                if self._edge_owners[position] is not None:
+                    self.relationships.remove(position)
+                    self._edge_owners[position] = None
+                    self._edge_co_owners.pop(position, None)
+        for file_path in sorted(affected):
+            if os.path.basename(file_path) in self.signatures:
+                self._read_relationship_file(file_path, load_json)
+
+    def _update_families(self, file_paths: Iterable[str]) -> None:
+        """Obnoví mapu rodin souborů entit, jejichž soubory se změnily."""
+        detail_paths = set()
+        for file_path in file_paths:
+            name = os.path.basename(file_path)[:-5]
+            for family in FILE_FAMILIES:
+                if name.startswith(f"{family}_"):
+                    suffix = name[len(family) + 1 :]
+                    detail_paths.add(
+                        os.path.join(
+                            self.data_path, f"{ENTITY_DETAIL_PREFIX}{suffix}.json"
+                        )
+                    )
+        for detail_path in detail_paths:
+            entity_id = self._detail_files.get(detail_path)
+            if (
+                entity_id in self.entities
+                and self._entity_paths[entity_id][0] == detail_path
+            ):
+                self.families[entity_id] = self._family_map(detail_path)
+
+    def get_entity(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        """Vrátí detail entity podle ID, nebo None."""
+        return self.entities.get(entity_id)
+
+    def family_files(self, entity_id: str, family: str) -> List[str]:
+        """Vrátí soubory dané rodiny (např. "relationships") pro entitu."""
+        return self.families.get(entity_id, {}).get(family, [])
+
+    def find_ids_by_identifier(self, identifier_type: str, value: Any) -> List[str]:
+        """
+        Najde ID entit podle identifikátoru (DUNS, registrační číslo, DIČ...).
+
+        Args:
+            identifier_type: Typ identifikátoru (např. "duns_number" nebo "DUNS")
+            value: Hodnota identifikátoru v libovolném zápisu
+
+        Returns:
+            List[str]: ID nalezených entit
+        """
+        identifier_type = normalize_identifier_type(identifier_type)
+        key = normalize_identifier(identifier_type, value)
+        return list(self.identifier_index.get(identifier_type, {}).get(key, []))
+
+    @property
+    def name_index(self) -> TrigramIndex:
+        """
+        Trigramový index normalizovaných názvů entit.
+
+        Sestaví se až při prvním dotazu podle názvu, takže nezdržuje načtení
+        indexu (ani snapshotu), pokud se podle názvu nevyhledává.
+        """
+        if self._name_index is None:
+            with self._derived_lock:
+                if self._name_index is None:
+                    name_index = TrigramIndex()
+                    name_index.bulk_add(self.label_index.keys())
+                    self._name_index = name_index
+        return self._name_index
+
+    @property
+    def supply_chain_graph(self) -> SupplyChainGraph:
+        """
+        Graf dodavatelského řetězce ze všech cest v supply_chain_*.json.
+
+        Sestaví se až při prvním dotazu na vícestupňový dodavatelský řetězec.
+        """
+        if self._supply_chain_graph is None:
+            with self._derived_lock:
+                if self._supply_chain_graph is None:
+                    self._supply_chain_graph = SupplyChainGraph.from_items(
+                        item
+                        for items in self.supply_chain_items.values()
+                        for item in items
+                    )
+        return self._supply_chain_graph
+
+    @property
+    def risk_propagation(self) -> RiskPropagation:
+        """
+        Řídká reprezentace grafu dodavatelů pro propagaci rizika.
+
+        Základní riziko entity je risk_score z detailu entity, u entit bez
+        detailu se odhadne z rizikových faktorů v cestách dodavatelského řetězce.
+        """
+        if self._risk_propagation is None:
+            # Graf se sestavuje pod stejným zámkem, proto se získá předem
+            graph = self.supply_chain_graph
+            with self._derived_lock:
+                if self._risk_propagation is None:
+                    risk_scores = {}
+                    for entity_id, detail in self.entities.items():
+                        risk = detail.get("risk")
+                        score = (
+                            risk.get("risk_score") if isinstance(risk, dict) else None
+                        )
+                        if isinstance(score, (int, float)):
+                            risk_scores[entity_id] = score
+                    self._risk_propagation = RiskPropagation.from_graph(
+                        graph, risk_scores
+                    )
+        return self._risk_propagation
+
+    @property
+    def entity_graph(self) -> "EntityGraph":
+        """
+        Graf entit spojující vztahy a hrany dodavatelského řetězce.
+
+        Sestaví se až při prvním dotazu na cesty mezi entitami.
+        """
+        # graph_analysis importuje tento modul, proto se importuje až zde
+        from memory_agent.graph_analysis import EntityGraph
+
+        if self._entity_graph is None:
+            supply_chain_graph = self.supply_chain_graph
+            with self._derived_lock:
+                if self._entity_graph is None:
+                    self._entity_graph = EntityGraph.from_sources(
+                        (self.relationships, self.general_relationships),
+                        supply_chain_graph,
+                    )
+        return self._entity_graph
+
+    @property
+    def supplier_dependencies(self) -> "SupplierDependencyIndex":
+        """
+        Dominátory a artikulační body v dodavatelských řetězcích společností.
+
+        Při prvním použití se předpočítají pro všechny společnosti, ke kterým
+        existují položky dodavatelského řetězce.
+        """
+        # graph_analysis importuje tento modul, proto se importuje až zde
+        from memory_agent.graph_analysis import SupplierDependencyIndex
+
+        if self._supplier_dependencies is None:
+            supply_chain_graph = self.supply_chain_graph
+            with self._derived_lock:
+                if self._supplier_dependencies is None:
+                    self._supplier_dependencies = SupplierDependencyIndex.from_graph(
+                        supply_chain_graph, sorted(self.supply_chain_items)
+                    )
+        return self._supplier_dependencies
+
+    @property
+    def hs_code_index(self) -> HSCodeIndex:
+        """
+        Prefixový strom HS kódů produktů, které entity dodávají.
+
+        Sestaví se až při prvním dotazu podle HS kódu.
+        """
+        if self._hs_code_index is None:
+            with self._derived_lock:
+                if self._hs_code_index is None:
+                    hs_code_index = HSCodeIndex.from_sources(
+                        (
+                            item
+                            for items in self.supply_chain_items.values()
+                            for item in items
+                        ),
+                        self.internal_records,
+                    )
+                    for entity_id, detail in self.entities.items():
+                        if detail.get("label"):
+                            hs_code_index.labels[entity_id] = detail["label"]
+                    self._hs_code_index = hs_code_index
+        return self._hs_code_index
+
+    @property
+    def search_postings(self) -> CompanyPostings:
+        """
+        Posting listy nad general_search_results (entity_search.json).
+
+        Průmysl se bere z detailu entity; záznam bez detailu průmysl nemá.
+        """
+        if self._search_postings is None:
+            with self._derived_lock:
+                if self._search_postings is None:
+                    industries = []
+                    for company in self.general_search_results:
+                        detail = self.get_entity(company.get("id"))
+                        industries.append((detail or {}).get("industry"))
+                    self._search_postings = CompanyPostings.from_records(
+                        self.general_search_results, industries
+                    )
+        return self._search_postings
+
+    @property
+    def entity_postings(self) -> CompanyPostings:
+        """Posting listy nad detaily entit v pořadí entities."""
+        if self._entity_postings is None:
+            with self._derived_lock:
+                if self._entity_postings is None:
+                    self._entity_postings = CompanyPostings.from_records(
+                        self.entities.values()
+                    )
+        return self._entity_postings
+
+    @property
+    def gazetteer(self) -> CompanyGazetteer:
+        """
+        Gazetteer názvů, alternativních názvů a identifikátorů entit.
+
+        Zahrnuje detaily entit i záznamy vyhledávání (entity_search_*.json
+        a entity_search.json), jejichž meta.alternate_names slouží jako aliasy.
+        """
+        if self._gazetteer is None:
+            with self._derived_lock:
+                if self._gazetteer is None:
+                    gazetteer = CompanyGazetteer()
+                    for entity_id, detail in self.entities.items():
+                        gazetteer.add_entity(entity_id, detail)
+                    for record in (
+                        *self.search_records.values(),
+                        *self.general_search_results,
+                    ):
+                        if record.get("id"):
+                            meta = record.get("meta") or {}
+                            gazetteer.add_entity(
+                                record["id"], record, meta.get("alternate_names") or ()
+                            )
+                    self._gazetteer = gazetteer
+        return self._gazetteer
+
+    def match_names(
+        self,
+        name: str,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        limit: Optional[int] = 10,
+    ) -> List[Tuple[str, float]]:
+        """
+        Najde entity s podobným názvem seřazené podle podobnosti.
+
+        Args:
+            name: Hledaný název
+            threshold: Minimální podobnost názvů (0-1)
+            limit: Maximální počet nalezených názvů (None = všechny nad prahem)
+
+        Returns:
+            List[Tuple[str, float]]: Dvojice (ID entity, podobnost)
+        """
+        matches: List[Tuple[str, float]] = []
+        for label_key, score in self.name_index.search(
+            normalize_name(name), threshold, limit
+        ):
+            matches.extend(
+                (entity_id, score) for entity_id in self.label_index[label_key]
+            )
+        return matches
+
+    def find_ids_by_name(
+        self,
+        name: str,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        limit: Optional[int] = 10,
+    ) -> List[str]:
+        """
+        Najde ID entit, jejichž název odpovídá hledanému názvu.
+
+        Přesná shoda normalizovaného názvu má podobnost 1.0 a je vždy první.
+
+        Args:
+            name: Hledaný název
+            threshold: Minimální podobnost názvů (0-1)
+            limit: Maximální počet nalezených názvů (None = všechny nad prahem)
+
+        Returns:
+            List[str]: ID nalezených entit od nejpodobnějšího názvu
+        """
+        return [entity_id for entity_id, _ in self.match_names(name, threshold, limit)]
@@ -0,0 +1,235 @@
+"""
+Procesní cache parsovaných JSON dokumentů pro MockMCPConnector.
+
+Dokumenty jsou klíčované absolutní cestou a platnost záznamu se ověřuje
+podle (mtime, velikost) souboru. Cache je omezená počtem záznamů i odhadem
+velikosti v bajtech a vyřazuje nejdéle nepoužité záznamy (LRU).
+
+Z cache se vydávají pouze read-only pohledy (FrozenDict, FrozenList), aby
+volající nemohli sdílená data změnit na místě. Pro úpravy je potřeba si
+vytvořit kopii, např. dict(data) nebo list(data).
+"""
+
+import copy
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+# Výchozí limity procesní cache (lze přepsat proměnnými prostředí)
+DEFAULT_MAX_ENTRIES = int(os.environ.get("MOCK_DATA_CACHE_MAX_ENTRIES", "1024"))
+DEFAULT_MAX_BYTES = int(os.environ.get("MOCK_DATA_CACHE_MAX_BYTES", str(256 << 20)))
+
+
+def _read_only(*args: Any, **kwargs: Any) -> None:
+    """Zabrání změně read-only dat z cache."""
+    raise TypeError(
+        "Data z cache dokumentů jsou pouze pro čtení, pro úpravy vytvořte kopii"
+    )
+
+
+class FrozenDict(dict):
+    """Read-only slovník vydávaný z cache dokumentů."""
+
+    __slots__ = ()
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    __ior__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
+
+    def __reduce__(self):
+        """Při pickle/copy se objekt převede na běžný (měnitelný) slovník."""
+        return (dict, (dict(self),))
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[str, Any]:
+        """Hluboká kopie vrací běžný slovník, který lze měnit."""
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+
+class FrozenList(list):
+    """Read-only seznam vydávaný z cache dokumentů."""
+
+    __slots__ = ()
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    __iadd__ = _read_only
+    __imul__ = _read_only
+    append = _read_only
+    clear = _read_only
+    extend = _read_only
+    insert = _read_only
+    pop = _read_only
+    remove = _read_only
+    reverse = _read_only
+    sort = _read_only
+
+    def __reduce__(self):
+        """Při pickle/copy se objekt převede na běžný (měnitelný) seznam."""
+        return (list, (list(self),))
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> list:
+        """Hluboká kopie vrací běžný seznam, který lze měnit."""
+        return [copy.deepcopy(item, memo) for item in self]
+
+
+def freeze(value: Any) -> Any:
+    """
+    Rekurzivně převede parsovaný JSON na read-only pohled.
+
+    Args:
+        value: Parsovaná JSON hodnota
+
+    Returns:
+        Any: Hodnota s FrozenDict/FrozenList místo dict/list
+    """
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+class _CacheEntry(NamedTuple):
+    """Záznam cache: podpis souboru a parsovaný dokument."""
+
+    signature: Tuple[int, int]
+    size: int
+    document: Any
+
+
+class JSONDocumentCache:
+    """
+    LRU cache parsovaných JSON dokumentů ověřovaná podle mtime a velikosti.
+
+    Odhad velikosti záznamu vychází z velikosti souboru na disku. Dokument,
+    který sám překročí limit v bajtech, se vrátí, ale do cache se neuloží.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        """
+        Inicializuje cache.
+
+        Args:
+            max_entries: Maximální počet dokumentů v cache
+            max_bytes: Maximální odhadovaná velikost všech dokumentů v bajtech
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def load(self, file_path: str) -> Any:
+        """
+        Vrátí read-only parsovaný obsah JSON souboru, z cache pokud je platná.
+
+        Args:
+            file_path: Cesta k JSON souboru
+
+        Returns:
+            Any: Read-only parsovaný obsah souboru
+
+        Raises:
+            FileNotFoundError: Pokud soubor neexistuje
+            json.JSONDecodeError: Pokud soubor není validní JSON
+        """
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.signature == signature:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry.document
+            self.misses += 1
+
+        # Parsování probíhá mimo zámek, aby neblokovalo ostatní vlákna
+        with open(path, "r", encoding="utf-8") as file:
+            document = freeze(json.load(file))
+
+        with self._lock:
+            self._store(path, _CacheEntry(signature, stat.st_size, document))
+        return document
+
+    def _store(self, path: str, entry: _CacheEntry) -> None:
+        """Uloží záznam a vyřadí nejdéle nepoužité záznamy nad limitem."""
+        previous = self._entries.pop(path, None)
+        if previous is not None:
+            self._total_bytes -= previous.size
+
+        if entry.size > self.max_bytes:
+            return
+
+        self._entries[path] = entry
+        self._total_bytes += entry.size
+
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= evicted.size
+            self.evictions += 1
+
+    def invalidate(self, file_path: Optional[str] = None) -> None:
+        """
+        Odstraní záznam souboru z cache, případně vyprázdní celou cache.
+
+        Args:
+            file_path: Cesta k souboru; pokud není zadána, vyprázdní se vše
+        """
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+                self._total_bytes = 0
+                return
+            entry = self._entries.pop(os.path.abspath(file_path), None)
+            if entry is not None:
+                self._total_bytes -= entry.size
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Vrátí statistiky cache.
+
+        Returns:
+            Dict[str, int]: Počty zásahů, minutí, vyřazení a aktuální obsazenost
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# Procesní cache sdílená všemi instancemi MockMCPConnector
+_document_cache = JSONDocumentCache()
+
+
+def get_document_cache() -> JSONDocumentCache:
+    """
+    Vrátí procesní cache parsovaných JSON dokumentů.
+
+    Returns:
+        JSONDocumentCache: Sdílená instance cache
+    """
+    return _document_cache
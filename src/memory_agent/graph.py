@@ -11,6 +11,7 @@ from langgraph.prebuilt import create_react_agent
 from .analyzer import analyze_company
 from .api_validation import diagnose_api_key_issue, get_validated_openai_api_key
 from .configuration import Configuration
+from .connector_registry import get_connector_registry
 from .node_config import export_studio_config, validate_node_configs
 from .prompts import SYSTEM_PROMPT, PromptRegistry
 
@@ -45,6 +46,12 @@ def create_memory_agent():
             f"Warning: Node configuration validation failed: {validation_result['errors']}"
         )
 
+    # Předem sestavit index mock dat, aby první dotaz nečekal na načtení souborů
+    try:
+        get_connector_registry().warm()
+    except Exception as e:
+        print(f"Warning: Mock data warm-up failed: {str(e)}")
+
     # Nastavení modelu pomocí string syntax (preferovaný způsob podle dokumentace)
     model = "openai:gpt-4"
 
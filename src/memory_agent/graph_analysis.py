@@ -0,0 +1,625 @@
+"""
+Analýza grafu entit sestaveného ze vztahů a dodavatelského řetězce.
+
+Graf spojuje vztahy z relationships_*.json / relationships.json a hrany
+odběratel -> dodavatel z cest supply_chain_*.json. Pro dotaz "jak je X
+propojeno s Y" se graf prochází bez ohledu na směr hran: nejkratší cesta se
+hledá obousměrným BFS (z obou konců současně, takže navštívená část grafu
+roste jen s polovinou délky cesty) a k nejkratších cest Yenovým algoritmem.
+
+Nad grafem dodavatelů (odběratel -> dodavatel) se dále předpočítávají
+jediné body selhání: dominátory (dodavatel, přes kterého vedou všechny cesty
+ke skupině dalších dodavatelů) a artikulační body (dodavatel, jehož odebrání
+rozpojí podgraf dodavatelů společnosti).
+"""
+
+import heapq
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from memory_agent.data_index import EdgeStore
+from memory_agent.supply_chain_graph import SupplyChainGraph
+
+# Typ hrany pro hrany z cest dodavatelského řetězce
+SUPPLY_CHAIN_EDGE_TYPE = "supply_chain"
+
+# Výchozí maximální počet kroků cesty
+DEFAULT_MAX_HOPS = 4
+
+# Výchozí počet vrácených cest
+DEFAULT_PATH_COUNT = 3
+
+
+class EntityGraph:
+    """
+    Neorientovaný multigraf entit pro hledání cest.
+
+    Obsahuje:
+    - edges: záznamy hran (hrany dodavatelského řetězce s typem
+      SUPPLY_CHAIN_EDGE_TYPE) nebo odkazy (EdgeStore, pozice) na vztahy,
+      které se dekódují až v record()
+    - adjacency: ID entity -> ID sousední entity -> pozice hran v edges
+    """
+
+    def __init__(self):
+        """Inicializuje prázdný graf."""
+        self.edges: List[Union[Dict[str, Any], Tuple[EdgeStore, int]]] = []
+        self.edge_types: List[str] = []
+        self.adjacency: Dict[str, Dict[str, List[int]]] = {}
+
+    @classmethod
+    def from_sources(
+        cls,
+        edge_stores: Iterable[EdgeStore],
+        supply_chain_graph: Optional[SupplyChainGraph] = None,
+    ) -> "EntityGraph":
+        """
+        Sestaví graf ze vztahů a z grafu dodavatelského řetězce.
+
+        Args:
+            edge_stores: Úložiště vztahů (relationships_*.json, relationships.json)
+            supply_chain_graph: Volitelný graf dodavatelského řetězce
+
+        Returns:
+            EntityGraph: Sestavený graf
+        """
+        graph = cls()
+        for edge_store in edge_stores:
+            for position in range(len(edge_store)):
+                source_id, target_id, edge_type = edge_store.endpoints(position)
+                graph.add_edge(source_id, target_id, (edge_store, position), edge_type)
+        if supply_chain_graph is not None:
+            for edge in supply_chain_graph.edges:
+                graph.add_edge(
+                    edge["customer"],
+                    edge["supplier"],
+                    dict(edge, type=SUPPLY_CHAIN_EDGE_TYPE),
+                    SUPPLY_CHAIN_EDGE_TYPE,
+                )
+        return graph
+
+    def __len__(self) -> int:
+        """Vrátí počet entit v grafu."""
+        return len(self.adjacency)
+
+    def add_edge(
+        self,
+        source_id: Optional[str],
+        target_id: Optional[str],
+        record: Union[Dict[str, Any], Tuple[EdgeStore, int]],
+        edge_type: str,
+    ) -> None:
+        """
+        Přidá hranu mezi dvěma entitami; hrany bez obou konců a smyčky se vynechají.
+
+        Args:
+            source_id: ID zdrojové entity
+            target_id: ID cílové entity
+            record: Záznam hrany vracený ve výsledku, nebo (EdgeStore, pozice)
+            edge_type: Typ hrany pro filtrování
+        """
+        if not source_id or not target_id or source_id == target_id:
+            return
+        position = len(self.edges)
+        self.edges.append(record)
+        self.edge_types.append(edge_type)
+        self.adjacency.setdefault(source_id, {}).setdefault(target_id, []).append(
+            position
+        )
+        self.adjacency.setdefault(target_id, {}).setdefault(source_id, []).append(
+            position
+        )
+
+    def record(self, position: int) -> Dict[str, Any]:
+        """
+        Vrátí záznam hrany, vztah z EdgeStore se dekóduje až zde.
+
+        Args:
+            position: Pozice hrany v edges
+
+        Returns:
+            Dict[str, Any]: Záznam hrany
+        """
+        edge = self.edges[position]
+        if isinstance(edge, tuple):
+            edge_store, edge_position = edge
+            return edge_store.record(edge_position)
+        return edge
+
+    def _neighbors(
+        self, entity_id: str, relationship_types: Optional[Set[str]]
+    ) -> Iterable[str]:
+        """Vrátí sousedy entity spojené alespoň jednou hranou povoleného typu."""
+        neighbors = self.adjacency.get(entity_id, {})
+        if relationship_types is None:
+            return neighbors.keys()
+        return [
+            neighbor_id
+            for neighbor_id, positions in neighbors.items()
+            if any(self.edge_types[p] in relationship_types for p in positions)
+        ]
+
+    def shortest_path(
+        self,
+        source_id: str,
+        target_id: str,
+        max_hops: int = DEFAULT_MAX_HOPS,
+        relationship_types: Optional[Set[str]] = None,
+        blocked_nodes: Optional[Set[str]] = None,
+        blocked_edges: Optional[Set[Tuple[str, str]]] = None,
+    ) -> Optional[List[str]]:
+        """
+        Najde nejkratší cestu obousměrným BFS.
+
+        V každém kroku se rozšíří menší z obou front o celou vrstvu; po dokončení
+        vrstvy, ve které se fronty potkaly, se vybere nejkratší spojení.
+
+        Args:
+            source_id: ID výchozí entity
+            target_id: ID cílové entity
+            max_hops: Maximální počet kroků
+            relationship_types: Povolené typy hran (None = všechny)
+            blocked_nodes: Entity, kterými cesta nesmí vést
+            blocked_edges: Dvojice entit, mezi kterými cesta nesmí vést přímo
+
+        Returns:
+            Optional[List[str]]: ID entit na cestě, nebo None
+        """
+        if source_id == target_id:
+            return [source_id]
+        if source_id not in self.adjacency or target_id not in self.adjacency:
+            return None
+        blocked_nodes = blocked_nodes or set()
+        blocked_edges = blocked_edges or set()
+
+        # Rodič a vzdálenost pro každý směr hledání
+        forward: Dict[str, Tuple[Optional[str], int]] = {source_id: (None, 0)}
+        backward: Dict[str, Tuple[Optional[str], int]] = {target_id: (None, 0)}
+        forward_frontier = [source_id]
+        backward_frontier = [target_id]
+        forward_depth = backward_depth = 0
+
+        while (
+            forward_frontier
+            and backward_frontier
+            and forward_depth + backward_depth < max_hops
+        ):
+            expand_forward = len(forward_frontier) <= len(backward_frontier)
+            if expand_forward:
+                frontier, visited, other = forward_frontier, forward, backward
+                depth = forward_depth = forward_depth + 1
+            else:
+                frontier, visited, other = backward_frontier, backward, forward
+                depth = backward_depth = backward_depth + 1
+
+            next_frontier: List[str] = []
+            best: Optional[Tuple[int, str, str]] = None
+            for entity_id in frontier:
+                for neighbor_id in self._neighbors(entity_id, relationship_types):
+                    if neighbor_id in blocked_nodes:
+                        continue
+                    if (entity_id, neighbor_id) in blocked_edges or (
+                        neighbor_id,
+                        entity_id,
+                    ) in blocked_edges:
+                        continue
+                    if neighbor_id in other:
+                        length = depth + other[neighbor_id][1]
+                        if best is None or length < best[0]:
+                            best = (length, entity_id, neighbor_id)
+                    if neighbor_id not in visited:
+                        visited[neighbor_id] = (entity_id, depth)
+                        next_frontier.append(neighbor_id)
+
+            if best is not None and best[0] <= max_hops:
+                _, entity_id, neighbor_id = best
+                if expand_forward:
+                    return _join_path(forward, backward, entity_id, neighbor_id)
+                return _join_path(forward, backward, neighbor_id, entity_id)
+
+            if expand_forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+        return None
+
+    def k_shortest_paths(
+        self,
+        source_id: str,
+        target_id: str,
+        k: int = DEFAULT_PATH_COUNT,
+        max_hops: int = DEFAULT_MAX_HOPS,
+        relationship_types: Optional[Set[str]] = None,
+    ) -> List[List[str]]:
+        """
+        Najde až k nejkratších cest bez opakování entit (Yenův algoritmus).
+
+        Args:
+            source_id: ID výchozí entity
+            target_id: ID cílové entity
+            k: Maximální počet cest
+            max_hops: Maximální počet kroků cesty
+            relationship_types: Povolené typy hran (None = všechny)
+
+        Returns:
+            List[List[str]]: Cesty jako seznamy ID entit seřazené podle délky
+        """
+        first = self.shortest_path(source_id, target_id, max_hops, relationship_types)
+        if first is None or k < 1:
+            return []
+
+        paths = [first]
+        candidates: List[Tuple[int, List[str]]] = []
+        seen = {tuple(first)}
+        while len(paths) < k:
+            previous = paths[-1]
+            for spur_index in range(len(previous) - 1):
+                root = previous[: spur_index + 1]
+                blocked_edges = {
+                    (path[spur_index], path[spur_index + 1])
+                    for path in paths
+                    if len(path) > spur_index + 1 and path[: spur_index + 1] == root
+                }
+                spur_path = self.shortest_path(
+                    root[-1],
+                    target_id,
+                    max_hops - spur_index,
+                    relationship_types,
+                    blocked_nodes=set(root[:-1]),
+                    blocked_edges=blocked_edges,
+                )
+                if spur_path is None:
+                    continue
+                candidate = root[:-1] + spur_path
+                if tuple(candidate) not in seen:
+                    seen.add(tuple(candidate))
+                    heapq.heappush(candidates, (len(candidate), candidate))
+            if not candidates:
+                break
+            paths.append(heapq.heappop(candidates)[1])
+        return paths
+
+    def path_edges(
+        self, path: List[str], relationship_types: Optional[Set[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Vrátí kroky cesty se záznamy hran, které spojují sousední entity.
+
+        Args:
+            path: Cesta jako seznam ID entit
+            relationship_types: Povolené typy hran (None = všechny)
+
+        Returns:
+            List[Dict[str, Any]]: Kroky {"source", "target", "edges"}
+        """
+        hops = []
+        for source_id, target_id in zip(path, path[1:]):
+            positions = self.adjacency.get(source_id, {}).get(target_id, [])
+            hops.append(
+                {
+                    "source": source_id,
+                    "target": target_id,
+                    "edges": [
+                        self.record(position)
+                        for position in positions
+                        if relationship_types is None
+                        or self.edge_types[position] in relationship_types
+                    ],
+                }
+            )
+        return hops
+
+
+def _join_path(
+    forward: Dict[str, Tuple[Optional[str], int]],
+    backward: Dict[str, Tuple[Optional[str], int]],
+    forward_id: str,
+    backward_id: str,
+) -> List[str]:
+    """Spojí cestu z rodičů obou směrů hledání přes hranu forward_id - backward_id."""
+    path: List[str] = []
+    entity_id: Optional[str] = forward_id
+    while entity_id is not None:
+        path.append(entity_id)
+        entity_id = forward[entity_id][0]
+    path.reverse()
+    entity_id = backward_id
+    while entity_id is not None:
+        path.append(entity_id)
+        entity_id = backward[entity_id][0]
+    return path
+
+
+def _postorder(suppliers: Dict[str, Set[str]], root: str) -> List[str]:
+    """Vrátí entity dosažitelné z root v pořadí postorder (iterativní DFS)."""
+    order: List[str] = []
+    visited = {root}
+    stack = [(root, iter(sorted(suppliers.get(root, ()))))]
+    while stack:
+        entity_id, children = stack[-1]
+        for child_id in children:
+            if child_id not in visited:
+                visited.add(child_id)
+                stack.append((child_id, iter(sorted(suppliers.get(child_id, ())))))
+                break
+        else:
+            stack.pop()
+            order.append(entity_id)
+    return order
+
+
+def immediate_dominators(suppliers: Dict[str, Set[str]], root: str) -> Dict[str, str]:
+    """
+    Spočítá bezprostřední dominátory entit dosažitelných z root.
+
+    Entita d dominuje entitě v, pokud každá cesta z root do v vede přes d.
+    Používá iterativní algoritmus Coopera, Harveyho a Kennedyho nad pořadím
+    reverse postorder; cykly v grafu nevadí.
+
+    Args:
+        suppliers: ID odběratele -> ID jeho dodavatelů
+        root: ID výchozí společnosti
+
+    Returns:
+        Dict[str, str]: ID entity -> ID bezprostředního dominátoru (root -> root)
+        v pořadí reverse postorder, takže dominátor je vždy před entitou
+    """
+    order = _postorder(suppliers, root)
+    position = {entity_id: number for number, entity_id in enumerate(order)}
+    predecessors: Dict[str, List[str]] = {entity_id: [] for entity_id in order}
+    for customer_id in order:
+        for supplier_id in suppliers.get(customer_id, ()):
+            predecessors[supplier_id].append(customer_id)
+
+    def intersect(left: str, right: str) -> str:
+        while left != right:
+            while position[left] < position[right]:
+                left = idom[left]
+            while position[right] < position[left]:
+                right = idom[right]
+        return left
+
+    idom = {root: root}
+    reverse_order = order[-2::-1]
+    changed = True
+    while changed:
+        changed = False
+        for entity_id in reverse_order:
+            new_idom = None
+            for predecessor_id in predecessors[entity_id]:
+                if predecessor_id in idom:
+                    new_idom = (
+                        predecessor_id
+                        if new_idom is None
+                        else intersect(predecessor_id, new_idom)
+                    )
+            if idom.get(entity_id) != new_idom:
+                idom[entity_id] = new_idom
+                changed = True
+    return idom
+
+
+def articulation_points(neighbors: Dict[str, Set[str]], root: str) -> Set[str]:
+    """
+    Najde artikulační body neorientovaného grafu v komponentě entity root.
+
+    Args:
+        neighbors: ID entity -> ID sousedních entit (symetricky)
+        root: ID entity, ze které se komponenta prochází
+
+    Returns:
+        Set[str]: Entity, jejichž odebrání rozpojí komponentu
+    """
+    discovery = {root: 0}
+    low = {root: 0}
+    points: Set[str] = set()
+    root_children = 0
+    stack = [(root, None, iter(neighbors.get(root, ())))]
+    while stack:
+        entity_id, parent_id, others = stack[-1]
+        for other_id in others:
+            if other_id not in discovery:
+                discovery[other_id] = low[other_id] = len(discovery)
+                stack.append((other_id, entity_id, iter(neighbors.get(other_id, ()))))
+                if entity_id == root:
+                    root_children += 1
+                break
+            if other_id != parent_id:
+                low[entity_id] = min(low[entity_id], discovery[other_id])
+        else:
+            stack.pop()
+            if parent_id is not None:
+                low[parent_id] = min(low[parent_id], low[entity_id])
+                if parent_id != root and low[entity_id] >= discovery[parent_id]:
+                    points.add(parent_id)
+    if root_children > 1:
+        points.add(root)
+    return points
+
+
+class SupplierDependencyIndex:
+    """
+    Předpočítané jediné body selhání v dodavatelských řetězcích společností.
+
+    Pro každou sledovanou společnost (kořen) se z podgrafu jejích dodavatelů
+    spočítá strom dominátorů a artikulační body. Při změně hrany se přepočítají
+    jen kořeny, jejichž podgraf obsahuje odběratele změněné hrany; přepočet
+    proběhne při dalším dotazu nebo voláním refresh().
+    """
+
+    def __init__(
+        self,
+        suppliers: Dict[str, Iterable[str]],
+        roots: Iterable[str],
+        nodes: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        """
+        Sestaví index a předpočítá výsledky pro všechny kořeny.
+
+        Args:
+            suppliers: ID odběratele -> ID jeho dodavatelů
+            roots: ID sledovaných společností
+            nodes: Volitelné atributy entit (label) pro výsledky
+        """
+        self.suppliers: Dict[str, Set[str]] = {
+            customer_id: set(supplier_ids)
+            for customer_id, supplier_ids in suppliers.items()
+        }
+        self.nodes = nodes or {}
+        self._results: Dict[str, Dict[str, Any]] = {}
+        # Kořen -> entity jeho podgrafu a ID entity -> kořeny, které ji obsahují
+        self._reachable: Dict[str, Set[str]] = {}
+        self._members: Dict[str, Set[str]] = {}
+        self._dirty: Set[str] = set(roots)
+        self._lock = threading.Lock()
+        self.refresh()
+
+    @classmethod
+    def from_graph(
+        cls, graph: SupplyChainGraph, roots: Iterable[str]
+    ) -> "SupplierDependencyIndex":
+        """
+        Sestaví index z grafu dodavatelského řetězce.
+
+        Args:
+            graph: Graf dodavatelského řetězce
+            roots: ID sledovaných společností
+
+        Returns:
+            SupplierDependencyIndex: Index s předpočítanými výsledky
+        """
+        suppliers = {
+            customer_id: [graph.edges[position]["supplier"] for position in positions]
+            for customer_id, positions in graph.suppliers.items()
+        }
+        return cls(suppliers, roots, graph.nodes)
+
+    @property
+    def roots(self) -> List[str]:
+        """Seřazená ID sledovaných společností."""
+        return sorted(set(self._results) | self._dirty)
+
+    def add_edge(self, customer_id: str, supplier_id: str) -> None:
+        """
+        Přidá hranu odběratel -> dodavatel a označí dotčené kořeny k přepočtu.
+
+        Args:
+            customer_id: ID odběratele
+            supplier_id: ID dodavatele
+        """
+        with self._lock:
+            self.suppliers.setdefault(customer_id, set()).add(supplier_id)
+            self._dirty |= self._members.get(customer_id, set())
+
+    def remove_edge(self, customer_id: str, supplier_id: str) -> None:
+        """
+        Odebere hranu odběratel -> dodavatel a označí dotčené kořeny k přepočtu.
+
+        Args:
+            customer_id: ID odběratele
+            supplier_id: ID dodavatele
+        """
+        with self._lock:
+            self.suppliers.get(customer_id, set()).discard(supplier_id)
+            self._dirty |= self._members.get(customer_id, set())
+
+    def refresh(self) -> int:
+        """
+        Přepočítá všechny kořeny označené k přepočtu.
+
+        Returns:
+            int: Počet přepočítaných kořenů
+        """
+        with self._lock:
+            dirty = sorted(self._dirty)
+            for root in dirty:
+                self._compute(root)
+            self._dirty.clear()
+            return len(dirty)
+
+    def analysis(self, root: str) -> Dict[str, Any]:
+        """
+        Vrátí jediné body selhání v dodavatelském řetězci společnosti.
+
+        Společnost, která dosud nebyla sledována, se přidá mezi kořeny.
+
+        Args:
+            root: ID společnosti
+
+        Returns:
+            Dict[str, Any]: {"company_id", "supplier_count",
+            "single_points_of_failure", "articulation_points"}
+        """
+        with self._lock:
+            if root in self._dirty or root not in self._results:
+                self._compute(root)
+                self._dirty.discard(root)
+            return self._results[root]
+
+    def dependents(self, root: str, supplier_id: str) -> List[str]:
+        """
+        Vrátí všechny dodavatele odříznuté od společnosti spolu s dodavatelem.
+
+        Args:
+            root: ID společnosti
+            supplier_id: ID dodavatele (jediného bodu selhání)
+
+        Returns:
+            List[str]: Seřazená ID závislých dodavatelů
+        """
+        children = {
+            point["id"]: point["immediate_dependents"]
+            for point in self.analysis(root)["single_points_of_failure"]
+        }
+        dependents: List[str] = []
+        stack = list(children.get(supplier_id, ()))
+        while stack:
+            dependent_id = stack.pop()
+            dependents.append(dependent_id)
+            stack.extend(children.get(dependent_id, ()))
+        return sorted(dependents)
+
+    def _compute(self, root: str) -> None:
+        """Přepočítá dominátory a artikulační body jednoho kořene."""
+        for entity_id in self._reachable.get(root, ()):
+            self._members[entity_id].discard(root)
+
+        idom = immediate_dominators(self.suppliers, root)
+        self._reachable[root] = set(idom)
+        for entity_id in idom:
+            self._members.setdefault(entity_id, set()).add(root)
+
+        # Potomci ve stromu dominátorů jsou dodavatelé odříznutí s dominátorem;
+        # v pořadí postorder jsou zpracovaní dříve než jejich dominátor
+        children: Dict[str, List[str]] = {}
+        dependent_counts = dict.fromkeys(idom, 0)
+        for entity_id in reversed(list(idom)):
+            if entity_id != root:
+                dominator_id = idom[entity_id]
+                children.setdefault(dominator_id, []).append(entity_id)
+                dependent_counts[dominator_id] += dependent_counts[entity_id] + 1
+        single_points = [
+            {
+                "id": entity_id,
+                "label": self.nodes.get(entity_id, {}).get("label"),
+                "dependent_count": dependent_counts[entity_id],
+                "immediate_dependents": sorted(children[entity_id]),
+            }
+            for entity_id in sorted(children)
+            if entity_id != root
+        ]
+        single_points.sort(key=lambda point: -point["dependent_count"])
+
+        neighbors: Dict[str, Set[str]] = {entity_id: set() for entity_id in idom}
+        for customer_id in idom:
+            for supplier_id in self.suppliers.get(customer_id, ()):
+                neighbors[customer_id].add(supplier_id)
+                neighbors[supplier_id].add(customer_id)
+        points = articulation_points(neighbors, root) - {root}
+
+        self._results[root] = {
+            "company_id": root,
+            "supplier_count": len(idom) - 1,
+            "single_points_of_failure": single_points,
+            "articulation_points": sorted(points),
+        }
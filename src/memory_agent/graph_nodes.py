@@ -10,9 +10,10 @@ import logging
 import traceback
 
 from memory_agent import utils
-from memory_agent.analyzer import analyze_company_query
+from memory_agent.analyzer import analyze_company_query, parse_query
+from memory_agent.connector_registry import get_connector_registry
 from memory_agent.state import State, ensure_serializable
-from memory_agent.tools import AsyncMockMCPConnector
+from memory_agent.tools import CompanyQueryParams
 
 # Import prompt registry
 
@@ -37,63 +38,18 @@ def determine_analysis_type(state: State) -> State:
     Returns:
         Aktualizovaný stav s určeným typem analýzy
     """
-    # Výchozí typ analýzy
-    analysis_type = "general"
-
     # Získání dotazu
-    query = state.current_query.lower() if state.current_query else ""
-
-    # Využití funkce z analyzer.py místo duplikace kódu
-    try:
-        from memory_agent.analyzer import detect_analysis_type
+    query = state.current_query or ""
 
-        analysis_type = detect_analysis_type(query)
-        logger.info(f"Analýza typu pomocí analyze.py: {analysis_type}")
-    except Exception as e:
-        # Záložní řešení pokud import selže
-        logger.warning(f"Nelze použít analyzer.detect_analysis_type: {str(e)}")
-
-        # Rozšířená detekce klíčových slov
-        risk_keywords = [
-            "risk",
-            "rizik",
-            "rizic",
-            "compliance",
-            "sanctions",
-            "sankce",
-            "bezpečnost",
-            "security",
-            "regulace",
-            "regulation",
-            "aml",
-            "kyc",
-            "fatf",
-            "ofac",
-            "embargo",
-            "reputace",
-        ]
-
-        supplier_keywords = [
-            "supplier",
-            "dodavatel",
-            "supply chain",
-            "relationships",
-            "vztahy",
-            "dodávky",
-            "tier",
-            "odběratel",
-            "procurement",
-            "logistics",
-            "logistika",
-            "distributor",
-            "vendor",
-            "nákup",
-        ]
-
-        if any(kw in query for kw in risk_keywords):
-            analysis_type = "risk_comparison"
-        elif any(kw in query for kw in supplier_keywords):
-            analysis_type = "supplier_analysis"
+    # Rozbor dotazu z analyzer.py je sdílený přes cache s ostatními uzly
+    parsed = parse_query(query)
+    ranked = parsed.ranking
+    analysis_type = parsed.analysis_type
+    if ranked:
+        logger.info(
+            "Skóre typů analýzy: "
+            + ", ".join(f"{name}={confidence:.2f}" for name, confidence in ranked)
+        )
 
     # Ověření, že typ analýzy je jeden z podporovaných
     if analysis_type not in ["general", "risk_comparison", "supplier_analysis"]:
@@ -161,15 +117,15 @@ def prepare_company_query(state: State) -> State:
     # Získání typu analýzy z předchozího kroku
     analysis_type = getattr(state, "analysis_type", "general")
 
-    # Extrakce názvu společnosti z dotazu pomocí funkce z analyzer.py
+    # Extrakce názvu společnosti z dotazu pomocí gazetteeru (analyzer.py)
     company_name = "Unknown"
+    entity_id = None
     try:
-        # Import a použití funkce analyze_company_query
-        from memory_agent.analyzer import analyze_company_query
-
-        company, detected_analysis_type = analyze_company_query(query)
+        parsed = parse_query(query)
+        company, entity_id = parsed.company_name, parsed.entity_id
+        detected_analysis_type = parsed.analysis_type
 
-        if company and company != "Unknown Company":
+        if company:
             company_name = company
             logger.info(f"Úspěšně rozpoznána společnost: {company_name}")
 
@@ -179,68 +135,42 @@ def prepare_company_query(state: State) -> State:
                 logger.info(f"Aktualizován typ analýzy na: {analysis_type}")
     except Exception as e:
         logger.error(f"Chyba při rozpoznávání společnosti: {str(e)}")
-        # Záložní detekce pro testovací společnosti
-        if "MB TOOL" in query:
-            company_name = "MB TOOL"
-        elif "ŠKODA AUTO" in query:
-            company_name = "ŠKODA AUTO"
-        elif "ADIS" in query:
-            company_name = "ADIS TACHOV"
-        elif "Flídr" in query or "FLIDR" in query:
-            company_name = "Flídr plast"
-        elif "BOS" in query:
-            company_name = "BOS AUTOMOTIVE"
-
-    # Vytvoření MCP konektoru a načtení dat společnosti
-    try:
-        from memory_agent.tools import MockMCPConnector
 
-        mcp_connector = MockMCPConnector()
-
-        # Seznam variant názvů pro vyhledávání (normalizované názvy)
-        company_variants = [
-            company_name,
-            company_name.lower(),
-            company_name.replace(" ", "_").lower(),
-        ]
-
-        # Nejprve zkusíme přímé vyhledání podle názvu
+    # Načtení dat společnosti ze sdíleného MCP konektoru
+    try:
+        mcp_connector = get_connector_registry().get()
         company_data = None
-        found = False
 
-        for variant in company_variants:
-            if found:
-                break
-
-            logger.info(f"Pokus o načtení dat pro variantu: {variant}")
+        # Zmínka nalezená gazetteerem nese rovnou ID entity
+        if entity_id:
+            try:
+                company_data = mcp_connector.get_company_by_id(entity_id)
+                logger.info(f"✅ Načtena data pro entitu: {entity_id}")
+            except Exception as e:
+                logger.warning(f"Nelze načíst data pomocí get_company_by_id: {str(e)}")
 
-            # 1. Pokus: get_company_by_name
+        # Jinak podobnost názvu a nakonec vyhledávání
+        if not company_data:
             try:
-                company_data = mcp_connector.get_company_by_name(variant)
+                company_data = mcp_connector.get_company_by_name(company_name)
                 logger.info(
-                    f"✅ Načtena data pomocí get_company_by_name pro: {variant}"
+                    f"✅ Načtena data pomocí get_company_by_name pro: {company_name}"
                 )
-                found = True
-                break
             except Exception as e:
                 logger.warning(
                     f"Nelze načíst data pomocí get_company_by_name: {str(e)}"
                 )
 
-            # 2. Pokus: search_companies
+        if not company_data:
             try:
-                from memory_agent.tools import CompanyQueryParams
-
-                search_results = mcp_connector.search_companies(
-                    CompanyQueryParams(name=variant)
+                search_page = mcp_connector.search_companies(
+                    CompanyQueryParams(name=company_name), limit=1
                 )
-                if search_results and len(search_results) > 0:
-                    company_data = search_results[0]
+                if search_page.data:
+                    company_data = search_page.data[0]
                     logger.info(
-                        f"✅ Načtena data pomocí search_companies pro: {variant}"
+                        f"✅ Načtena data pomocí search_companies pro: {company_name}"
                     )
-                    found = True
-                    break
             except Exception as e:
                 logger.warning(f"Nelze načíst data pomocí search_companies: {str(e)}")
 
@@ -265,7 +195,9 @@ def prepare_company_query(state: State) -> State:
             }
 
         # Zajištění konzistence dat - vždy musí existovat basic_info s name a id
+        # (kopie, aby se neměnila data sdílená s indexem konektoru)
         if "basic_info" not in company_data:
+            company_data = dict(company_data)
             company_data["basic_info"] = {
                 "name": company_data.get("label", company_name),
                 "id": company_data.get("id", company_name.lower().replace(" ", "_")),
@@ -436,6 +368,8 @@ def analyze_company_data(state: State) -> State:
         # Příprava proměnných pro analýzu rizik
         risk_factors = []
         risk_score = None
+        inherited_risk = risk_factors_data.get("inherited_risk") or {}
+        supplier_dependencies = risk_factors_data.get("supplier_dependencies") or {}
 
         # Pokud máme k dispozici risk_factors_data
         if risk_factors_data:
@@ -500,12 +434,36 @@ def analyze_company_data(state: State) -> State:
         else:
             key_findings.append("Nebyly identifikovány žádné rizikové faktory")
 
+        # Přidání zjištění o riziku zděděném od dodavatelů
+        if inherited_risk.get("inherited_risk"):
+            key_findings.append(
+                f"Riziko zděděné od dodavatelů: {inherited_risk['inherited_risk']:.2f}"
+            )
+            top_path = (inherited_risk.get("contributing_paths") or [None])[0]
+            if top_path:
+                key_findings.append(
+                    f"Největší příspěvek z Tier {top_path['tier']}: "
+                    f"{' -> '.join(top_path['path'])}"
+                )
+
+        # Přidání zjištění o jediných bodech selhání v dodavatelském řetězci
+        single_points = supplier_dependencies.get("single_points_of_failure") or []
+        if single_points:
+            single_points_str = ", ".join(
+                f"{point.get('label') or point['id']} "
+                f"({point['dependent_count']} závislých dodavatelů)"
+                for point in single_points[:3]
+            )
+            key_findings.append(f"Jediné body selhání: {single_points_str}")
+
         # Sestavení analýzy pro risk_comparison typ
         analysis_result.update(
             {
                 "summary": f"Analýza rizik pro společnost {company_name}",
                 "risk_score": risk_score,
                 "risk_factors": risk_factors,
+                "inherited_risk": inherited_risk,
+                "supplier_dependencies": supplier_dependencies,
                 "key_findings": key_findings,
                 "data_quality": "high" if risk_factors else "low",
             }
@@ -545,9 +503,37 @@ def analyze_company_data(state: State) -> State:
                                 }
                             )
 
-        # Extrakce dodavatelů z dat dodavatelského řetězce
+        # Extrakce dodavatelů z vícestupňového grafu dodavatelského řetězce
+        supply_chain_graph = getattr(state, "supply_chain_graph", {}).get(company_id)
         supply_chain_suppliers = []
-        if supply_chain_data:
+        supply_chain_tiers = []
+        if supply_chain_graph and supply_chain_graph.get("tiers"):
+            for tier in supply_chain_graph["tiers"]:
+                tier_label = f"Tier {tier.get('tier')}"
+                tier_suppliers = tier.get("suppliers", [])
+                supply_chain_tiers.append(
+                    {
+                        "tier": tier_label,
+                        "count": len(tier_suppliers),
+                        "suppliers": [
+                            s.get("label", s.get("id")) for s in tier_suppliers
+                        ],
+                    }
+                )
+                for supplier in tier_suppliers:
+                    supply_chain_suppliers.append(
+                        {
+                            "name": supplier.get("label", ""),
+                            "id": supplier.get("id", ""),
+                            "tier": tier_label,
+                            "countries": supplier.get("countries", []),
+                            "customers": supplier.get("customers", []),
+                            "risk_factors": supplier.get("risk", []),
+                        }
+                    )
+
+        # Záložní extrakce dodavatelů z položek dodavatelského řetězce
+        elif supply_chain_data:
             for item in supply_chain_data:
                 if isinstance(item, dict):
                     target = item.get("target", {})
@@ -572,12 +558,19 @@ def analyze_company_data(state: State) -> State:
         all_suppliers = suppliers.copy()
         for sc_supplier in supply_chain_suppliers:
             # Kontrola, zda tento dodavatel už není v seznamu
-            if not any(
-                s.get("id") == sc_supplier.get("id")
-                for s in all_suppliers
-                if s.get("id")
-            ):
+            existing = next(
+                (
+                    s
+                    for s in all_suppliers
+                    if s.get("id") and s.get("id") == sc_supplier.get("id")
+                ),
+                None,
+            )
+            if existing is None:
                 all_suppliers.append(sc_supplier)
+            elif existing.get("tier") == "Unknown":
+                # Tier z grafu dodavatelského řetězce je přesnější než metadata vztahu
+                existing["tier"] = sc_supplier.get("tier", "Unknown")
 
         # Sestavení klíčových zjištění
         key_findings = []
@@ -596,6 +589,12 @@ def analyze_company_data(state: State) -> State:
             ]
             if tier1:
                 key_findings.append(f"Počet přímých dodavatelů (Tier 1): {len(tier1)}")
+
+            # Struktura hlubších tierů z grafu dodavatelského řetězce
+            for tier in supply_chain_tiers[1:]:
+                key_findings.append(
+                    f"Počet dodavatelů v {tier['tier']}: {tier['count']}"
+                )
         else:
             key_findings.append(
                 f"Nebyli identifikováni žádní dodavatelé společnosti {company_name}"
@@ -613,6 +612,7 @@ def analyze_company_data(state: State) -> State:
             {
                 "summary": f"Analýza dodavatelského řetězce pro společnost {company_name}",
                 "suppliers": all_suppliers,
+                "supply_chain_tiers": supply_chain_tiers,
                 "key_findings": key_findings,
                 "data_quality": "high" if all_suppliers else "low",
             }
@@ -709,11 +709,8 @@ def retrieve_additional_company_data(state: State) -> State:
             f"Získávám data pro společnost: {company_name} (ID: {company_id}), typ analýzy: {analysis_type}"
         )
 
-        # Vytvoření nové instance MockMCPConnector
-        from memory_agent.tools import MockMCPConnector
-
-        mcp_connector = MockMCPConnector()
-        logger.info("Vytvořena instance MockMCPConnector")
+        # Sdílená instance MockMCPConnector z registru
+        mcp_connector = get_connector_registry().get()
 
         # Inicializace datových struktur
         financial_data = {}
@@ -721,6 +718,7 @@ def retrieve_additional_company_data(state: State) -> State:
         risk_factors_data = {}
         relationships_data = {}
         supply_chain_data = {}
+        supply_chain_graph = {}
 
         # Logování pro sledování toku dat
         logger.info(f"Načítám data pro typ analýzy: {analysis_type}")
@@ -745,6 +743,24 @@ def retrieve_additional_company_data(state: State) -> State:
                 risk_factors_data = mcp_connector.get_risk_factors_data(company_id)
                 logger.info("✅ Načtena riziková data pro risk_comparison analýzu")
 
+                # Riziko zděděné od dodavatelů napříč tiery
+                try:
+                    exposure = mcp_connector.get_risk_exposure([company_id])
+                    if company_id in exposure:
+                        risk_factors_data["inherited_risk"] = exposure[company_id]
+                except Exception as e:
+                    logger.warning(f"⚠️ Nelze spočítat zděděné riziko: {str(e)}")
+
+                # Jediné body selhání v dodavatelském řetězci
+                try:
+                    risk_factors_data["supplier_dependencies"] = (
+                        mcp_connector.get_supplier_dependencies(company_id)
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"⚠️ Nelze načíst závislosti na dodavatelích: {str(e)}"
+                    )
+
                 # Záložní plán pro search_info, pokud ho potřebujeme pro kontext
                 try:
                     search_info = mcp_connector.get_company_search_data(company_id)
@@ -782,6 +798,15 @@ def retrieve_additional_company_data(state: State) -> State:
                 logger.warning(f"⚠️ Nelze načíst data dodavatelského řetězce: {str(e)}")
                 supply_chain_data = {company_id: []}
 
+            # Vícestupňový dodavatelský řetězec (Tier 1 -> Tier 2 -> Tier 3)
+            try:
+                supply_chain_graph = {
+                    company_id: mcp_connector.get_supply_chain_graph(company_id)
+                }
+                logger.info("✅ Rozbalen vícestupňový dodavatelský řetězec")
+            except Exception as e:
+                logger.warning(f"⚠️ Nelze rozbalit dodavatelský řetězec: {str(e)}")
+
             # Záložní plán pro search_info, pokud ho potřebujeme pro kontext
             try:
                 search_info = mcp_connector.get_company_search_data(company_id)
@@ -818,6 +843,8 @@ def retrieve_additional_company_data(state: State) -> State:
         elif analysis_type == "supplier_analysis":
             result["relationships_data"] = relationships_data
             result["supply_chain_data"] = supply_chain_data
+            if supply_chain_graph:
+                result["supply_chain_graph"] = supply_chain_graph
 
         logger.info(f"✅ Úspěšně načtena data pro analýzu typu {analysis_type}")
         return ensure_serializable(result)
@@ -839,18 +866,15 @@ async def analyze_node(state: State) -> State:
     # Použití nové analyze_company_async funkce z analyzer.py
     from .analyzer import analyze_company_async
 
+    # Typovaný výsledek se čte přímo, bez kódování do JSON a zpět
     result = await analyze_company_async(state.input)
-    # Parsování JSON výsledku
-    import json
-
-    parsed_result = json.loads(result)
-    state.company_name = parsed_result.get("query", "")
-    state.analysis_type = parsed_result.get("query_type", "company")
+    state.company_name = result.query
+    state.analysis_type = result.query_type
     return state
 
 
 async def load_data_node(state: State) -> State:
-    connector = AsyncMockMCPConnector()
+    connector = get_connector_registry().get_async()
     state.company_data = await connector.read_resource(state.company_name)
     return state
 
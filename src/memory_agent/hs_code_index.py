@@ -0,0 +1,292 @@
+"""
+Prefixový strom HS kódů nad produkty dodavatelského řetězce.
+
+HS kód je hierarchický: první dvě číslice jsou kapitola, čtyři číslice
+položka a šest číslic podpoložka ("8708.29" -> kapitola 87, položka 8708,
+podpoložka 870829). Strom indexuje číslice kódu, takže dotaz na libovolnou
+úroveň vrátí entity, které produkty pod daným prefixem dodávají
+(path[].products v supply_chain_*.json) nebo jsou k nim přiřazené
+(hs_code_matches v internal_*.json), včetně období a zemí dodávek.
+"""
+
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Zdroje záznamů v indexu
+SOURCE_SUPPLY_CHAIN = "supply_chain"
+SOURCE_INTERNAL_MATCH = "internal_match"
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+def normalize_hs_code(code: Any) -> str:
+    """
+    Normalizuje HS kód na řetězec číslic ("8708.29" -> "870829").
+
+    Args:
+        code: HS kód v libovolném zápisu
+
+    Returns:
+        str: Číslice HS kódu (prázdný řetězec pro neplatný kód)
+    """
+    if code is None:
+        return ""
+    return _NON_DIGITS.sub("", str(code))
+
+
+def _product_code(product: Dict[str, Any]) -> Tuple[Any, Optional[str]]:
+    """Vrátí HS kód a popis produktu ve formátu supply_chain i internal."""
+    hs_code = product.get("hs_code", product.get("hsCode"))
+    if isinstance(hs_code, dict):
+        return hs_code.get("code"), hs_code.get("description")
+    return hs_code, product.get("description")
+
+
+class _TrieNode:
+    """Uzel prefixového stromu: potomci podle číslice a pozice záznamů."""
+
+    __slots__ = ("children", "entries")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.entries: List[int] = []
+
+
+class HSCodeIndex:
+    """
+    Prefixový strom HS kódů mapující produkty na entity.
+
+    Záznam je jedinečný pro (entita, HS kód, zdroj); opakované dodávky téhož
+    produktu rozšíří období a seznamy zemí existujícího záznamu.
+    """
+
+    def __init__(self):
+        """Inicializuje prázdný index."""
+        self.entries: List[Dict[str, Any]] = []
+        self.labels: Dict[str, str] = {}
+        self._root = _TrieNode()
+        self._positions: Dict[Tuple[str, str, str], int] = {}
+        self._codes_by_entity: Dict[str, Set[str]] = {}
+
+    @classmethod
+    def from_sources(
+        cls,
+        supply_chain_items: Iterable[Dict[str, Any]],
+        internal_records: Dict[str, Dict[str, Any]],
+    ) -> "HSCodeIndex":
+        """
+        Sestaví index z položek dodavatelského řetězce a interních dat.
+
+        Args:
+            supply_chain_items: Položky supply_chain_*.json s polem "path"
+            internal_records: ID entity -> interní data s hs_code_matches
+
+        Returns:
+            HSCodeIndex: Sestavený index
+        """
+        index = cls()
+        for item in supply_chain_items:
+            customer_id = None
+            for step in item.get("path") or []:
+                entity = step.get("entity") if isinstance(step, dict) else None
+                if not isinstance(entity, dict) or not entity.get("id"):
+                    customer_id = None
+                    continue
+                entity_id = entity["id"]
+                if entity.get("label"):
+                    index.labels.setdefault(entity_id, entity["label"])
+                for product in step.get("products") or []:
+                    if isinstance(product, dict):
+                        index.add(entity_id, product, SOURCE_SUPPLY_CHAIN, customer_id)
+                customer_id = entity_id
+
+        for entity_id, internal_data in internal_records.items():
+            for match in internal_data.get("hs_code_matches") or []:
+                if isinstance(match, dict):
+                    index.add(entity_id, match, SOURCE_INTERNAL_MATCH)
+        return index
+
+    def add(
+        self,
+        entity_id: str,
+        product: Dict[str, Any],
+        source: str,
+        customer_id: Optional[str] = None,
+    ) -> None:
+        """
+        Přidá produkt entity do indexu.
+
+        Args:
+            entity_id: ID entity, která produkt dodává nebo je k němu přiřazena
+            product: Produkt ({"hs_code": {...}, "min_date", ...}) nebo záznam
+                     hs_code_matches ({"hsCode", "match_confidence", ...})
+            source: SOURCE_SUPPLY_CHAIN nebo SOURCE_INTERNAL_MATCH
+            customer_id: ID odběratele, kterému entita produkt dodává
+        """
+        raw_code, description = _product_code(product)
+        code = normalize_hs_code(raw_code)
+        if not code:
+            return
+
+        key = (entity_id, code, source)
+        position = self._positions.get(key)
+        if position is None:
+            position = len(self.entries)
+            self._positions[key] = position
+            self.entries.append(
+                {
+                    "entity_id": entity_id,
+                    "hs_code": raw_code,
+                    "description": description,
+                    "source": source,
+                    "min_date": None,
+                    "max_date": None,
+                    "departure_countries": [],
+                    "arrival_countries": [],
+                    "customers": [],
+                    "match_confidence": None,
+                }
+            )
+            node = self._root
+            for digit in code:
+                node = node.children.setdefault(digit, _TrieNode())
+            node.entries.append(position)
+            self._codes_by_entity.setdefault(entity_id, set()).add(code)
+
+        entry = self.entries[position]
+        min_date, max_date = product.get("min_date"), product.get("max_date")
+        if min_date and (entry["min_date"] is None or min_date < entry["min_date"]):
+            entry["min_date"] = min_date
+        if max_date and (entry["max_date"] is None or max_date > entry["max_date"]):
+            entry["max_date"] = max_date
+        for field_name in ("departure_countries", "arrival_countries"):
+            for country in product.get(field_name) or []:
+                if country not in entry[field_name]:
+                    entry[field_name].append(country)
+        if customer_id and customer_id not in entry["customers"]:
+            entry["customers"].append(customer_id)
+        confidence = product.get("match_confidence")
+        if confidence is not None and (
+            entry["match_confidence"] is None or confidence > entry["match_confidence"]
+        ):
+            entry["match_confidence"] = confidence
+
+    def _subtree(self, prefix: str) -> Iterator[int]:
+        """Vrátí pozice všech záznamů pod normalizovaným prefixem."""
+        node = self._root
+        for digit in prefix:
+            node = node.children.get(digit)
+            if node is None:
+                return
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            yield from node.entries
+            stack.extend(node.children.values())
+
+    def lookup(
+        self, hs_prefix: Any, sources: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Vrátí záznamy produktů pod HS prefixem (kapitola, položka, podpoložka).
+
+        Args:
+            hs_prefix: Prefix HS kódu (např. "87", "8708" nebo "8708.29")
+            sources: Volitelný filtr zdrojů záznamů
+
+        Returns:
+            List[Dict[str, Any]]: Záznamy seřazené podle pořadí přidání
+
+        Raises:
+            ValueError: Pokud prefix neobsahuje žádnou číslici
+        """
+        prefix = normalize_hs_code(hs_prefix)
+        if not prefix:
+            raise ValueError(f"Neplatný prefix HS kódu: '{hs_prefix}'")
+        allowed = set(sources) if sources is not None else None
+        return [
+            self.entries[position]
+            for position in sorted(self._subtree(prefix))
+            if allowed is None or self.entries[position]["source"] in allowed
+        ]
+
+    def codes_for(self, entity_id: str) -> List[str]:
+        """
+        Vrátí normalizované HS kódy produktů entity.
+
+        Args:
+            entity_id: ID entity
+
+        Returns:
+            List[str]: Seřazené HS kódy
+        """
+        return sorted(self._codes_by_entity.get(entity_id, ()))
+
+    def alternative_suppliers(
+        self,
+        entity_id: str,
+        hs_prefix: Any = None,
+        limit: Optional[int] = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        Najde entity, které dodávají stejné produkty jako zadaná entita.
+
+        Bez prefixu se hledají náhrady za všechny HS kódy entity; s prefixem
+        jen za produkty pod ním. Kandidáti jsou seřazeni podle počtu pokrytých
+        kódů, dodávek ze supply_chain (skutečné dodávky mají přednost před
+        interní shodou) a data poslední dodávky.
+
+        Args:
+            entity_id: ID nahrazované entity
+            hs_prefix: Volitelný prefix HS kódu
+            limit: Maximální počet kandidátů (None = bez omezení)
+
+        Returns:
+            List[Dict[str, Any]]: Kandidáti {"id", "label", "matched_codes",
+            "products"}
+
+        Raises:
+            ValueError: Pokud prefix neobsahuje žádnou číslici
+        """
+        if hs_prefix is not None:
+            prefixes = [normalize_hs_code(hs_prefix)]
+            if not prefixes[0]:
+                raise ValueError(f"Neplatný prefix HS kódu: '{hs_prefix}'")
+        else:
+            prefixes = self.codes_for(entity_id)
+
+        candidates: Dict[str, Dict[str, Any]] = {}
+        seen: Set[int] = set()
+        for prefix in prefixes:
+            for position in self._subtree(prefix):
+                entry = self.entries[position]
+                if entry["entity_id"] == entity_id or position in seen:
+                    continue
+                seen.add(position)
+                candidate = candidates.setdefault(
+                    entry["entity_id"],
+                    {
+                        "id": entry["entity_id"],
+                        "label": self.labels.get(entry["entity_id"]),
+                        "matched_codes": set(),
+                        "products": [],
+                    },
+                )
+                candidate["matched_codes"].add(normalize_hs_code(entry["hs_code"]))
+                candidate["products"].append(entry)
+
+        def rank(candidate: Dict[str, Any]) -> Tuple[int, int, str]:
+            shipped = [
+                product
+                for product in candidate["products"]
+                if product["source"] == SOURCE_SUPPLY_CHAIN
+            ]
+            last_date = max((p["max_date"] or "" for p in shipped), default="")
+            return len(candidate["matched_codes"]), len(shipped), last_date
+
+        ranked = sorted(candidates.values(), key=rank, reverse=True)
+        if limit is not None:
+            ranked = ranked[:limit]
+        for candidate in ranked:
+            candidate["matched_codes"] = sorted(candidate["matched_codes"])
+        return ranked
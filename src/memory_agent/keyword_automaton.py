@@ -0,0 +1,218 @@
+"""
+Aho–Corasickův automat nad váženými klíčovými slovy.
+
+Klíčová slova se zkompilují do jednoho stromu prefixů s odkazy selhání
+(failure links), takže text se projde jednou znak po znaku a najdou se
+všechny výskyty všech klíčových slov, včetně překrývajících se. Cena
+průchodu je O(délka textu + počet výskytů) bez ohledu na počet klíčových
+slov.
+
+Každé klíčové slovo patří ke štítku (např. typu analýzy) a má váhu; skóre
+štítku je součet vah jeho různých nalezených klíčových slov.
+"""
+
+import string
+import unicodedata
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Kořen automatu
+_ROOT = 0
+
+# ASCII znaky kromě písmen a číslic se při normalizaci nahradí mezerou
+_SEPARATORS = str.maketrans(
+    {
+        char: " "
+        for char in map(chr, range(128))
+        if char not in string.ascii_letters + string.digits
+    }
+)
+
+
+def fold_text(text: str) -> str:
+    """
+    Normalizuje text pro porovnání klíčových slov.
+
+    Odstraní diakritiku (rozklad NFKD), převede text na malá písmena
+    a oddělovače na jednu mezeru ("Dodavatelský-řetězec" -> "dodavatelsky
+    retezec"). Znaky bez ASCII rozkladu se vynechají. Na rozdíl od
+    data_index.normalize_name běží celá normalizace v C.
+
+    Args:
+        text: Text k normalizaci
+
+    Returns:
+        str: Normalizovaný text
+    """
+    folded = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return " ".join(folded.lower().translate(_SEPARATORS).split())
+
+
+class KeywordAutomaton:
+    """
+    Automat pro hledání vážených klíčových slov se štítky v textu.
+
+    Klíčová slova i text se před porovnáním normalizují stejnou funkcí
+    (výchozí fold_text odstraní diakritiku), klíčové slovo se hledá jako
+    podřetězec.
+    Pořadí štítků podle prvního přidání rozhoduje o pořadí při shodném skóre.
+    """
+
+    def __init__(
+        self,
+        keywords: Iterable[Tuple[str, str, float]] = (),
+        normalize: Callable[[str], str] = fold_text,
+    ):
+        """
+        Inicializuje automat.
+
+        Args:
+            keywords: Trojice (klíčové slovo, štítek, váha)
+            normalize: Normalizace klíčových slov i prohledávaného textu
+        """
+        self.normalize = normalize
+        self.labels: List[str] = []
+        self._patterns: List[Tuple[str, str, float]] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [_ROOT]
+        self._outputs: List[Tuple[int, ...]] = [()]
+        self._compiled = True
+        for keyword, label, weight in keywords:
+            self.add(keyword, label, weight)
+
+    def __len__(self) -> int:
+        """Vrátí počet klíčových slov."""
+        return len(self._patterns)
+
+    def add(self, keyword: str, label: str, weight: float = 1.0) -> None:
+        """
+        Přidá klíčové slovo; automat se znovu zkompiluje při dalším hledání.
+
+        Args:
+            keyword: Klíčové slovo nebo fráze
+            label: Štítek, ke kterému klíčové slovo patří
+            weight: Váha klíčového slova ve skóre štítku
+
+        Raises:
+            ValueError: Pokud je klíčové slovo po normalizaci prázdné
+        """
+        normalized = self.normalize(keyword)
+        if not normalized:
+            raise ValueError(f"Prázdné klíčové slovo: '{keyword}'")
+        if label not in self.labels:
+            self.labels.append(label)
+
+        self._patterns.append((normalized, label, weight))
+        node = _ROOT
+        for char in normalized:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+            node = next_node
+        self._compiled = False
+
+    def compile(self) -> None:
+        """
+        Spočítá odkazy selhání a sloučí výstupy přes ně (průchod do šířky).
+
+        Volá se automaticky při prvním hledání po přidání klíčových slov;
+        nové tabulky se nastaví najednou, takže souběžné hledání vidí vždy
+        úplný automat.
+        """
+        goto = self._goto
+        fail = [_ROOT] * len(goto)
+        outputs: List[Tuple[int, ...]] = [()] * len(goto)
+        for pattern, (keyword, _, _) in enumerate(self._patterns):
+            node = _ROOT
+            for char in keyword:
+                node = goto[node][char]
+            outputs[node] += (pattern,)
+
+        # Odkaz selhání vede vždy do mělčího uzlu, jehož výstupy jsou při
+        # průchodu do šířky už úplné
+        queue = deque(goto[_ROOT].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in goto[node].items():
+                link = fail[node]
+                while link != _ROOT and char not in goto[link]:
+                    link = fail[link]
+                fail[child] = goto[link].get(char, _ROOT)
+                outputs[child] += outputs[fail[child]]
+                queue.append(child)
+        self._fail, self._outputs = fail, outputs
+        self._compiled = True
+
+    def _scan(self, normalized: str) -> Iterator[Tuple[int, Tuple[int, ...]]]:
+        """Projde normalizovaný text a vrátí pozice s čísly nalezených vzorů."""
+        if not self._compiled:
+            self.compile()
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        node = _ROOT
+        for position, char in enumerate(normalized):
+            while node != _ROOT and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, _ROOT)
+            if outputs[node]:
+                yield position, outputs[node]
+
+    def matches(self, text: str) -> Iterator[Tuple[int, str, str, float]]:
+        """
+        Najde všechny výskyty klíčových slov v textu jedním průchodem.
+
+        Args:
+            text: Prohledávaný text (normalizuje se)
+
+        Yields:
+            Tuple[int, str, str, float]: Koncová pozice výskytu v normalizovaném
+            textu, klíčové slovo, štítek a váha
+        """
+        for position, patterns in self._scan(self.normalize(text)):
+            for pattern in patterns:
+                yield (position, *self._patterns[pattern])
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """
+        Sečte váhy různých nalezených klíčových slov po štítcích.
+
+        Args:
+            text: Prohledávaný text
+
+        Returns:
+            Dict[str, float]: Štítek -> skóre (jen štítky s nějakým výskytem)
+        """
+        found = set()
+        for _, patterns in self._scan(self.normalize(text)):
+            found.update(patterns)
+        # Stejné klíčové slovo se štítkem se započítá jednou
+        weights: Dict[Tuple[str, str], float] = {}
+        for pattern in sorted(found):
+            keyword, label, weight = self._patterns[pattern]
+            weights[(keyword, label)] = weight
+        scores: Dict[str, float] = {}
+        for (_, label), weight in weights.items():
+            scores[label] = scores.get(label, 0.0) + weight
+        return scores
+
+    def rank(self, text: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Seřadí nalezené štítky podle skóre s podílem na celkovém skóre.
+
+        Args:
+            text: Prohledávaný text
+            limit: Maximální počet štítků (None = všechny nalezené)
+
+        Returns:
+            List[Tuple[str, float]]: Dvojice (štítek, jistota 0-1) od nejvyšší
+            jistoty; při shodě rozhoduje pořadí štítků
+        """
+        scores = self.scores(text)
+        total = sum(scores.values())
+        ranked = sorted(
+            scores.items(), key=lambda item: (-item[1], self.labels.index(item[0]))
+        )
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(label, score / total) for label, score in ranked]
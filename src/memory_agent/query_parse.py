@@ -0,0 +1,169 @@
+"""
+Výsledek rozboru dotazu a procesní LRU cache těchto výsledků.
+
+Jeden běh grafu rozebírá stejný dotaz několikrát (route_query,
+determine_analysis_type, prepare_company_query i nástroj ReAct agenta).
+Rozbor (zmínky společností z gazetteeru a skóre typů analýzy) se proto
+uloží jako neměnný QueryParse pod normalizovaným textem dotazu a identitou
+indexu dat; opakovaný dotaz se už nerozebírá.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+# Výchozí počet rozborů v cache (lze přepsat proměnnou prostředí)
+DEFAULT_MAX_ENTRIES = int(os.environ.get("QUERY_PARSE_CACHE_MAX_ENTRIES", "1024"))
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalizuje dotaz pro klíč cache.
+
+    Sloučí bílé znaky; velikost písmen se zachová, protože bez zmínky
+    z gazetteeru se název společnosti bere ze zápisu v dotazu.
+
+    Args:
+        query: Dotaz uživatele
+
+    Returns:
+        str: Normalizovaný dotaz
+    """
+    return " ".join(query.split())
+
+
+@dataclass(frozen=True)
+class QueryParse:
+    """
+    Neměnný výsledek rozboru dotazu.
+
+    Attributes:
+        query: Normalizovaný dotaz
+        company_name: Název nalezené entity bez právní formy, jinak název
+                      ze vzoru dotazu ("" pokud chybí)
+        entity_id: ID entity první zmínky z gazetteeru, nebo None
+        mentions: Zmínky společností (read-only záznamy find_company_mentions)
+        analysis_type: Nejlépe hodnocený typ analýzy, jinak "general"
+        confidence: Podíl skóre vybraného typu (0.0 bez klíčových slov)
+        ranking: Dvojice (typ analýzy, jistota) od nejvyšší jistoty
+    """
+
+    query: str
+    company_name: str
+    entity_id: Optional[str]
+    mentions: Tuple[Mapping[str, Any], ...]
+    analysis_type: str
+    confidence: float
+    ranking: Tuple[Tuple[str, float], ...]
+
+
+class QueryParseCache:
+    """
+    Thread-safe LRU cache rozborů dotazů s počítadly zásahů.
+
+    Rozbor při minutí probíhá mimo zámek; pokud stejný dotaz souběžně
+    rozebere více vláken, uloží se poslední výsledek (všechny jsou shodné).
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Inicializuje cache.
+
+        Args:
+            max_entries: Maximální počet rozborů v cache
+
+        Raises:
+            ValueError: Pokud max_entries není kladné
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries musí být kladné")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, QueryParse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[QueryParse]:
+        """
+        Vrátí rozbor z cache a započítá zásah nebo minutí.
+
+        Args:
+            key: Klíč rozboru (např. identita indexu a normalizovaný dotaz)
+
+        Returns:
+            Optional[QueryParse]: Uložený rozbor, nebo None
+        """
+        with self._lock:
+            parsed = self._entries.get(key)
+            if parsed is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return parsed
+
+    def put(self, key: Hashable, parsed: QueryParse) -> QueryParse:
+        """
+        Uloží rozbor a vyřadí nejdéle nepoužité rozbory nad limitem.
+
+        Args:
+            key: Klíč rozboru
+            parsed: Rozbor dotazu
+
+        Returns:
+            QueryParse: Uložený rozbor
+        """
+        with self._lock:
+            self._entries[key] = parsed
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return parsed
+
+    def get_or_parse(
+        self, key: Hashable, parse: Callable[[], QueryParse]
+    ) -> QueryParse:
+        """
+        Vrátí rozbor z cache, případně jej vytvoří a uloží.
+
+        Pokud parse vyvolá výjimku, propaguje se a nic se neuloží.
+
+        Args:
+            key: Klíč rozboru
+            parse: Funkce, která dotaz rozebere při minutí
+
+        Returns:
+            QueryParse: Rozbor dotazu
+        """
+        parsed = self.get(key)
+        if parsed is None:
+            parsed = self.put(key, parse())
+        return parsed
+
+    def clear(self) -> None:
+        """Vyprázdní cache; počítadla zůstanou zachována."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Vrátí statistiky cache.
+
+        Returns:
+            Dict[str, float]: Počty zásahů, minutí, vyřazení, obsazenost
+            a podíl zásahů (hit_rate)
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
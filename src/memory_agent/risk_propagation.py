@@ -0,0 +1,298 @@
+"""
+Propagace rizika od dodavatelů k odběratelům nad grafem dodavatelského řetězce.
+
+Každá entita má základní riziko v intervalu 0-1 (risk_score z detailu
+entity, jinak odhad z počtu rizikových faktorů v cestách dodavatelského
+řetězce). Zděděné riziko odběratele je vážený průměr rizika jeho dodavatelů
+přes všechny tiery:
+
+    inherited = sum_k decay_k * A^k @ base
+
+kde A je řádkově normalizovaná matice odběratel -> dodavatel a decay_k je
+útlum pro tier k. Výpočet probíhá pro celý graf najednou jako řídké násobení
+matice vektorem (np.bincount nad polem hran), bez smyček přes entity.
+
+Celkové riziko kombinuje základní a zděděné riziko jako pravděpodobnost,
+že nastane alespoň jedno z nich, takže zůstane v intervalu 0-1:
+
+    total = 1 - (1 - base) * (1 - min(inherited, 1))
+"""
+
+import heapq
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from memory_agent.supply_chain_graph import DEFAULT_MAX_DEPTH, SupplyChainGraph
+
+# Výchozí útlum rizika na jeden tier
+DEFAULT_DECAY = 0.5
+
+# Příspěvek jednoho rizikového faktoru k základnímu riziku entity bez risk_score
+DEFAULT_FACTOR_WEIGHT = 0.25
+
+# Výchozí počet přispívajících cest na explicitně zadanou entitu
+DEFAULT_PATHS_PER_ENTITY = 3
+
+
+def tier_weights(
+    decay: Union[float, Sequence[float]], max_depth: int = DEFAULT_MAX_DEPTH
+) -> List[float]:
+    """
+    Vrátí váhy tierů 1..max_depth.
+
+    Args:
+        decay: Útlum na tier (váha tieru k je decay**k), nebo přímo seznam
+               vah pro jednotlivé tiery
+        max_depth: Počet tierů
+
+    Returns:
+        List[float]: Váhy tierů
+
+    Raises:
+        ValueError: Pokud je útlum záporný
+    """
+    if isinstance(decay, (int, float)):
+        weights = [float(decay) ** tier for tier in range(1, max_depth + 1)]
+    else:
+        weights = [float(weight) for weight in decay][:max_depth]
+    if any(weight < 0 for weight in weights):
+        raise ValueError(f"Útlum rizika nesmí být záporný: {decay}")
+    return weights
+
+
+class RiskPropagation:
+    """
+    Řídká reprezentace grafu dodavatelů pro vektorovou propagaci rizika.
+
+    Hrany jsou uložené jako pole (odběratel, dodavatel, váha) seřazená podle
+    odběratele, takže lze kromě násobení maticí rychle vyjmenovat i dodavatele
+    jedné entity pro vysvětlení skóre.
+    """
+
+    def __init__(self, graph: SupplyChainGraph, base_risk: Dict[str, float]):
+        """
+        Sestaví řídkou matici z grafu dodavatelského řetězce.
+
+        Args:
+            graph: Graf dodavatelského řetězce
+            base_risk: Základní riziko entit (0-1); chybějící entity mají 0
+        """
+        self.entity_ids: List[str] = sorted(set(graph.nodes) | set(base_risk))
+        self.positions: Dict[str, int] = {
+            entity_id: position for position, entity_id in enumerate(self.entity_ids)
+        }
+        self.base = np.array(
+            [base_risk.get(entity_id, 0.0) for entity_id in self.entity_ids],
+            dtype=np.float64,
+        )
+
+        customers = np.array(
+            [self.positions[edge["customer"]] for edge in graph.edges], dtype=np.int64
+        )
+        suppliers = np.array(
+            [self.positions[edge["supplier"]] for edge in graph.edges], dtype=np.int64
+        )
+        order = np.argsort(customers, kind="stable")
+        self.customers = customers[order]
+        self.suppliers = suppliers[order]
+
+        # Řádková normalizace: každý dodavatel má váhu 1 / počet dodavatelů
+        out_degree = np.bincount(self.customers, minlength=len(self.entity_ids))
+        self.weights = (
+            1.0 / out_degree[self.customers]
+            if len(self.customers)
+            else (np.zeros(0, dtype=np.float64))
+        )
+        self.indptr = np.concatenate(([0], np.cumsum(out_degree)))
+
+    @classmethod
+    def from_graph(
+        cls,
+        graph: SupplyChainGraph,
+        risk_scores: Dict[str, float],
+        factor_weight: float = DEFAULT_FACTOR_WEIGHT,
+    ) -> "RiskPropagation":
+        """
+        Sestaví propagaci s odvozeným základním rizikem entit.
+
+        Args:
+            graph: Graf dodavatelského řetězce
+            risk_scores: risk_score entit (0-100) z detailů entit
+            factor_weight: Příspěvek jednoho rizikového faktoru z cest
+                           u entit bez risk_score
+
+        Returns:
+            RiskPropagation: Připravená propagace
+        """
+        base_risk = {
+            entity_id: min(1.0, factor_weight * len(node.get("risk") or []))
+            for entity_id, node in graph.nodes.items()
+        }
+        for entity_id, score in risk_scores.items():
+            base_risk[entity_id] = min(1.0, max(0.0, float(score) / 100.0))
+        return cls(graph, base_risk)
+
+    def _matvec(self, vector: np.ndarray) -> np.ndarray:
+        """Vynásobí vektor řádkově normalizovanou maticí odběratel -> dodavatel."""
+        return np.bincount(
+            self.customers,
+            weights=self.weights * vector[self.suppliers],
+            minlength=len(self.entity_ids),
+        )
+
+    def _remaining_risk(self, weights: List[float]) -> List[np.ndarray]:
+        """
+        Vrátí horní mez příspěvku cest, které pokračují z entity v tieru t.
+
+        Prvek t je sum_j weights[t + j - 1] * A^j @ base pro j = 1..D-t, tedy
+        součet příspěvků všech pokračování cesty s vahou 1 z dané entity.
+        """
+        vectors = []
+        vector = self.base
+        for _ in weights:
+            vector = self._matvec(vector)
+            vectors.append(vector)
+        return [
+            sum(
+                (
+                    weights[tier + step] * vectors[step]
+                    for step in range(len(weights) - tier)
+                ),
+                np.zeros(len(self.entity_ids), dtype=np.float64),
+            )
+            for tier in range(len(weights))
+        ]
+
+    def propagate(
+        self,
+        decay: Union[float, Sequence[float]] = DEFAULT_DECAY,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+    ) -> np.ndarray:
+        """
+        Spočítá zděděné riziko všech entit najednou.
+
+        Args:
+            decay: Útlum na tier, nebo seznam vah tierů
+            max_depth: Počet tierů, přes které se riziko propaguje
+
+        Returns:
+            np.ndarray: Zděděné riziko v pořadí self.entity_ids
+        """
+        inherited = np.zeros(len(self.entity_ids), dtype=np.float64)
+        vector = self.base
+        for weight in tier_weights(decay, max_depth):
+            vector = self._matvec(vector)
+            inherited += weight * vector
+        return inherited
+
+    def contributing_paths(
+        self,
+        entity_id: str,
+        decay: Union[float, Sequence[float]] = DEFAULT_DECAY,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        limit: int = 5,
+    ) -> List[Dict[str, Any]]:
+        """
+        Vrátí cesty k dodavatelům s největším příspěvkem ke zděděnému riziku.
+
+        Součet příspěvků všech cest odpovídá hodnotě z propagate(). Větve,
+        jejichž součet příspěvků (z vektorů A^k @ base) nepřekoná nejmenší
+        z již nalezených cest, se neprocházejí.
+
+        Args:
+            entity_id: ID entity
+            decay: Útlum na tier, nebo seznam vah tierů
+            max_depth: Počet tierů
+            limit: Maximální počet vrácených cest (0 = žádné cesty)
+
+        Returns:
+            List[Dict[str, Any]]: Cesty {"path", "tier", "supplier_risk",
+            "contribution"} seřazené od největšího příspěvku
+        """
+        start = self.positions.get(entity_id)
+        if start is None or limit <= 0:
+            return []
+        weights = tier_weights(decay, max_depth)
+        remaining = self._remaining_risk(weights)
+
+        best: List[tuple] = []
+        stack = [(start, (start,), 1.0)]
+        while stack:
+            node, path, path_weight = stack.pop()
+            tier = len(path) - 1
+            if tier >= len(weights):
+                continue
+            if len(best) == limit and path_weight * remaining[tier][node] <= best[0][0]:
+                continue
+            for edge in range(self.indptr[node], self.indptr[node + 1]):
+                supplier = int(self.suppliers[edge])
+                weight = path_weight * float(self.weights[edge])
+                next_path = path + (supplier,)
+                contribution = weights[tier] * weight * float(self.base[supplier])
+                if contribution > 0:
+                    item = (contribution, next_path)
+                    if len(best) < limit:
+                        heapq.heappush(best, item)
+                    elif item > best[0]:
+                        heapq.heapreplace(best, item)
+                stack.append((supplier, next_path, weight))
+
+        return [
+            {
+                "path": [self.entity_ids[position] for position in path],
+                "tier": len(path) - 1,
+                "supplier_risk": float(self.base[path[-1]]),
+                "contribution": contribution,
+            }
+            for contribution, path in sorted(best, reverse=True)
+        ]
+
+    def exposure(
+        self,
+        entity_ids: Optional[Iterable[str]] = None,
+        decay: Union[float, Sequence[float]] = DEFAULT_DECAY,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        paths_per_entity: Optional[int] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Vrátí základní, zděděné a celkové riziko entit včetně přispívajících cest.
+
+        Args:
+            entity_ids: ID entit (None = všechny entity grafu)
+            decay: Útlum na tier, nebo seznam vah tierů
+            max_depth: Počet tierů
+            paths_per_entity: Počet přispívajících cest na entitu (0 = bez cest);
+                              None = DEFAULT_PATHS_PER_ENTITY pro zadaná ID,
+                              bez cest pro dotaz na všechny entity
+
+        Returns:
+            Dict[str, Dict[str, Any]]: ID entity -> {"base_risk", "inherited_risk",
+            "total_risk", "contributing_paths"}; neznámé entity se vynechají
+        """
+        inherited = self.propagate(decay, max_depth)
+        if paths_per_entity is None:
+            paths_per_entity = 0 if entity_ids is None else DEFAULT_PATHS_PER_ENTITY
+        if entity_ids is None:
+            entity_ids = self.entity_ids
+
+        report: Dict[str, Dict[str, Any]] = {}
+        for entity_id in entity_ids:
+            position = self.positions.get(entity_id)
+            if position is None:
+                continue
+            base = float(self.base[position])
+            inherited_risk = float(inherited[position])
+            report[entity_id] = {
+                "base_risk": base,
+                "inherited_risk": inherited_risk,
+                "total_risk": 1.0 - (1.0 - base) * (1.0 - min(inherited_risk, 1.0)),
+                "contributing_paths": (
+                    self.contributing_paths(
+                        entity_id, decay, max_depth, paths_per_entity
+                    )
+                    if paths_per_entity and inherited_risk > 0
+                    else []
+                ),
+            }
+        return report
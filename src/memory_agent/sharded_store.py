@@ -0,0 +1,407 @@
+"""
+Shardované uspořádání adresáře dat s manifestem.
+
+Plochý adresář s tisíci soubory entity_detail_*.json, internal_*.json, ...
+se převede na malý počet shardů: záznamy jedné entity (detail, interní data,
+výsledek vyhledávání, položky dodavatelského řetězce) tvoří jeden řádek
+JSON Lines v shardu určeném prefixem hashe ID entity.
+
+Uspořádání adresáře:
+    manifest.json        ID entity -> (shard, offset, délka, sekce), pořadí
+                         entit v sekcích, indexy názvů a identifikátorů,
+                         mapa zdrojů
+    edges.json           sloupcové úložiště vztahů (EdgeStore.to_parts)
+    shards/<prefix>.jsonl
+    ostatní soubory      hromadné exporty (entity_search.json,
+                         relationships.json, ...) zkopírované beze změny
+
+Dotaz na entitu stojí jedno vyhledání v manifestu (drženém v paměti)
+a jedno čtení úseku shardu.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from memory_agent.data_index import (
+    ENTITY_DETAIL_PREFIX,
+    FILE_FAMILIES,
+    DataIndex,
+    EdgeStore,
+)
+from memory_agent.document_cache import freeze, get_document_cache
+
+logger = logging.getLogger(__name__)
+
+SHARD_FORMAT = "memory-agent-shards"
+SHARD_FORMAT_VERSION = 1
+SHARD_MANIFEST_FILENAME = "manifest.json"
+SHARD_EDGES_FILENAME = "edges.json"
+SHARD_DIRECTORY = "shards"
+# Počet hexadecimálních znaků hashe ID v názvu shardu (2 -> až 256 shardů)
+DEFAULT_PREFIX_LENGTH = 2
+# Počet dekódovaných záznamů entit držených v paměti
+DEFAULT_RECORD_CACHE_SIZE = 1024
+
+# Sekce záznamu entity a atributy DataIndex, ze kterých pochází
+SHARD_SECTIONS = {
+    "detail": "entities",
+    "internal": "internal_records",
+    "search": "search_records",
+    "supply_chain": "supply_chain_items",
+}
+
+# Rodiny souborů, jejichž obsah se rozloží do shardů
+_SHARDED_PREFIXES = (ENTITY_DETAIL_PREFIX,) + tuple(
+    f"{family}_" for family in FILE_FAMILIES
+)
+
+
+class ShardLayoutError(ValueError):
+    """Výjimka vyvolaná při chybném nebo nekompatibilním shardovaném adresáři."""
+
+    pass
+
+
+def shard_name(entity_id: str, prefix_length: int = DEFAULT_PREFIX_LENGTH) -> str:
+    """
+    Vrátí název shardu pro ID entity (prefix hexadecimálního SHA-1 hashe).
+
+    Args:
+        entity_id: ID entity
+        prefix_length: Počet znaků prefixu
+
+    Returns:
+        str: Název shardu (např. "3f")
+    """
+    return hashlib.sha1(entity_id.encode("utf-8")).hexdigest()[:prefix_length]
+
+
+def is_sharded(data_path: str) -> bool:
+    """
+    Ověří, zda adresář dat používá shardované uspořádání.
+
+    Args:
+        data_path: Cesta k adresáři s daty
+
+    Returns:
+        bool: True pokud adresář obsahuje manifest shardů
+    """
+    return os.path.isfile(os.path.join(data_path, SHARD_MANIFEST_FILENAME))
+
+
+def _write_json(path: str, document: Any) -> None:
+    """Atomicky zapíše kompaktní JSON (přes dočasný soubor a přejmenování)."""
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        json.dump(document, file, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temporary_path, path)
+
+
+def _entity_records(index: DataIndex) -> Dict[str, Dict[str, Any]]:
+    """Seskupí záznamy indexu podle ID entity a sekce."""
+    records: Dict[str, Dict[str, Any]] = {}
+    for section, attribute in SHARD_SECTIONS.items():
+        for entity_id, value in getattr(index, attribute).items():
+            records.setdefault(entity_id, {"id": entity_id})[section] = value
+    return records
+
+
+def _resources(index: DataIndex, load_json: Callable[[str], Any]) -> Dict[str, List]:
+    """Vrátí mapu názvů souborů entit na (ID entity, sekce) pro read_resource."""
+    resources = {}
+    for entity_id in index.families:
+        for file_path in index.family_files(entity_id, "internal"):
+            try:
+                document = load_json(file_path)
+            except Exception:
+                continue
+            if document == index.internal_records.get(entity_id):
+                stem = os.path.basename(file_path)[:-5]
+                resources[stem] = [entity_id, "internal"]
+    for file_name in os.listdir(index.data_path):
+        if file_name.startswith(ENTITY_DETAIL_PREFIX) and file_name.endswith(".json"):
+            try:
+                detail = load_json(os.path.join(index.data_path, file_name))
+            except Exception:
+                continue
+            entity_id = detail.get("id") if isinstance(detail, dict) else None
+            if entity_id in index.entities:
+                resources[file_name[:-5]] = [entity_id, "detail"]
+    return resources
+
+
+def migrate_to_shards(
+    data_path: str,
+    output_path: str,
+    prefix_length: int = DEFAULT_PREFIX_LENGTH,
+    load_json: Optional[Callable[[str], Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Převede plochý adresář dat na shardované uspořádání.
+
+    Shardy se zapisují postupně jeden po druhém, manifest až nakonec, takže
+    nedokončený převod se nikdy nenačte jako platný adresář.
+
+    Args:
+        data_path: Plochý adresář dat (uspořádání jako mock_data_2)
+        output_path: Cílový adresář (vytvoří se, pokud neexistuje)
+        prefix_length: Počet hexadecimálních znaků hashe v názvu shardu
+        load_json: Funkce pro načtení JSON souboru (výchozí je cache dokumentů)
+
+    Returns:
+        Dict[str, Any]: Souhrn převodu (cesta, počet entit a shardů)
+
+    Raises:
+        ShardLayoutError: Pokud je délka prefixu mimo rozsah 1-8 nebo je
+            zdrojový adresář již shardovaný
+    """
+    if not 1 <= prefix_length <= 8:
+        raise ShardLayoutError(
+            f"Délka prefixu shardu musí být 1-8 znaků, zadáno: {prefix_length}"
+        )
+    if is_sharded(data_path):
+        raise ShardLayoutError(f"Adresář {data_path} je již shardovaný")
+
+    load_json = load_json or get_document_cache().load
+    index = DataIndex.build(data_path, load_json)
+    shard_directory = os.path.join(output_path, SHARD_DIRECTORY)
+    os.makedirs(shard_directory, exist_ok=True)
+
+    records = _entity_records(index)
+    by_shard: Dict[str, List[Dict[str, Any]]] = {}
+    for entity_id, record in records.items():
+        by_shard.setdefault(shard_name(entity_id, prefix_length), []).append(record)
+
+    positions: Dict[str, List[Any]] = {}
+    for name in sorted(by_shard):
+        with open(os.path.join(shard_directory, f"{name}.jsonl"), "wb") as file:
+            for record in by_shard[name]:
+                line = json.dumps(
+                    record, ensure_ascii=False, separators=(",", ":")
+                ).encode("utf-8")
+                sections = [section for section in SHARD_SECTIONS if section in record]
+                positions[record["id"]] = [name, file.tell(), len(line), sections]
+                file.write(line + b"\n")
+    # Manifest zachová pořadí entit z indexu, ne pořadí shardů
+    entries = {entity_id: positions[entity_id] for entity_id in records}
+
+    # Hromadné exporty mimo rodiny entit zůstávají samostatnými soubory
+    for file_name in sorted(os.listdir(data_path)):
+        if file_name.endswith(".json") and not file_name.startswith(_SHARDED_PREFIXES):
+            shutil.copy2(
+                os.path.join(data_path, file_name), os.path.join(output_path, file_name)
+            )
+
+    _write_json(
+        os.path.join(output_path, SHARD_EDGES_FILENAME),
+        {"relationships": index.relationships.to_parts()},
+    )
+    manifest = {
+        "format": SHARD_FORMAT,
+        "format_version": SHARD_FORMAT_VERSION,
+        "prefix_length": prefix_length,
+        "entities": entries,
+        # Pořadí entit v jednotlivých sekcích (iterace jako u plochého adresáře)
+        "order": {
+            section: list(getattr(index, attribute))
+            for section, attribute in SHARD_SECTIONS.items()
+        },
+        "label_index": index.label_index,
+        "identifier_index": index.identifier_index,
+        "resources": _resources(index, load_json),
+    }
+    _write_json(os.path.join(output_path, SHARD_MANIFEST_FILENAME), manifest)
+
+    summary = {
+        "path": output_path,
+        "entity_count": len(index.entities),
+        "record_count": len(entries),
+        "shard_count": len(by_shard),
+    }
+    logger.info(
+        f"Převeden adresář {data_path} do {output_path}: "
+        f"{summary['record_count']} záznamů v {summary['shard_count']} shardech"
+    )
+    return summary
+
+
+class ShardStore:
+    """
+    Čtení záznamů entit ze shardů podle manifestu.
+
+    Manifest je v paměti; záznam entity se čte jedním čtením úseku shardu
+    a dekódované záznamy se drží v LRU cache.
+    """
+
+    def __init__(
+        self,
+        data_path: str,
+        manifest: Dict[str, Any],
+        cache_size: int = DEFAULT_RECORD_CACHE_SIZE,
+    ):
+        """
+        Inicializuje čtení shardů.
+
+        Args:
+            data_path: Shardovaný adresář dat
+            manifest: Načtený manifest
+            cache_size: Počet dekódovaných záznamů v LRU cache
+        """
+        self.data_path = data_path
+        self.entries: Dict[str, List[Any]] = manifest["entities"]
+        self.resources: Dict[str, List[str]] = manifest.get("resources", {})
+        self.order: Dict[str, List[str]] = manifest.get("order", {})
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def read(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Vrátí záznam entity se všemi sekcemi, nebo None.
+
+        Args:
+            entity_id: ID entity
+
+        Returns:
+            Optional[Dict[str, Any]]: Záznam entity (pouze pro čtení)
+        """
+        with self._lock:
+            record = self._cache.get(entity_id)
+            if record is not None:
+                self._cache.move_to_end(entity_id)
+                return record
+        entry = self.entries.get(entity_id)
+        if entry is None:
+            return None
+
+        name, offset, length = entry[0], entry[1], entry[2]
+        shard_path = os.path.join(self.data_path, SHARD_DIRECTORY, f"{name}.jsonl")
+        with open(shard_path, "rb") as file:
+            file.seek(offset)
+            record = freeze(json.loads(file.read(length)))
+        with self._lock:
+            self._cache[entity_id] = record
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return record
+
+    def section(self, entity_id: str, section: str) -> Any:
+        """
+        Vrátí sekci záznamu entity.
+
+        Raises:
+            KeyError: Pokud entita sekci nemá
+        """
+        entry = self.entries.get(entity_id)
+        if entry is None or section not in entry[3]:
+            raise KeyError(entity_id)
+        return self.read(entity_id)[section]
+
+    def resource(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Vrátí dokument původního souboru entity podle názvu bez přípony.
+
+        Args:
+            name: Název souboru (např. "entity_detail_mb_tool")
+
+        Returns:
+            Optional[Dict[str, Any]]: Dokument, nebo None pro neznámý název
+        """
+        reference = self.resources.get(name)
+        if reference is None:
+            return None
+        return self.section(*reference)
+
+
+class _ShardSection(Mapping):
+    """Mapování ID entity -> sekce záznamu, která se čte až při přístupu."""
+
+    def __init__(self, store: ShardStore, section: str):
+        self._store = store
+        self._section = section
+        # Manifesty bez uloženého pořadí se procházejí v pořadí záznamů
+        self._ids = store.order.get(section) or [
+            entity_id
+            for entity_id, entry in store.entries.items()
+            if section in entry[3]
+        ]
+
+    def __getitem__(self, entity_id: str) -> Any:
+        return self._store.section(entity_id, self._section)
+
+    def __contains__(self, entity_id: object) -> bool:
+        entry = self._store.entries.get(entity_id)
+        return entry is not None and self._section in entry[3]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+def _read_manifest(data_path: str) -> Dict[str, Any]:
+    """Načte a ověří manifest shardovaného adresáře."""
+    manifest_path = os.path.join(data_path, SHARD_MANIFEST_FILENAME)
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+    except json.JSONDecodeError as e:
+        raise ShardLayoutError(f"Manifest {manifest_path} není validní JSON: {str(e)}")
+    if not isinstance(manifest, dict) or manifest.get("format") != SHARD_FORMAT:
+        raise ShardLayoutError(f"Soubor {manifest_path} není manifest shardů")
+    if manifest.get("format_version") != SHARD_FORMAT_VERSION:
+        raise ShardLayoutError(
+            f"Nepodporovaná verze manifestu {manifest.get('format_version')}, "
+            f"očekávána {SHARD_FORMAT_VERSION}"
+        )
+    return manifest
+
+
+def load_sharded(
+    data_path: str, load_json: Optional[Callable[[str], Any]] = None
+) -> DataIndex:
+    """
+    Sestaví index nad shardovaným adresářem.
+
+    Načte se pouze manifest, sloupcové úložiště vztahů a hromadné exporty;
+    záznamy entit se čtou ze shardů až při přístupu.
+
+    Args:
+        data_path: Shardovaný adresář dat
+        load_json: Funkce pro načtení JSON souboru (výchozí je cache dokumentů)
+
+    Returns:
+        DataIndex: Index obsluhovaný ze shardů
+
+    Raises:
+        ShardLayoutError: Pokud manifest chybí nebo není platný
+    """
+    load_json = load_json or get_document_cache().load
+    manifest = _read_manifest(data_path)
+    store = ShardStore(data_path, manifest)
+
+    index = DataIndex(data_path)
+    index.shards = store
+    for section, attribute in SHARD_SECTIONS.items():
+        setattr(index, attribute, _ShardSection(store, section))
+    index.label_index = manifest["label_index"]
+    index.identifier_index = manifest["identifier_index"]
+    # Rodiny souborů entit ve shardovaném adresáři neexistují
+    index.families = {}
+    index._load_search_records(load_json)
+    index._load_relationships(load_json)
+    with open(os.path.join(data_path, SHARD_EDGES_FILENAME), encoding="utf-8") as file:
+        index.relationships = EdgeStore.from_parts(json.load(file)["relationships"])
+
+    logger.info(
+        f"Načten shardovaný adresář {data_path} ({len(store.entries)} záznamů entit)"
+    )
+    return index
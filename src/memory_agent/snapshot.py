@@ -0,0 +1,376 @@
+"""
+Kompilovaný binární snapshot adresáře mock dat.
+
+Snapshot obsahuje všechny záznamy datového adresáře a předem sestavené
+indexy (ID, názvy, identifikátory, seznamy sousednosti vztahů), takže
+nový worker nemusí při startu parsovat JSON soubory. Soubor se mapuje
+do paměti (mmap) a jednotlivé záznamy se dekódují až při prvním přístupu.
+
+Formát souboru:
+    MAGIC (8 B) | délka hlavičky (uint32 LE) | hlavička (JSON) | tělo
+
+Tělo obsahuje sekci indexů (kompaktní JSON s čísly záznamů a sloupcovými
+tabulkami vztahů), tabulku offsetů záznamů (uint64 LE) a kompaktně
+serializované JSON záznamy.
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from memory_agent.data_index import DataIndex, EdgeStore, source_signatures
+from memory_agent.document_cache import FrozenList, freeze, get_document_cache
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"MASNAP01"
+SNAPSHOT_FORMAT_VERSION = 3
+# Výchozí název snapshotu uvnitř datového adresáře
+SNAPSHOT_FILENAME = "index.snapshot"
+
+_HEADER_LENGTH = struct.Struct("<I")
+_OFFSET = struct.Struct("<Q")
+
+
+class SnapshotError(ValueError):
+    """Výjimka vyvolaná při chybném nebo nekompatibilním snapshotu."""
+
+    pass
+
+
+def _source_files(data_path: str) -> List[os.DirEntry]:
+    """Vrátí seřazený seznam zdrojových JSON souborů datového adresáře."""
+    entries = [
+        entry
+        for entry in os.scandir(data_path)
+        if entry.is_file() and entry.name.endswith(".json")
+    ]
+    return sorted(entries, key=lambda entry: entry.name)
+
+
+def compute_content_hash(data_path: str) -> str:
+    """
+    Spočítá SHA-256 hash obsahu všech JSON souborů datového adresáře.
+
+    Args:
+        data_path: Cesta k adresáři s mock daty
+
+    Returns:
+        str: Hexadecimální hash názvů a obsahu souborů
+    """
+    digest = hashlib.sha256()
+    for entry in _source_files(data_path):
+        digest.update(entry.name.encode("utf-8") + b"\0")
+        with open(entry.path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                digest.update(chunk)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class _RecordWriter:
+    """Sbírá záznamy pro snapshot; stejný objekt se uloží jen jednou."""
+
+    def __init__(self):
+        self.blobs: List[bytes] = []
+        self._numbers: Dict[int, int] = {}
+
+    def add(self, record: Any) -> int:
+        """Přidá záznam a vrátí jeho číslo."""
+        number = self._numbers.get(id(record))
+        if number is None:
+            number = len(self.blobs)
+            self.blobs.append(
+                json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode(
+                    "utf-8"
+                )
+            )
+            self._numbers[id(record)] = number
+        return number
+
+
+def compile_snapshot(
+    data_path: str,
+    output_path: Optional[str] = None,
+    load_json: Optional[Callable[[str], Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Zkompiluje adresář mock dat do jednoho binárního snapshotu.
+
+    Args:
+        data_path: Cesta k adresáři s mock daty
+        output_path: Cílový soubor (výchozí je SNAPSHOT_FILENAME v data_path)
+        load_json: Funkce pro načtení JSON souboru (výchozí je cache dokumentů)
+
+    Returns:
+        Dict[str, Any]: Hlavička zapsaného snapshotu včetně cesty a hashe obsahu
+    """
+    output_path = output_path or os.path.join(data_path, SNAPSHOT_FILENAME)
+    index = DataIndex.build(data_path, load_json or get_document_cache().load)
+    writer = _RecordWriter()
+
+    indexes = {
+        "entities": {
+            entity_id: writer.add(detail)
+            for entity_id, detail in index.entities.items()
+        },
+        "label_index": index.label_index,
+        "identifier_index": index.identifier_index,
+        "families": {
+            entity_id: {
+                family: [os.path.basename(path) for path in paths]
+                for family, paths in families.items()
+            }
+            for entity_id, families in index.families.items()
+        },
+        "internal_records": {
+            entity_id: writer.add(record)
+            for entity_id, record in index.internal_records.items()
+        },
+        "search_records": {
+            entity_id: writer.add(record)
+            for entity_id, record in index.search_records.items()
+        },
+        "general_search_results": [
+            writer.add(record) for record in index.general_search_results
+        ],
+        "supply_chain_items": {
+            entity_id: [writer.add(item) for item in items]
+            for entity_id, items in index.supply_chain_items.items()
+        },
+        "relationships": index.relationships.to_parts(),
+        "general_relationships": index.general_relationships.to_parts(),
+    }
+    index_blob = json.dumps(indexes, separators=(",", ":")).encode("utf-8")
+
+    offsets = [0]
+    for blob in writer.blobs:
+        offsets.append(offsets[-1] + len(blob))
+    record_table = b"".join(_OFFSET.pack(offset) for offset in offsets)
+
+    header = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "content_hash": compute_content_hash(data_path),
+        "created_at": datetime.now().isoformat(),
+        "sources": source_signatures(data_path),
+        "record_count": len(writer.blobs),
+        "entity_count": len(index.entities),
+        "indexes": [0, len(index_blob)],
+        "record_table": len(index_blob),
+        "records": len(index_blob) + len(record_table),
+    }
+    header_blob = json.dumps(header, separators=(",", ":")).encode("utf-8")
+
+    # Zápis přes dočasný soubor, aby běžící workery nikdy neviděly polovičatý snapshot
+    temp_path = f"{output_path}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(SNAPSHOT_MAGIC)
+        file.write(_HEADER_LENGTH.pack(len(header_blob)))
+        file.write(header_blob)
+        file.write(index_blob)
+        file.write(record_table)
+        for blob in writer.blobs:
+            file.write(blob)
+    os.replace(temp_path, output_path)
+
+    logger.info(
+        f"Zkompilován snapshot {output_path}: {header['entity_count']} entit, "
+        f"{header['record_count']} záznamů, hash {header['content_hash'][:12]}"
+    )
+    return dict(header, path=output_path)
+
+
+def _read_header(mapped: mmap.mmap, snapshot_path: str) -> Dict[str, Any]:
+    """Načte a ověří hlavičku snapshotu."""
+    if mapped[: len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+        raise SnapshotError(f"Soubor {snapshot_path} není snapshot mock dat")
+    (header_length,) = _HEADER_LENGTH.unpack_from(mapped, len(SNAPSHOT_MAGIC))
+    header_start = len(SNAPSHOT_MAGIC) + _HEADER_LENGTH.size
+    header = json.loads(mapped[header_start : header_start + header_length])
+    if header.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise SnapshotError(
+            f"Nepodporovaná verze snapshotu {header.get('format_version')} "
+            f"v souboru {snapshot_path}"
+        )
+    header["body_offset"] = header_start + header_length
+    return header
+
+
+def read_snapshot_header(snapshot_path: str) -> Dict[str, Any]:
+    """
+    Načte hlavičku snapshotu bez dekódování indexů a záznamů.
+
+    Args:
+        snapshot_path: Cesta k souboru snapshotu
+
+    Returns:
+        Dict[str, Any]: Hlavička snapshotu
+
+    Raises:
+        SnapshotError: Pokud soubor není platný snapshot
+    """
+    with open(snapshot_path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return _read_header(mapped, snapshot_path)
+
+
+def is_snapshot_current(snapshot_path: str, data_path: str) -> bool:
+    """
+    Ověří, že snapshot odpovídá aktuálním souborům datového adresáře.
+
+    Porovnávají se pouze podpisy souborů (mtime, velikost), nikoli jejich
+    obsah, takže kontrola nečte JSON data.
+
+    Args:
+        snapshot_path: Cesta k souboru snapshotu
+        data_path: Cesta k adresáři s mock daty
+
+    Returns:
+        bool: True pokud se zdrojové soubory od kompilace nezměnily
+    """
+    header = read_snapshot_header(snapshot_path)
+    return header.get("sources") == source_signatures(data_path)
+
+
+class _RecordPool:
+    """Líně dekódované záznamy z memory-mapovaného snapshotu."""
+
+    def __init__(self, mapped: mmap.mmap, header: Dict[str, Any]):
+        self._mapped = mapped
+        self._table_offset = header["body_offset"] + header["record_table"]
+        self._records_offset = header["body_offset"] + header["records"]
+        self._count = header["record_count"]
+        self._decoded: Dict[int, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, number: int) -> Any:
+        """Vrátí záznam podle čísla, při prvním přístupu jej dekóduje."""
+        record = self._decoded.get(number)
+        if record is not None:
+            return record
+        if not 0 <= number < self._count:
+            raise SnapshotError(f"Záznam {number} ve snapshotu neexistuje")
+
+        (start,) = _OFFSET.unpack_from(
+            self._mapped, self._table_offset + number * _OFFSET.size
+        )
+        (end,) = _OFFSET.unpack_from(
+            self._mapped, self._table_offset + (number + 1) * _OFFSET.size
+        )
+        blob = self._mapped[self._records_offset + start : self._records_offset + end]
+        record = freeze(json.loads(blob))
+        with self._lock:
+            return self._decoded.setdefault(number, record)
+
+
+class _LazyRecordMap(Mapping):
+    """Mapování klíč -> záznam, který se dekóduje až při přístupu."""
+
+    def __init__(self, pool: _RecordPool, refs: Dict[str, int]):
+        self._pool = pool
+        self._refs = refs
+
+    def __getitem__(self, key: str) -> Any:
+        return self._pool.get(self._refs[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._refs)
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+
+class _LazyRecordGroups(Mapping):
+    """Mapování klíč -> seznam líně dekódovaných záznamů."""
+
+    def __init__(self, pool: _RecordPool, refs: Dict[str, List[int]]):
+        self._pool = pool
+        self._refs = refs
+
+    def __getitem__(self, key: str) -> List[Any]:
+        return FrozenList(self._pool.get(number) for number in self._refs[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._refs)
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+
+class _LazyRecordList(Sequence):
+    """Seznam líně dekódovaných záznamů."""
+
+    def __init__(self, pool: _RecordPool, refs: List[int]):
+        self._pool = pool
+        self._refs = refs
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self._pool.get(number) for number in self._refs[position]]
+        return self._pool.get(self._refs[position])
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+
+def load_snapshot(snapshot_path: str, data_path: str) -> DataIndex:
+    """
+    Načte index ze snapshotu namapovaného do paměti.
+
+    Dekódují se pouze tabulky indexů; záznamy (detaily entit, vztahy, ...)
+    se čtou ze snapshotu až při prvním přístupu.
+
+    Args:
+        snapshot_path: Cesta k souboru snapshotu
+        data_path: Cesta k adresáři s mock daty (pro mapu rodin souborů)
+
+    Returns:
+        DataIndex: Index obsluhovaný ze snapshotu
+
+    Raises:
+        SnapshotError: Pokud soubor není platný snapshot
+    """
+    with open(snapshot_path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        header = _read_header(mapped, snapshot_path)
+        index_start = header["body_offset"] + header["indexes"][0]
+        indexes = json.loads(mapped[index_start : index_start + header["indexes"][1]])
+    except Exception:
+        mapped.close()
+        raise
+
+    pool = _RecordPool(mapped, header)
+    index = DataIndex(data_path)
+    index.entities = _LazyRecordMap(pool, indexes["entities"])
+    index.label_index = indexes["label_index"]
+    index.identifier_index = indexes["identifier_index"]
+    index.families = {
+        entity_id: {
+            family: [os.path.join(data_path, name) for name in names]
+            for family, names in families.items()
+        }
+        for entity_id, families in indexes["families"].items()
+    }
+    index.internal_records = _LazyRecordMap(pool, indexes["internal_records"])
+    index.search_records = _LazyRecordMap(pool, indexes["search_records"])
+    index.general_search_results = _LazyRecordList(
+        pool, indexes["general_search_results"]
+    )
+    index.supply_chain_items = _LazyRecordGroups(pool, indexes["supply_chain_items"])
+    index.relationships = EdgeStore.from_parts(indexes["relationships"])
+    index.general_relationships = EdgeStore.from_parts(indexes["general_relationships"])
+    index.content_hash = header["content_hash"]
+
+    logger.info(
+        f"Načten snapshot {snapshot_path} ({header['entity_count']} entit, "
+        f"hash {header['content_hash'][:12]})"
+    )
+    return index
@@ -180,6 +180,36 @@ class State:
     sledovat komplexní sítě vztahů mezi společnostmi a dalšími entitami.
     """
 
+    risk_factors_data: Annotated[Dict[str, Any], merge_dict_values] = field(
+        default_factory=dict
+    )
+    """
+    Data o rizikových faktorech analyzované společnosti.
+
+    Obsahuje rizikové skóre, sjednocený seznam rizikových faktorů a riziko
+    zděděné od dodavatelů (inherited_risk), jak je vrací MockMCPConnector.
+    """
+
+    supply_chain_data: Annotated[Dict[str, List[Dict[str, Any]]], merge_dict_values] = (
+        field(default_factory=dict)
+    )
+    """
+    Položky dodavatelského řetězce podle ID společnosti.
+
+    Obsahuje surové položky ze supply_chain_*.json, jejichž zdrojem je daná společnost.
+    """
+
+    supply_chain_graph: Annotated[Dict[str, Dict[str, Any]], merge_dict_values] = field(
+        default_factory=dict
+    )
+    """
+    Vícestupňový dodavatelský řetězec podle ID společnosti.
+
+    Obsahuje dodavatele seskupené podle tierů (Tier 1 = přímí dodavatelé)
+    a hrany odběratel -> dodavatel s produkty, jak je vrací
+    MockMCPConnector.get_supply_chain_graph.
+    """
+
     error_state: Dict[str, Any] = field(default_factory=dict)
     """
     Informace o chybách, když workflow narazí na problémy.
@@ -218,7 +248,8 @@ class State:
         Vrátí instanci MockMCPConnector z konfigurace.
 
         Nejprve zkontroluje, zda již existuje mcp_connector atribut,
-        a pokud ne, vytvoří novou instanci a uloží ji do mcp_connector.
+        a pokud ne, vezme sdílenou instanci z registru konektorů a uloží ji
+        do mcp_connector.
 
         Returns:
             MockMCPConnector: Instance konektoru pro přístup k datům
@@ -227,9 +258,9 @@ class State:
         if self.mcp_connector is not None:
             return self.mcp_connector
 
-        # Pokud ne, vytvořit novou instanci
+        # Pokud ne, vzít sdílenou instanci z registru
+        from memory_agent.connector_registry import get_connector_registry
         from memory_agent.schema import MockMCPConnectorConfig
-        from memory_agent.tools import MockMCPConnector
 
         if self.mcp_connector_config is None:
             self.mcp_connector_config = MockMCPConnectorConfig()
@@ -239,8 +270,8 @@ class State:
         else:
             config = self.mcp_connector_config
 
-        # Vytvořit instanci a uložit ji přímo do atributu mcp_connector
-        self.mcp_connector = MockMCPConnector(data_path=config.data_path)
+        # Uložit sdílenou instanci přímo do atributu mcp_connector
+        self.mcp_connector = get_connector_registry().get(data_path=config.data_path)
         return self.mcp_connector
 
     # Podpora pro konfigurace
@@ -0,0 +1,180 @@
+"""
+Graf dodavatelského řetězce sestavený z cest v supply_chain_*.json.
+
+Každá položka dodavatelského řetězce obsahuje pole "path" s řetězcem
+Tier 1 -> Tier 2 -> Tier 3. Sousední entity v cestě tvoří hranu
+odběratel -> dodavatel; produkty dodavatele (HS kód, období, země) se
+ukládají na hranu. Z grafu lze pak rozbalit dodavatele společnosti do
+zvolené hloubky bez opakovaného procházení souborů.
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Výchozí hloubka rozbalení (Tier 1 až Tier 3)
+DEFAULT_MAX_DEPTH = 3
+
+# Atributy entity přebírané z cesty do uzlu grafu
+_NODE_FIELDS = ("type", "label", "countries", "risk")
+
+
+def _product_key(product: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Vrátí klíč produktu pro odstranění duplicit na hraně."""
+    hs_code = product.get("hs_code")
+    code = hs_code.get("code") if isinstance(hs_code, dict) else hs_code
+    return (
+        code,
+        product.get("min_date"),
+        product.get("max_date"),
+        tuple(product.get("departure_countries") or ()),
+        tuple(product.get("arrival_countries") or ()),
+    )
+
+
+class SupplyChainGraph:
+    """
+    Orientovaný graf odběratel -> dodavatel s produkty na hranách.
+
+    Obsahuje:
+    - nodes: ID entity -> atributy entity (label, countries, risk, ...)
+    - edges: seznam hran {"customer", "supplier", "products"}
+    - suppliers: ID odběratele -> pozice jeho hran v edges
+    """
+
+    def __init__(self):
+        """Inicializuje prázdný graf."""
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.edges: List[Dict[str, Any]] = []
+        self.suppliers: Dict[str, List[int]] = {}
+        self._edge_positions: Dict[Tuple[str, str], int] = {}
+        self._product_keys: List[set] = []
+
+    @classmethod
+    def from_items(cls, items: Iterable[Dict[str, Any]]) -> "SupplyChainGraph":
+        """
+        Sestaví graf z položek supply_chain_*.json.
+
+        Args:
+            items: Položky dodavatelského řetězce s polem "path"
+
+        Returns:
+            SupplyChainGraph: Sestavený graf
+        """
+        graph = cls()
+        for item in items:
+            path = item.get("path")
+            if isinstance(path, list):
+                graph.add_path(path)
+        return graph
+
+    def _add_node(self, entity: Dict[str, Any]) -> Optional[str]:
+        """Přidá entitu z cesty jako uzel a vrátí její ID."""
+        entity_id = entity.get("id")
+        if not entity_id:
+            return None
+        node = self.nodes.setdefault(entity_id, {"id": entity_id})
+        for key in _NODE_FIELDS:
+            if key in entity and key not in node:
+                node[key] = entity[key]
+        return entity_id
+
+    def add_path(self, path: List[Dict[str, Any]]) -> None:
+        """
+        Přidá cestu dodavatelského řetězce do grafu.
+
+        Args:
+            path: Seznam kroků {"entity": {...}, "products": [...]} od odběratele
+                  k nejvzdálenějšímu dodavateli
+        """
+        customer_id = None
+        for step in path:
+            entity = step.get("entity") if isinstance(step, dict) else None
+            supplier_id = self._add_node(entity) if isinstance(entity, dict) else None
+            if customer_id and supplier_id and customer_id != supplier_id:
+                self._add_edge(customer_id, supplier_id, step.get("products") or [])
+            customer_id = supplier_id
+
+    def _add_edge(
+        self, customer_id: str, supplier_id: str, products: List[Dict[str, Any]]
+    ) -> None:
+        """Přidá hranu, případně doplní produkty existující hrany."""
+        position = self._edge_positions.get((customer_id, supplier_id))
+        if position is None:
+            position = len(self.edges)
+            self._edge_positions[(customer_id, supplier_id)] = position
+            self.edges.append(
+                {"customer": customer_id, "supplier": supplier_id, "products": []}
+            )
+            self._product_keys.append(set())
+            self.suppliers.setdefault(customer_id, []).append(position)
+
+        edge_products = self.edges[position]["products"]
+        seen = self._product_keys[position]
+        for product in products:
+            if not isinstance(product, dict):
+                continue
+            key = _product_key(product)
+            if key not in seen:
+                seen.add(key)
+                edge_products.append(product)
+
+    def expand(
+        self, company_id: str, max_depth: int = DEFAULT_MAX_DEPTH
+    ) -> Dict[str, Any]:
+        """
+        Rozbalí dodavatele společnosti do zadané hloubky (BFS).
+
+        Každý dodavatel je zařazen do tieru podle nejkratší vzdálenosti od
+        společnosti (Tier 1 = přímí dodavatelé). Cena je lineární ve velikosti
+        navštíveného podgrafu.
+
+        Args:
+            company_id: ID společnosti
+            max_depth: Maximální počet kroků od společnosti
+
+        Returns:
+            Dict[str, Any]: {"company_id", "max_depth", "tiers", "edges"}, kde
+            tiers je seznam {"tier", "suppliers"} a edges jsou hrany podgrafu
+            s produkty a tierem dodavatele
+        """
+        depths: Dict[str, int] = {company_id: 0}
+        tiers: List[List[Dict[str, Any]]] = []
+        edges: List[Dict[str, Any]] = []
+        queue = deque([company_id])
+
+        while queue:
+            customer_id = queue.popleft()
+            depth = depths[customer_id]
+            if depth >= max_depth:
+                continue
+            for position in self.suppliers.get(customer_id, []):
+                edge = self.edges[position]
+                supplier_id = edge["supplier"]
+                if supplier_id not in depths:
+                    depths[supplier_id] = depth + 1
+                    if len(tiers) <= depth:
+                        tiers.append([])
+                    tiers[depth].append(
+                        dict(self.nodes[supplier_id], tier=depth + 1, customers=[])
+                    )
+                    queue.append(supplier_id)
+                edges.append(dict(edge, tier=depths[supplier_id]))
+
+        # Odběratelé každého dodavatele v rámci navštíveného podgrafu
+        suppliers_by_id = {
+            supplier["id"]: supplier for tier in tiers for supplier in tier
+        }
+        for edge in edges:
+            supplier = suppliers_by_id.get(edge["supplier"])
+            if supplier is not None and edge["customer"] not in supplier["customers"]:
+                supplier["customers"].append(edge["customer"])
+
+        return {
+            "company_id": company_id,
+            "max_depth": max_depth,
+            "tiers": [
+                {"tier": number, "suppliers": suppliers}
+                for number, suppliers in enumerate(tiers, start=1)
+            ],
+            "edges": edges,
+        }
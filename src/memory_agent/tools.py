@@ -1,16 +1,58 @@
 """Define the agent's tools."""
 
 import asyncio
+import base64
 import glob
+import hashlib
 import json
 import logging
 import os
-import re
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, ClassVar, Dict, List, Optional
-
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import aiofiles
 from pydantic import BaseModel
-from unidecode import unidecode
+
+from memory_agent.company_gazetteer import display_name
+from memory_agent.data_index import (
+    EDGE_DIRECTIONS,
+    RELATIONSHIP_ARRAY_KEYS,
+    DataIndex,
+    SourceChanges,
+    merge_relationships,
+    normalize_name,
+    normalize_relationship,
+    relationship_endpoints,
+    relationship_key,
+    source_signatures,
+)
+from memory_agent.document_cache import freeze, get_document_cache
+from memory_agent.graph_analysis import DEFAULT_MAX_HOPS, DEFAULT_PATH_COUNT
+from memory_agent.risk_propagation import DEFAULT_DECAY
+from memory_agent.sharded_store import is_sharded, load_sharded
+from memory_agent.snapshot import SNAPSHOT_FILENAME, is_snapshot_current, load_snapshot
+from memory_agent.supply_chain_graph import DEFAULT_MAX_DEPTH
+from memory_agent.trigram_index import (
+    DEFAULT_SIMILARITY_THRESHOLD,
+    similarity,
+    trigrams,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +92,260 @@ class CompanyQueryParams(BaseModel):
     industry: Optional[List[str]] = None
 
 
+@dataclass
+class BatchResult:
+    """
+    Výsledek dávkového dotazu na více společností.
+
+    Attributes:
+        found: Výsledky podle ID společnosti (v pořadí zadaných ID)
+        missing: ID společností, pro které nebyla nalezena žádná data
+    """
+
+    found: Dict[str, Any] = field(default_factory=dict)
+    missing: List[str] = field(default_factory=list)
+
+
+# Výchozí velikost stránky vyhledávání (odpovídá "limit" v entity_search.json)
+DEFAULT_PAGE_LIMIT = 10
+
+# Zdroje výsledků vyhledávání společností uložené v kurzoru
+_SEARCH_SOURCE_RESULTS = "search"
+_SEARCH_SOURCE_ENTITIES = "entities"
+
+
+@dataclass
+class SearchPage:
+    """
+    Stránka výsledků vyhledávání společností.
+
+    Pole odpovídají stránkovanému kontraktu entity_search.json
+    (limit, offset, next, size).
+
+    Attributes:
+        data: Společnosti na stránce
+        limit: Maximální počet společností na stránce
+        offset: Počet společností vrácených na předchozích stránkách
+        next: Kurzor další stránky (None, pokud jde o poslední stránku)
+        size: Počet kandidátů po filtrování {"count": int, "qualifier": str};
+              qualifier "lte" znamená horní odhad (filtr názvu se vyhodnocuje
+              až při procházení)
+    """
+
+    data: List[Dict[str, Any]] = field(default_factory=list)
+    limit: int = DEFAULT_PAGE_LIMIT
+    offset: int = 0
+    next: Optional[str] = None
+    size: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ReloadResult:
+    """
+    Výsledek obnovení indexu po změně souborů datového adresáře.
+
+    Attributes:
+        generation: Generace indexu po obnovení
+        added: Názvy přidaných souborů
+        changed: Názvy změněných souborů
+        removed: Názvy odebraných souborů
+        incremental: True, pokud se index aktualizoval jen o změněné soubory
+        seconds: Doba obnovení v sekundách (včetně porovnání manifestu)
+    """
+
+    generation: int
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    incremental: bool = False
+    seconds: float = 0.0
+
+
+def _query_fingerprint(params: "CompanyQueryParams") -> str:
+    """Vrátí krátký otisk parametrů dotazu, ke kterým kurzor patří."""
+    digest = hashlib.sha256(params.model_dump_json().encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _encode_cursor(source: str, start: int, offset: int, fingerprint: str) -> str:
+    """Zakóduje pozici ve výsledcích do neprůhledného kurzoru."""
+    payload = json.dumps([source, start, offset, fingerprint], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str, fingerprint: str) -> Tuple[str, int, int]:
+    """
+    Dekóduje kurzor na (zdroj, pozice v kandidátech, offset).
+
+    Raises:
+        ValueError: Pokud kurzor není platný nebo patří k jinému dotazu
+    """
+    try:
+        source, start, offset, cursor_fingerprint = json.loads(
+            base64.urlsafe_b64decode(cursor.encode("ascii"))
+        )
+    except (ValueError, TypeError, UnicodeError) as e:
+        raise ValueError(f"Neplatný kurzor stránkování: {str(e)}")
+    if cursor_fingerprint != fingerprint:
+        raise ValueError("Kurzor stránkování patří k jinému dotazu")
+    if source not in (_SEARCH_SOURCE_RESULTS, _SEARCH_SOURCE_ENTITIES):
+        raise ValueError(f"Neplatný zdroj v kurzoru stránkování: '{source}'")
+    return source, int(start), int(offset)
+
+
+# Top-level pole se záznamy v exportech dat (v pořadí priority)
+RECORD_ARRAY_KEYS = ("data", "relationships", "results")
+
+# Velikost bloku čteného ze souboru při streamovaném parsování
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_JSON_WHITESPACE = " \t\n\r"
+
+
+class _JSONStream:
+    """
+    Text JSON souboru čtený po blocích pro inkrementální parsování.
+
+    V bufferu se drží jen nezpracovaný zbytek, takže paměť je omezená
+    velikostí největšího záznamu a bloku, ne velikostí souboru.
+    """
+
+    def __init__(self, file, chunk_size: int):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Odstraní zpracovaný začátek bufferu a načte další blok souboru."""
+        if self.eof:
+            return False
+        self.buffer = self.buffer[self.pos :]
+        self.pos = 0
+        # Velikost čtení roste s bufferem, aby velký záznam nebyl kvadratický
+        chunk = self._file.read(max(self._chunk_size, len(self.buffer)))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def peek(self) -> str:
+        """Vrátí další znak mimo bílé znaky, nebo prázdný řetězec na konci."""
+        while True:
+            while self.pos < len(self.buffer):
+                if self.buffer[self.pos] not in _JSON_WHITESPACE:
+                    return self.buffer[self.pos]
+                self.pos += 1
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """Přeskočí očekávaný znak, jinak vyvolá chybu formátu."""
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Očekáváno '{char}'", self.buffer, self.pos)
+        self.pos += 1
+
+    def decode(self) -> Any:
+        """Dekóduje další JSON hodnotu, v případě potřeby dočte další bloky."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # Číslo nebo literál na konci bufferu může pokračovat v dalším bloku
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_json_array(stream: _JSONStream) -> Iterator[Dict[str, Any]]:
+    """Postupně vrací objekty z JSON pole, na jehož začátku stream stojí."""
+    stream.expect("[")
+    while True:
+        char = stream.peek()
+        if char == "]":
+            stream.pos += 1
+            return
+        if char == ",":
+            stream.pos += 1
+            continue
+        if not char:
+            raise json.JSONDecodeError("Neukončené pole", stream.buffer, stream.pos)
+        record = stream.decode()
+        if isinstance(record, dict):
+            yield record
+
+
+def iter_json_records(
+    file_path: str,
+    keys: Tuple[str, ...] = RECORD_ARRAY_KEYS,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    all_arrays: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Postupně vrací záznamy z top-level pole JSON souboru bez načtení celého souboru.
+
+    Pokud je dokument pole, vrací jeho objekty. Pokud je dokument objekt,
+    vrací objekty z prvního top-level pole s klíčem z keys (v pořadí
+    v souboru); ostatní top-level hodnoty se přeskočí. Po dočtení pole se
+    čtení souboru ukončí (s all_arrays pokračuje dalšími poli), a ukončení
+    generátoru (break, limit) soubor okamžitě zavře.
+
+    Args:
+        file_path: Cesta k JSON souboru
+        keys: Klíče top-level polí se záznamy
+        chunk_size: Velikost čteného bloku ve znacích
+        all_arrays: Vracet záznamy ze všech polí s klíčem z keys, ne jen z prvního
+
+    Yields:
+        Dict[str, Any]: Jednotlivé záznamy
+
+    Raises:
+        DataFormatError: Pokud soubor není validní JSON
+        ConnectionError: Pokud soubor nelze načíst
+    """
+    try:
+        with open(file_path, "r", encoding="utf-8") as file:
+            stream = _JSONStream(file, chunk_size)
+            first = stream.peek()
+            if first == "[":
+                yield from _iter_json_array(stream)
+                return
+            stream.expect("{")
+            while True:
+                char = stream.peek()
+                if char == "}":
+                    return
+                if char == ",":
+                    stream.pos += 1
+                    continue
+                key = stream.decode()
+                stream.expect(":")
+                if key in keys and stream.peek() == "[":
+                    yield from _iter_json_array(stream)
+                    if not all_arrays:
+                        return
+                    continue
+                # Hodnota, která nás nezajímá (metadata stránkování apod.)
+                stream.decode()
+    except json.JSONDecodeError as e:
+        logger.error(f"Chyba při parsování JSON souboru: {file_path}")
+        raise DataFormatError(f"Soubor {file_path} není validní JSON: {str(e)}")
+    except FileNotFoundError:
+        logger.error(f"Soubor nenalezen: {file_path}")
+        raise ConnectionError(f"Soubor {file_path} nebyl nalezen")
+    except OSError as e:
+        logger.error(f"Chyba při čtení souboru {file_path}: {str(e)}")
+        raise ConnectionError(f"Nelze načíst soubor {file_path}: {str(e)}")
+
+
 # Třída pro přístup k mock datům
 class MockMCPConnector:
     """
@@ -64,15 +360,38 @@ class MockMCPConnector:
         "MOCK_DATA_PATH", str(Path(__file__).parent.parent.parent / "mock_data_2")
     )
 
-    def __init__(self, data_path: Optional[str] = None):
+    MOCK_DATA_SNAPSHOT: ClassVar[Optional[str]] = os.environ.get("MOCK_DATA_SNAPSHOT")
+
+    # Výchozí interval kontroly změn souborů pro start_auto_reload (sekundy)
+    RELOAD_INTERVAL: ClassVar[float] = float(
+        os.environ.get("MOCK_DATA_RELOAD_INTERVAL", "30")
+    )
+
+    def __init__(
+        self, data_path: Optional[str] = None, snapshot_path: Optional[str] = None
+    ):
         """
         Inicializuje MockMCPConnector.
 
         Args:
             data_path: Volitelná cesta k mock datům.
                        Pokud není poskytnuta, použije se výchozí cesta.
+            snapshot_path: Volitelná cesta ke kompilovanému snapshotu dat.
+                       Pokud není poskytnuta, hledá se SNAPSHOT_FILENAME v data_path.
         """
         self.data_path = data_path or self.MOCK_DATA_PATH
+        self.snapshot_path = (
+            snapshot_path
+            or self.MOCK_DATA_SNAPSHOT
+            or os.path.join(self.data_path, SNAPSHOT_FILENAME)
+        )
+        self._index: Optional[DataIndex] = None
+        self._index_lock = threading.Lock()
+        # Obnovení indexu běží vždy jen jedno, čtenáři na něj nečekají
+        self._reload_lock = threading.Lock()
+        self._reload_stop: Optional[threading.Event] = None
+        self._reload_thread: Optional[threading.Thread] = None
+        self.last_reload: Optional[ReloadResult] = None
         logger.info(f"Inicializace MockMCPConnector s cestou k datům: {self.data_path}")
 
     def read_resource(self, company_name: str) -> Dict[str, Any]:
@@ -91,26 +410,34 @@ class MockMCPConnector:
         # Sestavení cesty k souboru
         file_path = os.path.join(self.data_path, f"{company_name}.json")
 
+        # Ve shardovaném adresáři jsou soubory entit uložené ve shardech
+        if not os.path.exists(file_path) and is_sharded(self.data_path):
+            resource = self._get_index().shards.resource(company_name)
+            if resource is not None:
+                return resource
+
         # Načtení a parsování JSON souboru
         return self._load_json_file(file_path)
 
     def _load_json_file(self, file_path: str) -> Dict[str, Any]:
         """
-        Načte a parsuje JSON soubor.
+        Načte a parsuje JSON soubor přes procesní cache dokumentů.
+
+        Soubor se parsuje znovu jen tehdy, když se změnil jeho mtime nebo
+        velikost. Vrácená data jsou read-only pohled sdílený s cache.
 
         Args:
             file_path: Cesta k JSON souboru
 
         Returns:
-            Dict[str, Any]: Parsovaný obsah JSON souboru
+            Dict[str, Any]: Parsovaný obsah JSON souboru (pouze pro čtení)
 
         Raises:
             DataFormatError: Pokud soubor není validní JSON
             ConnectionError: Pokud soubor nelze načíst
         """
         try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                return json.load(file)
+            return get_document_cache().load(file_path)
         except json.JSONDecodeError:
             logger.error(f"Chyba při parsování JSON souboru: {file_path}")
             raise DataFormatError(f"Soubor {file_path} není validní JSON")
@@ -121,6 +448,202 @@ class MockMCPConnector:
             logger.error(f"Chyba při čtení souboru {file_path}: {str(e)}")
             raise ConnectionError(f"Nelze načíst soubor {file_path}: {str(e)}")
 
+    def _get_index(self) -> DataIndex:
+        """
+        Vrátí index mock dat, při prvním použití jej líně sestaví.
+
+        Sestavení je chráněno zámkem, takže při souběžném přístupu z více
+        vláken se index sestaví pouze jednou.
+
+        Returns:
+            DataIndex: Index nad adresářem self.data_path
+        """
+        if self._index is None:
+            with self._index_lock:
+                if self._index is None:
+                    self._index = self._build_index()
+        return self._index
+
+    def _build_index(self) -> DataIndex:
+        """
+        Sestaví index, přednostně z manifestu shardů nebo aktuálního snapshotu.
+
+        Snapshot se použije, pouze pokud odpovídá aktuálním souborům
+        v datovém adresáři; jinak se index sestaví z JSON souborů.
+
+        Returns:
+            DataIndex: Index nad adresářem self.data_path
+        """
+        index = self._load_prebuilt_index()
+        if index is not None:
+            return index
+        return DataIndex.build(self.data_path, self._load_json_file)
+
+    def _load_prebuilt_index(self) -> Optional[DataIndex]:
+        """
+        Načte index ze shardovaného adresáře nebo ze snapshotu, pokud odpovídá datům.
+
+        Returns:
+            Optional[DataIndex]: Index ze shardů nebo snapshotu, nebo None
+        """
+        # Podpisy souborů slouží k pozdějšímu porovnání v reload()
+        signatures = source_signatures(self.data_path)
+        if is_sharded(self.data_path):
+            index = load_sharded(self.data_path, self._load_json_file)
+            index.signatures = signatures
+            return index
+        if os.path.exists(self.snapshot_path):
+            try:
+                if is_snapshot_current(self.snapshot_path, self.data_path):
+                    index = load_snapshot(self.snapshot_path, self.data_path)
+                    index.signatures = signatures
+                    return index
+                logger.warning(
+                    f"Snapshot {self.snapshot_path} neodpovídá datům, načítám JSON soubory"
+                )
+            except (OSError, ValueError) as e:
+                logger.warning(f"Nelze načíst snapshot {self.snapshot_path}: {str(e)}")
+        return None
+
+    def warm(self) -> None:
+        """Předem sestaví index, aby první dotaz nečekal na načtení dat."""
+        self._get_index()
+
+    def close(self) -> None:
+        """
+        Uvolní index konektoru a zastaví automatické obnovování.
+
+        Případný memory-mapovaný snapshot se uzavře, jakmile na jeho data
+        přestanou odkazovat všichni volající. Další dotaz index sestaví znovu.
+        """
+        self.stop_auto_reload()
+        with self._index_lock:
+            self._index = None
+
+    @property
+    def generation(self) -> int:
+        """Generace aktuálního indexu; první sestavení má generaci 0."""
+        index = self._index
+        return index.generation if index is not None else 0
+
+    def index_identity(self) -> Tuple[str, int]:
+        """
+        Vrátí identitu aktuálního indexu pro klíče procesních cache.
+
+        Na rozdíl od generace, která začíná u každého konektoru od 0, se
+        identita liší i mezi konektory, adresáři dat a přestavěnými indexy.
+        Index se při prvním volání sestaví.
+
+        Returns:
+            Tuple[str, int]: Cesta k datům a procesně jedinečné číslo indexu
+        """
+        return self.data_path, self._get_index().uid
+
+    def reload(self) -> ReloadResult:
+        """
+        Promítne změny souborů datového adresáře do indexu.
+
+        Změny se zjistí porovnáním manifestu podpisů (mtime, velikost)
+        s podpisy, ze kterých index vznikl. Index sestavený z JSON souborů
+        se aktualizuje jen o přidané, změněné a odebrané soubory
+        (DataIndex.apply_changes); index ze snapshotu nebo shardů se při
+        změně sestaví znovu. Nová generace se vymění najednou, takže dotaz
+        rozpracovaný nad předchozí generací dál vidí konzistentní data.
+
+        Returns:
+            ReloadResult: Změněné soubory, nová generace a doba obnovení
+        """
+        with self._reload_lock:
+            started = time.perf_counter()
+            index = self._get_index()
+            signatures = source_signatures(self.data_path)
+            changes = SourceChanges.between(index.signatures, signatures)
+            updated = index
+            if changes:
+                if index.tracks_sources:
+                    updated = index.apply_changes(
+                        changes, signatures, self._load_json_file
+                    )
+                else:
+                    updated = self._build_index()
+                    updated.generation = index.generation + 1
+                with self._index_lock:
+                    # Po close() se index nenastavuje, sestaví se při dalším dotazu
+                    if self._index is index:
+                        self._index = updated
+
+            result = ReloadResult(
+                generation=updated.generation,
+                added=list(changes.added),
+                changed=list(changes.changed),
+                removed=list(changes.removed),
+                incremental=bool(changes) and index.tracks_sources,
+                seconds=time.perf_counter() - started,
+            )
+            if changes:
+                logger.info(
+                    f"Index {self.data_path} obnoven na generaci {result.generation} "
+                    f"za {result.seconds * 1000:.1f} ms ({len(changes.added)} "
+                    f"přidaných, {len(changes.changed)} změněných, "
+                    f"{len(changes.removed)} odebraných souborů)"
+                )
+            self.last_reload = result
+            return result
+
+    def start_auto_reload(self, interval: Optional[float] = None) -> None:
+        """
+        Spustí vlákno, které periodicky volá reload().
+
+        Args:
+            interval: Interval kontroly změn v sekundách (výchozí RELOAD_INTERVAL)
+
+        Raises:
+            ValueError: Pokud interval není kladný
+        """
+        interval = self.RELOAD_INTERVAL if interval is None else interval
+        if interval <= 0:
+            raise ValueError(f"Interval obnovování musí být kladný: {interval}")
+        self.stop_auto_reload()
+        stop = threading.Event()
+
+        def run() -> None:
+            while not stop.wait(interval):
+                try:
+                    self.reload()
+                except Exception as e:
+                    logger.error(f"Chyba při obnovení indexu {self.data_path}: {e}")
+
+        self._reload_stop = stop
+        self._reload_thread = threading.Thread(
+            target=run, name="mock-data-reload", daemon=True
+        )
+        self._reload_thread.start()
+
+    def stop_auto_reload(self) -> None:
+        """Zastaví vlákno automatického obnovování, pokud běží."""
+        if self._reload_stop is None:
+            return
+        self._reload_stop.set()
+        if self._reload_thread is not threading.current_thread():
+            self._reload_thread.join()
+        self._reload_stop = None
+        self._reload_thread = None
+
+    def _set_index(self, index: DataIndex) -> DataIndex:
+        """
+        Nastaví index sestavený mimo konektor, pokud ještě žádný není.
+
+        Args:
+            index: Sestavený index
+
+        Returns:
+            DataIndex: Index, který konektor skutečně používá
+        """
+        with self._index_lock:
+            if self._index is None:
+                self._index = index
+        return self._index
+
     def _normalize_name(self, name: str) -> str:
         """
         Normalizuje název pro porovnávání (odstraní diakritiku, převede na malá písmena).
@@ -131,17 +654,17 @@ class MockMCPConnector:
         Returns:
             str: Normalizovaný název
         """
-        # Odstranit diakritiku a převést na malá písmena
-        normalized = unidecode(name).lower()
-        # Odstranit nadbytečné mezery a speciální znaky
-        normalized = re.sub(r"[^a-z0-9]", " ", normalized)
-        normalized = re.sub(r"\s+", " ", normalized).strip()
-        return normalized
+        return normalize_name(name)
 
-    def _fuzzy_name_match(self, name1: str, name2: str, threshold: float = 0.8) -> bool:
+    def _fuzzy_name_match(
+        self, name1: str, name2: str, threshold: float = DEFAULT_SIMILARITY_THRESHOLD
+    ) -> bool:
         """
         Porovná dva názvy s tolerancí (fuzzy matching).
 
+        Podobnost je koeficient překryvu trigramů normalizovaných názvů, takže
+        název obsažený celými slovy v druhém názvu má podobnost 1.0.
+
         Args:
             name1: První název
             name2: Druhý název
@@ -150,19 +673,81 @@ class MockMCPConnector:
         Returns:
             bool: True pokud jsou názvy dostatečně podobné
         """
-        norm1 = self._normalize_name(name1)
-        norm2 = self._normalize_name(name2)
+        grams1 = trigrams(self._normalize_name(name1))
+        grams2 = trigrams(self._normalize_name(name2))
+        return bool(grams1 and grams2) and similarity(grams1, grams2) >= threshold
+
+    def find_companies_by_name(
+        self,
+        name: str,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        limit: Optional[int] = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        Najde společnosti s podobným názvem seřazené podle podobnosti.
+
+        Args:
+            name: Hledaný název společnosti
+            threshold: Minimální podobnost názvů (0-1)
+            limit: Maximální počet nalezených názvů (None = všechny nad prahem)
+
+        Returns:
+            List[Dict[str, Any]]: Záznamy {"id", "label", "score"}
+        """
+        index = self._get_index()
+        return [
+            {
+                "id": entity_id,
+                "label": index.entities[entity_id].get("label", ""),
+                "score": score,
+            }
+            for entity_id, score in index.match_names(name, threshold, limit)
+        ]
+
+    def find_company_mentions(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Najde zmínky společností ve volném textu (např. v dotazu uživatele).
+
+        Použije gazetteer názvů, aliasů a identifikátorů entit; na každé
+        pozici textu vyhraje nejdelší shoda.
+
+        Args:
+            text: Prohledávaný text
 
-        # Jednoduchá implementace - pokud jeden je podřetězcem druhého
-        # V reálném systému by zde byla sofistikovanější metrika
-        return (norm1 in norm2) or (norm2 in norm1)
+        Returns:
+            List[Dict[str, Any]]: Záznamy {"text", "start", "end", "entity_id",
+            "entity_ids", "label", "name"} v pořadí výskytu v textu; "text" je
+            zmínka tak, jak je zapsaná, "name" název entity bez právní formy
+        """
+        index = self._get_index()
+        mentions = []
+        for mention in index.gazetteer.spot(text):
+            detail = index.get_entity(mention.entity_id) or {}
+            label = detail.get("label") or mention.text
+            mentions.append(
+                {
+                    "text": mention.text,
+                    "start": mention.start,
+                    "end": mention.end,
+                    "entity_id": mention.entity_id,
+                    "entity_ids": list(mention.entity_ids),
+                    "label": label,
+                    "name": display_name(label),
+                }
+            )
+        return mentions
 
-    def get_company_by_name(self, name: str) -> Dict[str, Any]:
+    def get_company_by_name(
+        self, name: str, threshold: float = DEFAULT_SIMILARITY_THRESHOLD
+    ) -> Dict[str, Any]:
         """
         Najde společnost podle názvu v mock datech.
 
+        Vrací společnost s nejpodobnějším názvem.
+
         Args:
             name: Název společnosti
+            threshold: Minimální podobnost názvů (0-1)
 
         Returns:
             Dict[str, Any]: Data společnosti
@@ -170,23 +755,13 @@ class MockMCPConnector:
         Raises:
             EntityNotFoundError: Pokud společnost nebyla nalezena
         """
-        # Hledáme v souborech entity_detail_*.json
-        for file_path in glob.glob(
-            os.path.join(self.data_path, "entity_detail_*.json")
-        ):
-            try:
-                company_data = self._load_json_file(file_path)
-                # V nových datech se používá "label" místo "name"
-                company_name = company_data.get("label", "")
-
-                if self._fuzzy_name_match(name, company_name):
-                    logger.info(
-                        f"Nalezena společnost: {company_name} (hledáno: {name})"
-                    )
-                    return company_data
-            except Exception as e:
-                logger.warning(f"Chyba při zpracování souboru {file_path}: {str(e)}")
-                continue
+        index = self._get_index()
+        for entity_id in index.find_ids_by_name(name, threshold, limit=1):
+            company_data = index.entities[entity_id]
+            logger.info(
+                f"Nalezena společnost: {company_data.get('label', '')} (hledáno: {name})"
+            )
+            return company_data
 
         logger.error(f"Společnost s názvem '{name}' nebyla nalezena")
         raise EntityNotFoundError(f"Společnost s názvem '{name}' nebyla nalezena")
@@ -204,145 +779,180 @@ class MockMCPConnector:
         Raises:
             EntityNotFoundError: Pokud společnost nebyla nalezena
         """
-        # Hledáme v souborech entity_detail_*.json
-        for file_path in glob.glob(
-            os.path.join(self.data_path, "entity_detail_*.json")
-        ):
-            try:
-                company_data = self._load_json_file(file_path)
-                if company_data.get("id") == company_id:
-                    logger.info(f"Nalezena společnost s ID: {company_id}")
-                    return company_data
-            except Exception as e:
-                logger.warning(f"Chyba při zpracování souboru {file_path}: {str(e)}")
-                continue
+        company_data = self._get_index().get_entity(company_id)
+        if company_data is not None:
+            logger.info(f"Nalezena společnost s ID: {company_id}")
+            return company_data
 
         logger.error(f"Společnost s ID '{company_id}' nebyla nalezena")
         raise EntityNotFoundError(f"Společnost s ID '{company_id}' nebyla nalezena")
 
-    def search_companies(self, params: CompanyQueryParams) -> List[Dict[str, Any]]:
+    def get_company_by_identifier(
+        self, identifier_type: str, value: str
+    ) -> Dict[str, Any]:
         """
-        Vyhledá společnosti podle zadaných parametrů.
+        Najde společnost podle identifikátoru (DUNS, registrační číslo, DIČ).
+
+        Hodnota se porovnává v normalizované podobě, takže nezáleží na
+        mezerách, pomlčkách ani velikosti písmen.
 
         Args:
-            params: Parametry vyhledávání
+            identifier_type: Typ identifikátoru (např. "duns_number", "vat_number")
+            value: Hodnota identifikátoru
 
         Returns:
-            List[Dict[str, Any]]: Seznam nalezených společností
+            Dict[str, Any]: Data společnosti
+
+        Raises:
+            EntityNotFoundError: Pokud společnost nebyla nalezena
         """
-        results = []
+        index = self._get_index()
+        for entity_id in index.find_ids_by_identifier(identifier_type, value):
+            logger.info(
+                f"Nalezena společnost s identifikátorem {identifier_type}={value}"
+            )
+            return index.entities[entity_id]
 
-        # Nejprve zkontrolujeme soubor entity_search.json, pokud existuje
-        entity_search_path = os.path.join(self.data_path, "entity_search.json")
-        if os.path.exists(entity_search_path):
-            try:
-                search_results = self._load_json_file(entity_search_path)
-                if "results" in search_results:
-                    for company in search_results["results"]:
-                        # Kontrola parametrů vyhledávání
-                        matches = True
-
-                        if params.id and company.get("id") != params.id:
-                            matches = False
-
-                        if params.name and not self._fuzzy_name_match(
-                            params.name, company.get("label", "")
-                        ):
-                            matches = False
-
-                        # V nových datech jsou země uloženy v seznamu
-                        if params.country:
-                            country_match = False
-                            if "countries" in company:
-                                for country in company["countries"]:
-                                    if country.lower() == params.country.lower():
-                                        country_match = True
-                                        break
-                            if not country_match:
-                                matches = False
-
-                        # Kontrola průmyslu z detailů společnosti
-                        if params.industry and params.industry:
-                            # Pro kontrolu průmyslu musíme načíst detailní data
-                            try:
-                                detail_path = os.path.join(
-                                    self.data_path,
-                                    f"entity_detail_{company.get('id')}.json",
-                                )
-                                if os.path.exists(detail_path):
-                                    detail_data = self._load_json_file(detail_path)
-                                    industry_match = False
-                                    if "industry" in detail_data:
-                                        for ind in params.industry:
-                                            if (
-                                                ind.lower()
-                                                in detail_data["industry"].lower()
-                                            ):
-                                                industry_match = True
-                                                break
-                                    if not industry_match:
-                                        matches = False
-                            except Exception:
-                                # Pokud nelze načíst detaily, předpokládáme neshodu
-                                matches = False
-
-                        if matches:
-                            results.append(company)
-            except Exception as e:
-                logger.warning(
-                    f"Chyba při zpracování souboru {entity_search_path}: {str(e)}"
-                )
+        logger.error(
+            f"Společnost s identifikátorem {identifier_type}='{value}' nebyla nalezena"
+        )
+        raise EntityNotFoundError(
+            f"Společnost s identifikátorem {identifier_type}='{value}' nebyla nalezena"
+        )
 
-        # Pokud není entity_search.json nebo neobsahuje výsledky, procházíme jednotlivé entity_detail_*.json soubory
-        if not results:
-            for file_path in glob.glob(
-                os.path.join(self.data_path, "entity_detail_*.json")
-            ):
-                try:
-                    company_data = self._load_json_file(file_path)
+    def _page(
+        self,
+        candidates: Sequence[int],
+        start: int,
+        limit: int,
+        record_at: Callable[[int], Optional[Dict[str, Any]]],
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Projde kandidáty od pozice start a vrátí stránku záznamů.
 
-                    # Kontrola parametrů vyhledávání
-                    matches = True
+        Args:
+            candidates: Pozice kandidátů
+            start: Index v candidates, od kterého se pokračuje
+            limit: Velikost stránky
+            record_at: Vrátí záznam pro pozici, nebo None, pokud neodpovídá
 
-                    if params.id and company_data.get("id") != params.id:
-                        matches = False
+        Returns:
+            Tuple: Záznamy stránky a index dalšího odpovídajícího kandidáta
+            (None, pokud už žádný není)
+        """
+        results: List[Dict[str, Any]] = []
+        for number in range(start, len(candidates)):
+            record = record_at(candidates[number])
+            if record is None:
+                continue
+            # Jeden záznam navíc jen zjistí, zda existuje další stránka
+            if len(results) == limit:
+                return results, number
+            results.append(record)
+        return results, None
+
+    def search_companies(
+        self,
+        params: CompanyQueryParams,
+        limit: int = DEFAULT_PAGE_LIMIT,
+        cursor: Optional[str] = None,
+    ) -> SearchPage:
+        """
+        Vyhledá společnosti podle zadaných parametrů po stránkách.
 
-                    if params.name and not self._fuzzy_name_match(
-                        params.name, company_data.get("label", "")
-                    ):
-                        matches = False
-
-                    if params.country and params.country:
-                        country_match = False
-                        if "countries" in company_data:
-                            for country in company_data["countries"]:
-                                if country.lower() == params.country.lower():
-                                    country_match = True
-                                    break
-                        if not country_match:
-                            matches = False
-
-                    if params.industry and params.industry:
-                        industry_match = False
-                        if "industry" in company_data:
-                            for ind in params.industry:
-                                if ind.lower() in company_data["industry"].lower():
-                                    industry_match = True
-                                    break
-                        if not industry_match:
-                            matches = False
-
-                    if matches:
-                        results.append(company_data)
+        ID, země a průmysl se vyhodnotí průnikem předpočítaných posting
+        listů; záznamy se čtou jen pro kandidáty, kteří se procházejí pro
+        aktuální stránku. Výsledky pochází z entity_search.json, a pokud
+        v něm dotazu nic neodpovídá, z detailů entit (u dotazu podle názvu
+        seřazené od nejpodobnějšího názvu).
 
-                except Exception as e:
-                    logger.warning(
-                        f"Chyba při zpracování souboru {file_path}: {str(e)}"
-                    )
-                    continue
+        Args:
+            params: Parametry vyhledávání
+            limit: Maximální počet společností na stránce
+            cursor: Kurzor z pole next předchozí stránky (None = první stránka)
 
-        logger.info(f"Nalezeno {len(results)} společností podle parametrů: {params}")
-        return results
+        Returns:
+            SearchPage: Stránka nalezených společností
+
+        Raises:
+            ValueError: Pokud limit není kladný nebo kurzor není platný
+        """
+        if limit < 1:
+            raise ValueError(f"Velikost stránky musí být kladná, zadáno: {limit}")
+
+        index = self._get_index()
+        fingerprint = _query_fingerprint(params)
+        source, start, offset = None, 0, 0
+        if cursor is not None:
+            source, start, offset = _decode_cursor(cursor, fingerprint)
+        filters = {
+            "company_id": params.id,
+            "country": params.country,
+            "industries": params.industry,
+        }
+
+        if source in (None, _SEARCH_SOURCE_RESULTS):
+            candidates = index.search_postings.candidates(**filters)
+
+            def search_record(position: int) -> Optional[Dict[str, Any]]:
+                company = index.general_search_results[position]
+                if params.name and not self._fuzzy_name_match(
+                    params.name, company.get("label", "")
+                ):
+                    return None
+                return company
+
+            data, next_start = self._page(candidates, start, limit, search_record)
+            qualifier = "lte" if params.name else "eq"
+            # Pokud entity_search.json dotazu neodpovídá, procházíme detaily entit
+            if data or source is not None:
+                source = _SEARCH_SOURCE_RESULTS
+            else:
+                source, start = _SEARCH_SOURCE_ENTITIES, 0
+
+        if source == _SEARCH_SOURCE_ENTITIES:
+            postings = index.entity_postings
+            candidates = postings.candidates(**filters)
+            if params.name:
+                # Kandidáti podle názvu z trigramového indexu, od nejpodobnějšího
+                candidates = postings.select(
+                    index.find_ids_by_name(params.name, limit=None), candidates
+                )
+            data, next_start = self._page(
+                candidates,
+                start,
+                limit,
+                lambda position: index.entities[postings.ids[position]],
+            )
+            qualifier = "eq"
+
+        page = SearchPage(
+            data=data,
+            limit=limit,
+            offset=offset,
+            size={"count": len(candidates), "qualifier": qualifier},
+        )
+        if next_start is not None:
+            page.next = _encode_cursor(
+                source, next_start, offset + len(data), fingerprint
+            )
+        logger.info(
+            f"Nalezeno {len(data)} společností na stránce podle parametrů: {params}"
+        )
+        return page
+
+    def _financials_from_index(
+        self, index: DataIndex, company_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Vrátí finanční data společnosti z indexu, nebo None."""
+        internal_data = index.internal_records.get(company_id)
+        if internal_data is None:
+            return None
+        if "financial_data" in internal_data:
+            # Přidáme ID pro konzistenci, aniž bychom měnili data v indexu
+            return dict(internal_data["financial_data"], company_id=company_id)
+        # Pokud neexistuje specifická sekce financial_data, vrátíme celá interní data
+        return internal_data
 
     def get_company_financials(self, company_id: str) -> Dict[str, Any]:
         """
@@ -357,79 +967,9 @@ class MockMCPConnector:
         Raises:
             EntityNotFoundError: Pokud finanční data nebyla nalezena
         """
-        # Nejprve získáme detail společnosti pro získání názvu/labelu
-        company_detail = None
-        company_name = None
-
-        try:
-            # Zkusíme najít detail společnosti podle ID
-            for file_path in glob.glob(
-                os.path.join(self.data_path, "entity_detail_*.json")
-            ):
-                detail_data = self._load_json_file(file_path)
-                if detail_data.get("id") == company_id:
-                    company_detail = detail_data
-                    company_name = (
-                        detail_data.get("label", "").split(" ")[0].lower()
-                    )  # První část názvu pro hledání souboru
-                    break
-        except Exception as e:
-            logger.warning(f"Nepodařilo se načíst detail společnosti: {str(e)}")
-
-        # Pokusíme se najít internal_*.json soubor
-        internal_files = []
-
-        # Pokud známe název společnosti, zkusíme najít podle něj
-        if company_name:
-            # Hledáme soubory internal_*.json podle názvu společnosti
-            for file_path in glob.glob(
-                os.path.join(self.data_path, f"internal_{company_name}*.json")
-            ):
-                internal_files.append(file_path)
-
-        # Pokud ne, projdeme všechny internal_*.json soubory
-        if not internal_files:
-            for file_path in glob.glob(os.path.join(self.data_path, "internal_*.json")):
-                internal_files.append(file_path)
-
-        # Procházíme nalezené soubory a hledáme finanční data
-        for file_path in internal_files:
-            try:
-                internal_data = self._load_json_file(file_path)
-
-                # Pokud máme ID společnosti, kontrolujeme shodu
-                if (
-                    "duns_number" in internal_data
-                    and company_detail
-                    and "identifiers" in company_detail
-                ):
-                    for identifier in company_detail["identifiers"]:
-                        if identifier.get("type") == "duns_number" and identifier.get(
-                            "value"
-                        ) == internal_data.get("duns_number"):
-                            # Našli jsme shodu - vrátíme celá interní data nebo jen finanční část
-                            if "financial_data" in internal_data:
-                                financial_data = internal_data["financial_data"]
-                                financial_data["company_id"] = (
-                                    company_id  # Přidáme ID pro konzistenci
-                                )
-                                return financial_data
-                            else:
-                                # Pokud neexistuje specifická sekce financial_data, vrátíme celá interní data
-                                return internal_data
-
-                # Pokud soubor obsahuje financial_data pro dané ID
-                if (
-                    "company_id" in internal_data
-                    and internal_data["company_id"] == company_id
-                ):
-                    if "financial_data" in internal_data:
-                        return internal_data["financial_data"]
-                    else:
-                        return internal_data
-            except Exception as e:
-                logger.warning(f"Chyba při zpracování souboru {file_path}: {str(e)}")
-                continue
+        financial_data = self._financials_from_index(self._get_index(), company_id)
+        if financial_data is not None:
+            return financial_data
 
         logger.error(
             f"Finanční data pro společnost s ID '{company_id}' nebyla nalezena"
@@ -438,124 +978,45 @@ class MockMCPConnector:
             f"Finanční data pro společnost s ID '{company_id}' nebyla nalezena"
         )
 
-    def get_company_relationships(self, company_id: str) -> List[Dict[str, Any]]:
+    def _relationships_from_index(
+        self,
+        index: DataIndex,
+        company_id: str,
+        relationship_type: Optional[str],
+        direction: str,
+    ) -> List[Dict[str, Any]]:
+        """Vrátí vztahy společnosti ze seznamů sousednosti indexu."""
+        results = index.relationships.edges_for(
+            company_id, relationship_type, direction
+        )
+
+        # Pokud jsme nenašli žádné vztahy, zkusíme ještě obecný soubor relationships.json
+        if not results:
+            results = index.general_relationships.edges_for(
+                company_id, relationship_type, direction
+            )
+        return results
+
+    def get_company_relationships(
+        self,
+        company_id: str,
+        relationship_type: Optional[str] = None,
+        direction: str = "both",
+    ) -> List[Dict[str, Any]]:
         """
         Získá vztahy společnosti k jiným entitám.
 
         Args:
             company_id: ID společnosti
+            relationship_type: Volitelný filtr typu vztahu (např. "has_supplier")
+            direction: "outgoing", "incoming" nebo "both" (výchozí)
 
         Returns:
             List[Dict[str, Any]]: Seznam vztahů společnosti
         """
-        results = []
-        company_name = None
-
-        # Nejprve zkusíme získat detail společnosti, abychom měli její název
-        try:
-            for file_path in glob.glob(
-                os.path.join(self.data_path, "entity_detail_*.json")
-            ):
-                detail_data = self._load_json_file(file_path)
-                if detail_data.get("id") == company_id:
-                    company_name = (
-                        detail_data.get("label", "").split(" ")[0].lower()
-                    )  # První část názvu pro hledání souboru
-                    break
-        except Exception as e:
-            logger.warning(f"Nepodařilo se načíst detail společnosti: {str(e)}")
-
-        # Pokud známe název společnosti, zkusíme najít specifický soubor pro tuto společnost
-        relationship_files = []
-
-        if company_name:
-            # Hledáme specifické soubory vztahů pro společnost
-            for file_path in glob.glob(
-                os.path.join(self.data_path, f"relationships_{company_name}*.json")
-            ):
-                relationship_files.append(file_path)
-
-        # Pokud nemáme specifické soubory, použijeme všechny soubory vztahů
-        if not relationship_files:
-            for file_path in glob.glob(
-                os.path.join(self.data_path, "relationships_*.json")
-            ):
-                relationship_files.append(file_path)
-
-        # Procházíme nalezené soubory vztahů
-        for file_path in relationship_files:
-            try:
-                relationships_data = self._load_json_file(file_path)
-
-                # Nová struktura obsahuje "data" pole s jednotlivými vztahy
-                if "data" in relationships_data and isinstance(
-                    relationships_data["data"], list
-                ):
-                    for relationship in relationships_data["data"]:
-                        # Kontrola, zda tento vztah zahrnuje hledanou společnost
-                        source = relationship.get("source", {})
-                        target = relationship.get("target", {})
-
-                        if (
-                            source.get("id") == company_id
-                            or target.get("id") == company_id
-                        ):
-                            results.append(relationship)
-
-                # Pro případ, že by struktura byla jiná, zkontrolujeme i "relationships" pole
-                elif "relationships" in relationships_data and isinstance(
-                    relationships_data["relationships"], list
-                ):
-                    for relationship in relationships_data["relationships"]:
-                        source = relationship.get("source", {})
-                        target = relationship.get("target", {})
-
-                        if (
-                            source.get("id") == company_id
-                            or target.get("id") == company_id
-                        ):
-                            results.append(relationship)
-
-                # Starší formát bez vnořené struktury
-                elif isinstance(relationships_data, list):
-                    for relationship in relationships_data:
-                        source = relationship.get("source", {})
-                        target = relationship.get("target", {})
-
-                        if (
-                            source.get("id") == company_id
-                            or target.get("id") == company_id
-                        ):
-                            results.append(relationship)
-
-            except Exception as e:
-                logger.warning(f"Chyba při zpracování souboru {file_path}: {str(e)}")
-                continue
-
-        # Pokud jsme nenašli žádné vztahy, zkusíme ještě obecný soubor relationships.json
-        if not results:
-            general_path = os.path.join(self.data_path, "relationships.json")
-            if os.path.exists(general_path):
-                try:
-                    general_data = self._load_json_file(general_path)
-
-                    if "data" in general_data and isinstance(
-                        general_data["data"], list
-                    ):
-                        for relationship in general_data["data"]:
-                            source = relationship.get("source", {})
-                            target = relationship.get("target", {})
-
-                            if (
-                                source.get("id") == company_id
-                                or target.get("id") == company_id
-                            ):
-                                results.append(relationship)
-                except Exception as e:
-                    logger.warning(
-                        f"Chyba při zpracování obecného souboru vztahů: {str(e)}"
-                    )
-
+        results = self._relationships_from_index(
+            self._get_index(), company_id, relationship_type, direction
+        )
         logger.info(f"Nalezeno {len(results)} vztahů pro společnost {company_id}")
         return results
 
@@ -572,89 +1033,25 @@ class MockMCPConnector:
         Raises:
             EntityNotFoundError: Pokud společnost nebyla nalezena
         """
-        # Nejprve se pokusíme získat název společnosti z ID pro lepší vyhledávání
-        company_name = None
-        company_detail = None
+        index = self._get_index()
 
-        try:
-            # Zkusíme najít detail společnosti podle ID
-            for file_path in glob.glob(
-                os.path.join(self.data_path, "entity_detail_*.json")
-            ):
-                try:
-                    detail_data = self._load_json_file(file_path)
-                    if detail_data.get("id") == company_id:
-                        company_detail = detail_data
-                        company_name = (
-                            detail_data.get("label", "").split(" ")[0].lower()
-                        )  # První část názvu pro hledání souboru
-                        break
-                except Exception as e:
-                    logger.warning(
-                        f"Chyba při zpracování souboru {file_path}: {str(e)}"
-                    )
-                    continue
-        except Exception as e:
-            logger.warning(f"Nepodařilo se načíst detail společnosti: {str(e)}")
-
-        # Hledání specifického souboru entity_search pro společnost
-        search_files = []
-
-        if company_name:
-            # Hledáme specifické soubory podle názvu společnosti
-            for file_path in glob.glob(
-                os.path.join(self.data_path, f"entity_search_{company_name}*.json")
-            ):
-                search_files.append(file_path)
-
-        # Pokud nemáme specifické soubory, použijeme všechny soubory entity_search
-        if not search_files:
-            for file_path in glob.glob(
-                os.path.join(self.data_path, "entity_search_*.json")
-            ):
-                search_files.append(file_path)
-
-        # Procházíme nalezené soubory
-        for file_path in search_files:
-            try:
-                search_data = self._load_json_file(file_path)
-
-                # V entity_search_*.json jsou data v poli "results"
-                if "results" in search_data and isinstance(
-                    search_data["results"], list
-                ):
-                    for entity in search_data["results"]:
-                        if entity.get("id") == company_id:
-                            logger.info(
-                                f"Nalezena základní data společnosti v {file_path}"
-                            )
-                            return entity
-            except Exception as e:
-                logger.warning(f"Chyba při zpracování souboru {file_path}: {str(e)}")
-                continue
+        search_record = index.search_records.get(company_id)
+        if search_record is not None:
+            logger.info(f"Nalezena základní data společnosti s ID {company_id}")
+            return search_record
 
         # Pokud jsme nenašli specifický záznam, zkusíme ještě obecný soubor
-        general_path = os.path.join(self.data_path, "entity_search.json")
-        if os.path.exists(general_path):
-            try:
-                general_data = self._load_json_file(general_path)
-                if "results" in general_data and isinstance(
-                    general_data["results"], list
-                ):
-                    for entity in general_data["results"]:
-                        if entity.get("id") == company_id:
-                            logger.info(
-                                "Nalezena základní data společnosti v obecném souboru"
-                            )
-                            return entity
-            except Exception as e:
-                logger.warning(f"Chyba při zpracování obecného souboru: {str(e)}")
+        for entity in index.general_search_results:
+            if entity.get("id") == company_id:
+                logger.info("Nalezena základní data společnosti v obecném souboru")
+                return entity
 
         logger.error(
             f"Základní data pro společnost s ID '{company_id}' nebyla nalezena"
         )
 
         # Pokud jsme nenašli search data, ale máme detail, vraťme ten jako záložní řešení
+        company_detail = index.get_entity(company_id)
         if company_detail:
             logger.warning(
                 f"Vracení detailních dat jako náhrady za chybějící search data pro ID {company_id}"
@@ -678,93 +1075,171 @@ class MockMCPConnector:
         Raises:
             EntityNotFoundError: Pokud data nebyla nalezena
         """
-        # Nejprve se pokusíme získat název společnosti z ID pro lepší vyhledávání
-        company_name = None
+        results = list(self._get_index().supply_chain_items.get(company_id, []))
 
-        try:
-            # Zkusíme najít detail společnosti podle ID
-            for file_path in glob.glob(
-                os.path.join(self.data_path, "entity_detail_*.json")
-            ):
-                try:
-                    detail_data = self._load_json_file(file_path)
-                    if detail_data.get("id") == company_id:
-                        company_name = (
-                            detail_data.get("label", "").split(" ")[0].lower()
-                        )  # První část názvu pro hledání souboru
-                        break
-                except Exception as e:
-                    logger.warning(
-                        f"Chyba při zpracování souboru {file_path}: {str(e)}"
-                    )
-                    continue
-        except Exception as e:
-            logger.warning(f"Nepodařilo se načíst detail společnosti: {str(e)}")
+        logger.info(
+            f"Nalezeno {len(results)} položek dodavatelského řetězce pro společnost {company_id}"
+        )
 
-        # Hledání specifického souboru supply_chain pro společnost
-        supply_chain_files = []
+        if not results:
+            logger.warning(
+                f"Data o dodavatelském řetězci pro společnost s ID '{company_id}' nebyla nalezena"
+            )
 
-        if company_name:
-            # Hledáme specifické soubory podle názvu společnosti
-            for file_path in glob.glob(
-                os.path.join(self.data_path, f"supply_chain_{company_name}*.json")
-            ):
-                supply_chain_files.append(file_path)
+        return results
 
-        # Pokud nemáme specifické soubory, použijeme všechny soubory supply_chain
-        if not supply_chain_files:
-            for file_path in glob.glob(
-                os.path.join(self.data_path, "supply_chain_*.json")
-            ):
-                supply_chain_files.append(file_path)
+    def get_supply_chain_graph(
+        self, company_id: str, max_depth: int = DEFAULT_MAX_DEPTH
+    ) -> Dict[str, Any]:
+        """
+        Rozbalí vícestupňový dodavatelský řetězec společnosti.
 
-        results = []
+        Dodavatelé jsou seskupení podle tieru (Tier 1 = přímí dodavatelé)
+        a hrany odběratel -> dodavatel nesou produkty dodavatele.
 
-        # Procházíme nalezené soubory
-        for file_path in supply_chain_files:
-            try:
-                supply_chain_data = self._load_json_file(file_path)
+        Args:
+            company_id: ID společnosti
+            max_depth: Maximální hloubka rozbalení (počet tierů)
 
-                # Kontrola různých možných struktur dat
-                if "data" in supply_chain_data and isinstance(
-                    supply_chain_data["data"], list
-                ):
-                    # Struktura s polem "data" - nejčastější formát v mock_data_2
-                    for item in supply_chain_data["data"]:
-                        # Kontrola, zda se jedná o dodavatelský řetězec pro danou společnost
-                        source = item.get("source")
-                        if isinstance(source, str) and source == company_id:
-                            results.append(item)
-                        elif (
-                            isinstance(source, dict) and source.get("id") == company_id
-                        ):
-                            results.append(item)
-
-                # Starší formát - přímo seznam položek dodavatelského řetězce
-                elif isinstance(supply_chain_data, list):
-                    for item in supply_chain_data:
-                        source = item.get("source")
-                        if isinstance(source, str) and source == company_id:
-                            results.append(item)
-                        elif (
-                            isinstance(source, dict) and source.get("id") == company_id
-                        ):
-                            results.append(item)
-
-            except Exception as e:
-                logger.warning(f"Chyba při zpracování souboru {file_path}: {str(e)}")
-                continue
+        Returns:
+            Dict[str, Any]: {"company_id", "max_depth", "tiers", "edges"}
+        """
+        result = self._get_index().supply_chain_graph.expand(company_id, max_depth)
+        logger.info(
+            f"Rozbalen dodavatelský řetězec pro společnost {company_id}: "
+            f"{sum(len(tier['suppliers']) for tier in result['tiers'])} dodavatelů "
+            f"v {len(result['tiers'])} tierech"
+        )
+        return result
+
+    def get_risk_exposure(
+        self,
+        company_ids: Union[str, Iterable[str], None] = None,
+        decay: Union[float, Sequence[float]] = DEFAULT_DECAY,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        paths_per_entity: Optional[int] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Spočítá riziko zděděné od dodavatelů napříč tiery.
 
+        Propagace běží vektorově nad celým grafem dodavatelů najednou, takže
+        cena dotazu na tisíce společností je prakticky stejná jako na jednu.
+
+        Args:
+            company_ids: ID společnosti, nebo ID společností (None = všechny
+                         entity grafu dodavatelů)
+            decay: Útlum na tier (váha tieru k je decay**k), nebo seznam vah tierů
+            max_depth: Počet tierů, přes které se riziko propaguje
+            paths_per_entity: Počet přispívajících cest na společnost (None =
+                              tři cesty pro zadaná ID, bez cest pro všechny
+                              entity grafu)
+
+        Returns:
+            Dict[str, Dict[str, Any]]: ID společnosti -> {"base_risk",
+            "inherited_risk", "total_risk", "contributing_paths"}; společnosti
+            mimo graf i bez detailu se vynechají
+        """
+        # Jedno ID jako řetězec by se jinak procházelo po znacích
+        if isinstance(company_ids, str):
+            company_ids = [company_ids]
+        exposure = self._get_index().risk_propagation.exposure(
+            company_ids, decay, max_depth, paths_per_entity
+        )
+        logger.info(f"Spočítáno zděděné riziko pro {len(exposure)} společností")
+        return exposure
+
+    def find_alternative_suppliers(
+        self, entity_id: str, hs_prefix: Optional[str] = None, limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Najde alternativní dodavatele produktů entity podle HS kódů.
+
+        Args:
+            entity_id: ID nahrazovaného dodavatele
+            hs_prefix: Volitelný prefix HS kódu (kapitola "87", položka "8708"
+                       nebo podpoložka "8708.29"); bez prefixu se hledají
+                       náhrady za všechny produkty entity
+            limit: Maximální počet kandidátů
+
+        Returns:
+            List[Dict[str, Any]]: Kandidáti {"id", "label", "matched_codes",
+            "products"}, kde products obsahují období a země dodávek
+
+        Raises:
+            ValueError: Pokud prefix HS kódu neobsahuje žádnou číslici
+        """
+        candidates = self._get_index().hs_code_index.alternative_suppliers(
+            entity_id, hs_prefix, limit
+        )
         logger.info(
-            f"Nalezeno {len(results)} položek dodavatelského řetězce pro společnost {company_id}"
+            f"Nalezeno {len(candidates)} alternativních dodavatelů pro {entity_id}"
+            + (f" (HS {hs_prefix})" if hs_prefix else "")
         )
+        return candidates
 
-        if not results:
-            logger.warning(
-                f"Data o dodavatelském řetězci pro společnost s ID '{company_id}' nebyla nalezena"
-            )
+    def get_supplier_dependencies(self, company_id: str) -> Dict[str, Any]:
+        """
+        Vrátí jediné body selhání v dodavatelském řetězci společnosti.
 
-        return results
+        Výsledky jsou předpočítané v indexu: single_points_of_failure jsou
+        dodavatelé, přes které vedou všechny cesty k jejich závislým
+        dodavatelům (dominátory), articulation_points jsou dodavatelé, jejichž
+        odebrání rozpojí podgraf dodavatelů společnosti.
+
+        Args:
+            company_id: ID společnosti
+
+        Returns:
+            Dict[str, Any]: {"company_id", "supplier_count",
+            "single_points_of_failure", "articulation_points"}
+        """
+        result = self._get_index().supplier_dependencies.analysis(company_id)
+        logger.info(
+            f"Nalezeno {len(result['single_points_of_failure'])} jediných bodů "
+            f"selhání v dodavatelském řetězci společnosti {company_id}"
+        )
+        return result
+
+    def find_paths(
+        self,
+        source_id: str,
+        target_id: str,
+        max_hops: int = DEFAULT_MAX_HOPS,
+        relationship_types: Optional[Iterable[str]] = None,
+        k: int = DEFAULT_PATH_COUNT,
+    ) -> List[Dict[str, Any]]:
+        """
+        Najde nejkratší cesty mezi dvěma entitami.
+
+        Cesty vedou přes vztahy i hrany dodavatelského řetězce (typ
+        "supply_chain") bez ohledu na jejich směr.
+
+        Args:
+            source_id: ID výchozí entity
+            target_id: ID cílové entity
+            max_hops: Maximální počet kroků cesty
+            relationship_types: Povolené typy hran (None = všechny)
+            k: Maximální počet vrácených cest
+
+        Returns:
+            List[Dict[str, Any]]: Cesty {"entities", "length", "hops"} seřazené
+            podle délky; každý krok obsahuje záznamy hran mezi entitami
+        """
+        graph = self._get_index().entity_graph
+        types = set(relationship_types) if relationship_types is not None else None
+        paths = graph.k_shortest_paths(source_id, target_id, k, max_hops, types)
+        logger.info(
+            f"Nalezeno {len(paths)} cest mezi {source_id} a {target_id} "
+            f"(max. {max_hops} kroků)"
+        )
+        return [
+            {
+                "entities": path,
+                "length": len(path) - 1,
+                "hops": graph.path_edges(path, types),
+            }
+            for path in paths
+        ]
 
     def get_risk_factors_data(self, company_id: str) -> Dict[str, Any]:
         """
@@ -779,43 +1254,37 @@ class MockMCPConnector:
         Raises:
             EntityNotFoundError: Pokud data nebyla nalezena
         """
-        # Nejprve získáme detail společnosti, který obsahuje rizikové faktory
-        company_detail = None
-
-        try:
-            # Zkusíme najít detail společnosti podle ID
-            for file_path in glob.glob(
-                os.path.join(self.data_path, "entity_detail_*.json")
-            ):
-                try:
-                    detail_data = self._load_json_file(file_path)
-                    if detail_data.get("id") == company_id:
-                        company_detail = detail_data
-                        logger.info(f"Nalezen detail společnosti pro ID: {company_id}")
-                        break
-                except Exception as e:
-                    logger.warning(
-                        f"Chyba při zpracování souboru {file_path}: {str(e)}"
-                    )
-                    continue
-        except Exception as e:
-            logger.warning(f"Nepodařilo se načíst detail společnosti: {str(e)}")
+        # Detail společnosti obsahuje rizikové faktory
+        company_detail = self._get_index().get_entity(company_id)
 
         if not company_detail:
             logger.error(f"Detail společnosti s ID '{company_id}' nebyl nalezen")
             raise EntityNotFoundError(
                 f"Detail společnosti s ID '{company_id}' nebyl nalezen"
             )
+        logger.info(f"Nalezen detail společnosti pro ID: {company_id}")
 
-        # Extrakce rizikových faktorů z detailu společnosti
-        risk_data = {}
+        return self._risk_factors_from_detail(company_id, company_detail)
 
+    def _risk_factors_from_detail(
+        self, company_id: str, company_detail: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Sestaví data o rizikových faktorech z detailu společnosti.
+
+        Args:
+            company_id: ID společnosti
+            company_detail: Detail společnosti z indexu
+
+        Returns:
+            Dict[str, Any]: Data o rizikových faktorech (kopie, index se nemění)
+        """
         # Kontrola, zda máme sekci "risk" v detailu společnosti
         if "risk" in company_detail:
             risk_section = company_detail.get("risk", {})
 
-            # Zkopírujeme celou sekci rizik
-            risk_data = risk_section
+            # Zkopírujeme celou sekci rizik, data v indexu zůstávají beze změny
+            risk_data = dict(risk_section)
 
             # Přidáme ID a název společnosti pro lepší kontext
             risk_data["company_id"] = company_id
@@ -863,68 +1332,702 @@ class MockMCPConnector:
                 "risk_score": None,
             }
 
+    def iter_company_relationships(
+        self,
+        company_id: str,
+        relationship_type: Optional[str] = None,
+        direction: str = "both",
+        limit: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Postupně vrací vztahy společnosti streamovaným čtením souborů vztahů.
+
+        Na rozdíl od get_company_relationships nesestavuje index a nenačítá
+        soubory celé, takže paměť zůstává omezená i u exportů o stovkách MB.
+        Prochází relationships_*.json, a pokud v nich nic nenajde, obecný
+        relationships.json. Podporuje oba formáty vztahů (source/target
+        i from_id/to_id).
+
+        Args:
+            company_id: ID společnosti
+            relationship_type: Volitelný filtr typu vztahu (např. "has_supplier")
+            direction: "outgoing", "incoming" nebo "both" (výchozí)
+            limit: Maximální počet vrácených vztahů (None = bez omezení)
+
+        Returns:
+            Iterator[Dict[str, Any]]: Generátor vztahů společnosti
+
+        Raises:
+            ValueError: Pokud směr není podporován
+        """
+        if direction not in EDGE_DIRECTIONS:
+            raise ValueError(
+                f"Nepodporovaný směr vztahů '{direction}', povolené: {EDGE_DIRECTIONS}"
+            )
+        if is_sharded(self.data_path):
+            # Vztahy entit shardovaného adresáře jsou jen ve sloupcovém úložišti
+            relationships = self._relationships_from_index(
+                self._get_index(), company_id, relationship_type, direction
+            )
+            return iter(relationships[:limit])
+        file_groups = [
+            sorted(glob.glob(os.path.join(self.data_path, "relationships_*.json"))),
+            sorted(glob.glob(os.path.join(self.data_path, "relationships.json"))),
+        ]
+        return self._iter_relationships(
+            file_groups, company_id, relationship_type, direction, limit
+        )
+
+    def _iter_relationships(
+        self,
+        file_groups: List[List[str]],
+        company_id: str,
+        relationship_type: Optional[str],
+        direction: str,
+        limit: Optional[int],
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Generátor pro iter_company_relationships.
+
+        Vztahy se vrací v kanonickém tvaru (normalize_relationship). Tentýž
+        vztah může být v souboru v poli "data" i "relationships". S limitem
+        se každá shoda vrátí hned po přečtení a opakování stejného vztahu se
+        vynechá, takže čtení skončí po dosažení limitu. Bez limitu se shody
+        jednoho souboru sloučí jako v indexu a vrátí až po jeho dočtení;
+        paměť je omezena počtem vztahů společnosti v jednom souboru.
+        """
+        seen = set()
+        count = 0
+        for file_paths in file_groups:
+            for file_path in file_paths:
+                matches: Dict[Any, Dict[str, Any]] = {}
+                for relationship in iter_json_records(
+                    file_path, RELATIONSHIP_ARRAY_KEYS, all_arrays=True
+                ):
+                    if (
+                        relationship_type is not None
+                        and relationship.get("type") != relationship_type
+                    ):
+                        continue
+                    source_id, target_id = relationship_endpoints(relationship)
+                    if not (
+                        (direction != "incoming" and source_id == company_id)
+                        or (direction != "outgoing" and target_id == company_id)
+                    ):
+                        continue
+
+                    key = relationship_key(relationship)
+                    normalized = normalize_relationship(relationship)
+                    if limit is not None:
+                        # Vztahy bez ID se neslučují, stejně jako v indexu
+                        if key is not None:
+                            if key in seen:
+                                continue
+                            seen.add(key)
+                        count += 1
+                        yield normalized
+                        if count >= limit:
+                            return
+                        continue
+
+                    key = key or len(matches)
+                    if key in matches:
+                        normalized = merge_relationships(matches[key], normalized)
+                    matches[key] = normalized
+
+                for key, relationship in matches.items():
+                    if isinstance(key, tuple):
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                    count += 1
+                    yield relationship
+            # Obecný soubor je jen záložní zdroj, stejně jako v indexu
+            if count:
+                return
+
+    def iter_search_results(
+        self,
+        name: Optional[str] = None,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        limit: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Postupně vrací výsledky z entity_search.json streamovaným čtením.
+
+        Args:
+            name: Volitelný filtr podle podobnosti názvu (pole "label")
+            threshold: Minimální podobnost názvů (0-1)
+            limit: Maximální počet vrácených výsledků (None = bez omezení)
+
+        Yields:
+            Dict[str, Any]: Výsledky vyhledávání
+        """
+        file_path = os.path.join(self.data_path, "entity_search.json")
+        if not os.path.exists(file_path):
+            return
+        found = 0
+        for company in iter_json_records(file_path, ("data", "results")):
+            if name and not self._fuzzy_name_match(
+                name, company.get("label", ""), threshold
+            ):
+                continue
+            yield company
+            found += 1
+            if limit is not None and found >= limit:
+                return
+
+    def iter_entity_details(
+        self, limit: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Postupně vrací detaily entit z hromadného exportu entity_detail.json.
+
+        Args:
+            limit: Maximální počet vrácených detailů (None = bez omezení)
+
+        Yields:
+            Dict[str, Any]: Detaily entit
+        """
+        file_path = os.path.join(self.data_path, "entity_detail.json")
+        if not os.path.exists(file_path):
+            return
+        for position, detail in enumerate(iter_json_records(file_path)):
+            if limit is not None and position >= limit:
+                return
+            yield detail
+
+    def _resolve_many(
+        self,
+        company_ids: Iterable[str],
+        lookup: Callable[[DataIndex, str], Any],
+    ) -> BatchResult:
+        """
+        Vyřeší dávku ID jedním průchodem nad indexem.
+
+        Duplicitní ID se zpracují jednou. ID, pro které lookup vrátí None
+        nebo prázdný seznam, se uvedou v BatchResult.missing.
+
+        Args:
+            company_ids: ID společností
+            lookup: Funkce (index, ID) -> data nebo None
+
+        Returns:
+            BatchResult: Nalezená data podle ID a seznam chybějících ID
+        """
+        index = self._get_index()
+        result = BatchResult()
+        for company_id in dict.fromkeys(company_ids):
+            value = lookup(index, company_id)
+            if value is None or value == []:
+                result.missing.append(company_id)
+            else:
+                result.found[company_id] = value
+
+        logger.info(
+            f"Dávkový dotaz: nalezeno {len(result.found)}, "
+            f"chybí {len(result.missing)} společností"
+        )
+        return result
+
+    def get_companies_by_ids(self, company_ids: Iterable[str]) -> BatchResult:
+        """
+        Najde více společností podle ID najednou.
+
+        Args:
+            company_ids: ID společností
+
+        Returns:
+            BatchResult: Detaily společností podle ID a seznam nenalezených ID
+        """
+        return self._resolve_many(
+            company_ids, lambda index, company_id: index.get_entity(company_id)
+        )
+
+    def get_financials_for_many(self, company_ids: Iterable[str]) -> BatchResult:
+        """
+        Získá finanční data více společností najednou.
+
+        Args:
+            company_ids: ID společností
+
+        Returns:
+            BatchResult: Finanční data podle ID a seznam ID bez finančních dat
+        """
+        return self._resolve_many(company_ids, self._financials_from_index)
+
+    def get_relationships_for_many(
+        self,
+        company_ids: Iterable[str],
+        relationship_type: Optional[str] = None,
+        direction: str = "both",
+    ) -> BatchResult:
+        """
+        Získá vztahy více společností najednou.
+
+        Args:
+            company_ids: ID společností
+            relationship_type: Volitelný filtr typu vztahu (např. "has_supplier")
+            direction: "outgoing", "incoming" nebo "both" (výchozí)
+
+        Returns:
+            BatchResult: Vztahy podle ID a seznam ID bez vztahů
+
+        Raises:
+            ValueError: Pokud směr není podporován
+        """
+        if direction not in EDGE_DIRECTIONS:
+            raise ValueError(
+                f"Nepodporovaný směr vztahů '{direction}', povolené: {EDGE_DIRECTIONS}"
+            )
+        return self._resolve_many(
+            company_ids,
+            lambda index, company_id: self._relationships_from_index(
+                index, company_id, relationship_type, direction
+            ),
+        )
+
+    def get_supply_chain_for_many(self, company_ids: Iterable[str]) -> BatchResult:
+        """
+        Získá data o dodavatelském řetězci více společností najednou.
+
+        Args:
+            company_ids: ID společností
+
+        Returns:
+            BatchResult: Položky dodavatelského řetězce podle ID a seznam ID bez dat
+        """
+        return self._resolve_many(
+            company_ids,
+            lambda index, company_id: list(
+                index.supply_chain_items.get(company_id, [])
+            ),
+        )
+
+    def get_risk_factors_for_many(self, company_ids: Iterable[str]) -> BatchResult:
+        """
+        Získá data o rizikových faktorech více společností najednou.
+
+        Args:
+            company_ids: ID společností
+
+        Returns:
+            BatchResult: Data o rizikových faktorech podle ID a seznam nenalezených ID
+        """
+
+        def lookup(index: DataIndex, company_id: str) -> Optional[Dict[str, Any]]:
+            company_detail = index.get_entity(company_id)
+            if company_detail is None:
+                return None
+            return self._risk_factors_from_detail(company_id, company_detail)
+
+        return self._resolve_many(company_ids, lookup)
+
+
+def _parse_json_documents(raw_documents: Dict[str, bytes]) -> Dict[str, Any]:
+    """
+    Parsuje dávku přečtených JSON souborů.
+
+    Chyba parsování se neuvede výjimkou, ale uloží se místo dokumentu,
+    aby jeden poškozený soubor nezastavil zpracování ostatních.
+
+    Args:
+        raw_documents: Cesta k souboru -> obsah souboru
+
+    Returns:
+        Dict[str, Any]: Cesta k souboru -> read-only dokument nebo DataFormatError
+    """
+    documents: Dict[str, Any] = {}
+    for file_path, raw in raw_documents.items():
+        try:
+            documents[file_path] = freeze(json.loads(raw))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            documents[file_path] = DataFormatError(
+                f"Soubor {file_path} není validní JSON"
+            )
+    return documents
+
 
 class AsyncMockMCPConnector:
     """
-    Asynchronní wrapper pro MockMCPConnector, který provádí I/O operace v thread poolu
-    pro zamezení blokování event loop v LangGraph Platform.
+    Nativně asynchronní konektor k mock datům pro LangGraph Platform.
+
+    Soubory se čtou neblokujícím způsobem přes aiofiles s omezeným počtem
+    současně otevřených souborů. CPU náročné parsování JSON a sestavení
+    indexu proběhne v jednom volání asyncio.to_thread pro celý datový
+    adresář; dotazy se pak obsluhují přímo z indexu v paměti bez přepínání
+    do vláken.
     """
 
-    def __init__(self, data_path: Optional[str] = None):
+    # Výchozí limit současně otevřených souborů
+    MAX_OPEN_FILES: ClassVar[int] = int(
+        os.environ.get("MOCK_DATA_MAX_OPEN_FILES", "32")
+    )
+
+    def __init__(
+        self,
+        data_path: Optional[str] = None,
+        snapshot_path: Optional[str] = None,
+        max_open_files: Optional[int] = None,
+        sync_connector: Optional[MockMCPConnector] = None,
+    ):
         """
         Inicializuje AsyncMockMCPConnector.
 
         Args:
             data_path: Volitelná cesta k mock datům.
+            snapshot_path: Volitelná cesta ke kompilovanému snapshotu dat.
+            max_open_files: Maximální počet současně otevřených souborů.
+            sync_connector: Volitelný existující synchronní konektor, jehož
+                       index se má sdílet (data_path a snapshot_path se pak
+                       ignorují).
+        """
+        self._sync_connector = sync_connector or MockMCPConnector(
+            data_path, snapshot_path
+        )
+        self.data_path = self._sync_connector.data_path
+        self.max_open_files = max_open_files or self.MAX_OPEN_FILES
+        # Semafor souborů a zámek sestavení pro každý event loop zvlášť
+        self._loop_primitives: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._primitives_lock = threading.Lock()
+        # Sestavení indexu proběhne jednou napříč všemi loopy
+        self._build_lock = threading.Lock()
+
+    def _primitives(self) -> Tuple[asyncio.Semaphore, asyncio.Lock]:
+        """
+        Vrátí semafor souborů a zámek sestavení pro aktuální event loop.
+
+        Asyncio primitiva jsou vázaná na event loop a konektor se může
+        používat z více loopů současně (loop serveru a loop v pozadí
+        z async_runner), proto má každý loop vlastní.
+        """
+        loop = asyncio.get_running_loop()
+        primitives = self._loop_primitives.get(loop)
+        if primitives is None:
+            with self._primitives_lock:
+                primitives = self._loop_primitives.get(loop)
+                if primitives is None:
+                    primitives = (
+                        asyncio.Semaphore(self.max_open_files),
+                        asyncio.Lock(),
+                    )
+                    self._loop_primitives[loop] = primitives
+        return primitives
+
+    async def _acquire_build_lock(self) -> None:
+        """Získá zámek sestavení indexu bez blokování event loop."""
+        acquire = asyncio.ensure_future(asyncio.to_thread(self._build_lock.acquire))
+        try:
+            await asyncio.shield(acquire)
+        except asyncio.CancelledError:
+            # Vlákno zámek získá i po zrušení čekání, pak se musí uvolnit
+            acquire.add_done_callback(
+                lambda done: (
+                    self._build_lock.release()
+                    if not done.cancelled() and done.exception() is None
+                    else None
+                )
+            )
+            raise
+
+    async def _read_file(self, file_path: str) -> bytes:
+        """Přečte soubor bez blokování event loop při dodržení limitu souborů."""
+        file_semaphore, _ = self._primitives()
+        async with file_semaphore:
+            async with aiofiles.open(file_path, "rb") as file:
+                return await file.read()
+
+    async def _read_files(self, file_paths: List[str]) -> Dict[str, bytes]:
+        """
+        Přečte soubory souběžně; nečitelné soubory se vynechají s varováním.
+
+        Args:
+            file_paths: Cesty k souborům
+
+        Returns:
+            Dict[str, bytes]: Cesta k souboru -> obsah souboru
+        """
+        contents = await asyncio.gather(
+            *(self._read_file(file_path) for file_path in file_paths),
+            return_exceptions=True,
+        )
+        raw_documents: Dict[str, bytes] = {}
+        for file_path, content in zip(file_paths, contents):
+            if isinstance(content, BaseException):
+                logger.warning(f"Nelze načíst soubor {file_path}: {str(content)}")
+                continue
+            raw_documents[file_path] = content
+        return raw_documents
+
+    async def _build_index(self) -> DataIndex:
         """
-        self._sync_connector = MockMCPConnector(data_path)
+        Sestaví index ze shardů, snapshotu nebo z JSON souborů datového adresáře.
 
-    async def get_company_by_name(self, name: str) -> Dict[str, Any]:
+        Returns:
+            DataIndex: Index nad adresářem self.data_path
+        """
+        index = await asyncio.to_thread(self._sync_connector._load_prebuilt_index)
+        if index is not None:
+            return index
+
+        file_paths = sorted(glob.glob(os.path.join(self.data_path, "*.json")))
+        raw_documents = await self._read_files(file_paths)
+
+        def parse_and_build() -> DataIndex:
+            documents = _parse_json_documents(raw_documents)
+
+            def load_json(file_path: str) -> Any:
+                document = documents.get(file_path)
+                if document is None:
+                    raise ConnectionError(f"Soubor {file_path} nebyl nalezen")
+                if isinstance(document, DataFormatError):
+                    raise document
+                return document
+
+            return DataIndex.build(self.data_path, load_json)
+
+        # Parsování celého adresáře je jediné volání do thread poolu
+        return await asyncio.to_thread(parse_and_build)
+
+    async def _get_index(self) -> DataIndex:
+        """
+        Vrátí index mock dat, při prvním použití jej asynchronně sestaví.
+
+        Index je sdílený s vnitřním synchronním konektorem, takže se sestaví
+        pouze jednou i při souběžných dotazech z více event loopů: úlohy
+        jednoho loopu čekají na zámek loopu, loopy mezi sebou na zámek
+        vláken.
+
+        Returns:
+            DataIndex: Index nad adresářem self.data_path
+        """
+        index = self._sync_connector._index
+        if index is not None:
+            return index
+        _, index_lock = self._primitives()
+        async with index_lock:
+            if self._sync_connector._index is None:
+                await self._acquire_build_lock()
+                try:
+                    if self._sync_connector._index is None:
+                        self._sync_connector._set_index(await self._build_index())
+                finally:
+                    self._build_lock.release()
+        return self._sync_connector._index
+
+    async def warm(self) -> None:
+        """Předem asynchronně sestaví index."""
+        await self._get_index()
+
+    def close(self) -> None:
+        """Uvolní index sdílený s vnitřním synchronním konektorem."""
+        self._sync_connector.close()
+
+    @property
+    def generation(self) -> int:
+        """Generace indexu sdíleného s vnitřním synchronním konektorem."""
+        return self._sync_connector.generation
+
+    async def index_identity(self) -> Tuple[str, int]:
+        """Asynchronní verze index_identity."""
+        await self._get_index()
+        return self._sync_connector.index_identity()
+
+    @property
+    def last_reload(self) -> Optional[ReloadResult]:
+        """Výsledek posledního obnovení indexu."""
+        return self._sync_connector.last_reload
+
+    async def reload(self) -> ReloadResult:
+        """Asynchronní verze reload(); obnovení proběhne v thread poolu."""
+        await self._get_index()
+        return await asyncio.to_thread(self._sync_connector.reload)
+
+    async def get_company_by_name(
+        self, name: str, threshold: float = DEFAULT_SIMILARITY_THRESHOLD
+    ) -> Dict[str, Any]:
         """Asynchronní verze get_company_by_name."""
-        return await asyncio.to_thread(self._sync_connector.get_company_by_name, name)
+        await self._get_index()
+        return self._sync_connector.get_company_by_name(name, threshold)
+
+    async def find_companies_by_name(
+        self,
+        name: str,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        limit: Optional[int] = 10,
+    ) -> List[Dict[str, Any]]:
+        """Asynchronní verze find_companies_by_name."""
+        await self._get_index()
+        return self._sync_connector.find_companies_by_name(name, threshold, limit)
+
+    async def find_company_mentions(self, text: str) -> List[Dict[str, Any]]:
+        """Asynchronní verze find_company_mentions."""
+        await self._get_index()
+        return self._sync_connector.find_company_mentions(text)
 
     async def get_company_by_id(self, company_id: str) -> Dict[str, Any]:
         """Asynchronní verze get_company_by_id."""
-        return await asyncio.to_thread(
-            self._sync_connector.get_company_by_id, company_id
-        )
+        await self._get_index()
+        return self._sync_connector.get_company_by_id(company_id)
+
+    async def get_company_by_identifier(
+        self, identifier_type: str, value: str
+    ) -> Dict[str, Any]:
+        """Asynchronní verze get_company_by_identifier."""
+        await self._get_index()
+        return self._sync_connector.get_company_by_identifier(identifier_type, value)
 
     async def search_companies(
-        self, params: CompanyQueryParams
-    ) -> List[Dict[str, Any]]:
+        self,
+        params: CompanyQueryParams,
+        limit: int = DEFAULT_PAGE_LIMIT,
+        cursor: Optional[str] = None,
+    ) -> SearchPage:
         """Asynchronní verze search_companies."""
-        return await asyncio.to_thread(self._sync_connector.search_companies, params)
+        await self._get_index()
+        return self._sync_connector.search_companies(params, limit, cursor)
 
     async def get_company_financials(self, company_id: str) -> Dict[str, Any]:
         """Asynchronní verze get_company_financials."""
-        return await asyncio.to_thread(
-            self._sync_connector.get_company_financials, company_id
-        )
-
-    async def get_company_relationships(self, company_id: str) -> List[Dict[str, Any]]:
+        await self._get_index()
+        return self._sync_connector.get_company_financials(company_id)
+
+    async def get_company_relationships(
+        self,
+        company_id: str,
+        relationship_type: Optional[str] = None,
+        direction: str = "both",
+    ) -> List[Dict[str, Any]]:
         """Asynchronní verze get_company_relationships."""
-        return await asyncio.to_thread(
-            self._sync_connector.get_company_relationships, company_id
+        await self._get_index()
+        return self._sync_connector.get_company_relationships(
+            company_id, relationship_type, direction
         )
 
     async def get_company_search_data(self, company_id: str) -> Dict[str, Any]:
         """Asynchronní verze get_company_search_data."""
-        return await asyncio.to_thread(
-            self._sync_connector.get_company_search_data, company_id
-        )
+        await self._get_index()
+        return self._sync_connector.get_company_search_data(company_id)
 
     async def get_supply_chain_data(self, company_id: str) -> List[Dict[str, Any]]:
         """Asynchronní verze get_supply_chain_data."""
-        return await asyncio.to_thread(
-            self._sync_connector.get_supply_chain_data, company_id
+        await self._get_index()
+        return self._sync_connector.get_supply_chain_data(company_id)
+
+    async def get_supply_chain_graph(
+        self, company_id: str, max_depth: int = DEFAULT_MAX_DEPTH
+    ) -> Dict[str, Any]:
+        """Asynchronní verze get_supply_chain_graph."""
+        await self._get_index()
+        return self._sync_connector.get_supply_chain_graph(company_id, max_depth)
+
+    async def get_risk_exposure(
+        self,
+        company_ids: Union[str, Iterable[str], None] = None,
+        decay: Union[float, Sequence[float]] = DEFAULT_DECAY,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        paths_per_entity: Optional[int] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Asynchronní verze get_risk_exposure."""
+        await self._get_index()
+        return self._sync_connector.get_risk_exposure(
+            company_ids, decay, max_depth, paths_per_entity
+        )
+
+    async def find_alternative_suppliers(
+        self, entity_id: str, hs_prefix: Optional[str] = None, limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Asynchronní verze find_alternative_suppliers."""
+        await self._get_index()
+        return self._sync_connector.find_alternative_suppliers(
+            entity_id, hs_prefix, limit
+        )
+
+    async def get_supplier_dependencies(self, company_id: str) -> Dict[str, Any]:
+        """Asynchronní verze get_supplier_dependencies."""
+        await self._get_index()
+        return self._sync_connector.get_supplier_dependencies(company_id)
+
+    async def find_paths(
+        self,
+        source_id: str,
+        target_id: str,
+        max_hops: int = DEFAULT_MAX_HOPS,
+        relationship_types: Optional[Iterable[str]] = None,
+        k: int = DEFAULT_PATH_COUNT,
+    ) -> List[Dict[str, Any]]:
+        """Asynchronní verze find_paths."""
+        await self._get_index()
+        return self._sync_connector.find_paths(
+            source_id, target_id, max_hops, relationship_types, k
         )
 
     async def get_risk_factors_data(self, company_id: str) -> Dict[str, Any]:
         """Asynchronní verze get_risk_factors_data."""
-        return await asyncio.to_thread(
-            self._sync_connector.get_risk_factors_data, company_id
+        await self._get_index()
+        return self._sync_connector.get_risk_factors_data(company_id)
+
+    async def get_companies_by_ids(self, company_ids: Iterable[str]) -> BatchResult:
+        """Asynchronní verze get_companies_by_ids."""
+        await self._get_index()
+        return self._sync_connector.get_companies_by_ids(company_ids)
+
+    async def get_financials_for_many(self, company_ids: Iterable[str]) -> BatchResult:
+        """Asynchronní verze get_financials_for_many."""
+        await self._get_index()
+        return self._sync_connector.get_financials_for_many(company_ids)
+
+    async def get_relationships_for_many(
+        self,
+        company_ids: Iterable[str],
+        relationship_type: Optional[str] = None,
+        direction: str = "both",
+    ) -> BatchResult:
+        """Asynchronní verze get_relationships_for_many."""
+        await self._get_index()
+        return self._sync_connector.get_relationships_for_many(
+            company_ids, relationship_type, direction
         )
 
+    async def get_supply_chain_for_many(
+        self, company_ids: Iterable[str]
+    ) -> BatchResult:
+        """Asynchronní verze get_supply_chain_for_many."""
+        await self._get_index()
+        return self._sync_connector.get_supply_chain_for_many(company_ids)
+
+    async def get_risk_factors_for_many(
+        self, company_ids: Iterable[str]
+    ) -> BatchResult:
+        """Asynchronní verze get_risk_factors_for_many."""
+        await self._get_index()
+        return self._sync_connector.get_risk_factors_for_many(company_ids)
+
     async def read_resource(self, company_name: str) -> Dict[str, Any]:
-        """Asynchronní verze read_resource."""
-        return await asyncio.to_thread(self._sync_connector.read_resource, company_name)
+        """
+        Asynchronní verze read_resource.
+
+        Raises:
+            DataFormatError: Pokud soubor není validní JSON
+            ConnectionError: Pokud soubor nelze načíst
+        """
+        file_path = os.path.join(self.data_path, f"{company_name}.json")
+        if not os.path.exists(file_path) and is_sharded(self.data_path):
+            await self._get_index()
+            return self._sync_connector.read_resource(company_name)
+        try:
+            raw = await self._read_file(file_path)
+        except FileNotFoundError:
+            logger.error(f"Soubor nenalezen: {file_path}")
+            raise ConnectionError(f"Soubor {file_path} nebyl nalezen")
+        except OSError as e:
+            logger.error(f"Chyba při čtení souboru {file_path}: {str(e)}")
+            raise ConnectionError(f"Nelze načíst soubor {file_path}: {str(e)}")
+
+        document = (await asyncio.to_thread(_parse_json_documents, {file_path: raw}))[
+            file_path
+        ]
+        if isinstance(document, DataFormatError):
+            logger.error(f"Chyba při parsování JSON souboru: {file_path}")
+            raise document
+        return document
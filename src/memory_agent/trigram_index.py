@@ -0,0 +1,179 @@
+"""
+Trigramový invertovaný index pro fuzzy vyhledávání názvů společností.
+
+Názvy se indexují v normalizované podobě (viz data_index.normalize_name).
+Podobnost dvou názvů je koeficient překryvu trigramů
+
+    |A ∩ B| / min(|A|, |B|)
+
+takže název, který je celými slovy obsažen v jiném názvu (např. "MB TOOL"
+v "MB TOOL s.r.o."), má podobnost 1.0. Při shodném skóre rozhoduje Diceův
+koeficient, který upřednostní názvy podobné délky.
+
+Kandidáti se generují z posting listů seřazených podle velikosti názvu
+(prefix filtering): vzácné trigramy dotazu se prochází celé, u častých
+trigramů stačí krátké názvy, které by jinak práh podobnosti nesplnily.
+Cena dotazu tak nezávisí lineárně na počtu indexovaných názvů.
+"""
+
+import bisect
+import heapq
+import math
+import sys
+import threading
+from typing import Dict, FrozenSet, List, Tuple
+
+# Výchozí práh podobnosti odpovídá původnímu chování _fuzzy_name_match
+DEFAULT_SIMILARITY_THRESHOLD = 0.8
+
+
+def trigrams(normalized: str) -> FrozenSet[str]:
+    """
+    Vrátí množinu trigramů normalizovaného textu ohraničeného mezerami.
+
+    Args:
+        normalized: Normalizovaný text (malá písmena, slova oddělená mezerou)
+
+    Returns:
+        FrozenSet[str]: Trigramy textu
+    """
+    if not normalized:
+        return frozenset()
+    padded = f" {normalized} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def similarity(left: FrozenSet[str], right: FrozenSet[str]) -> float:
+    """
+    Spočítá koeficient překryvu dvou množin trigramů.
+
+    Args:
+        left: Trigramy prvního textu
+        right: Trigramy druhého textu
+
+    Returns:
+        float: Podobnost v intervalu 0-1
+    """
+    if not left or not right:
+        return 0.0
+    return len(left & right) / min(len(left), len(right))
+
+
+class TrigramIndex:
+    """
+    Invertovaný index trigramů nad množinou normalizovaných názvů.
+
+    Každý název se uloží jednou a dostane pořadové číslo; posting list
+    trigramu obsahuje dvojice (počet trigramů názvu, číslo názvu) seřazené
+    podle velikosti názvu.
+    """
+
+    def __init__(self):
+        """Inicializuje prázdný index."""
+        self.names: List[str] = []
+        self._grams: List[FrozenSet[str]] = []
+        self._numbers: Dict[str, int] = {}
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._sorted = True
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Vrátí počet indexovaných názvů."""
+        return len(self.names)
+
+    def add(self, name: str) -> None:
+        """
+        Přidá normalizovaný název do indexu (duplicitní názvy se ignorují).
+
+        Args:
+            name: Normalizovaný název
+        """
+        grams = trigrams(name)
+        if not grams or name in self._numbers:
+            return
+
+        number = len(self.names)
+        self.names.append(name)
+        self._grams.append(grams)
+        self._numbers[name] = number
+        entry = (len(grams), number)
+        for gram in grams:
+            postings = self._postings.setdefault(gram, [])
+            if self._sorted:
+                bisect.insort(postings, entry)
+            else:
+                postings.append(entry)
+
+    def bulk_add(self, names) -> None:
+        """
+        Přidá více názvů najednou; posting listy se seřadí až na konci.
+
+        Args:
+            names: Iterovatelné normalizované názvy
+        """
+        with self._lock:
+            self._sorted = False
+            for name in names:
+                self.add(name)
+            for postings in self._postings.values():
+                postings.sort()
+            self._sorted = True
+
+    def search(
+        self,
+        query: str,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        limit: int = 10,
+    ) -> List[Tuple[str, float]]:
+        """
+        Najde názvy podobné dotazu seřazené podle podobnosti.
+
+        Args:
+            query: Normalizovaný dotaz
+            threshold: Minimální podobnost (0-1) pro zařazení do výsledku
+            limit: Maximální počet výsledků (None = všechny nad prahem)
+
+        Returns:
+            List[Tuple[str, float]]: Dvojice (název, podobnost) od nejpodobnějšího
+        """
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        threshold = max(threshold, sys.float_info.epsilon)
+        query_size = len(query_grams)
+
+        # Vzácné trigramy dotazu se prochází první
+        ranked_grams = sorted(
+            (gram for gram in query_grams if gram in self._postings),
+            key=lambda gram: len(self._postings[gram]),
+        )
+
+        candidates = set()
+        for rank, gram in enumerate(ranked_grams):
+            # Název se shodou alespoň na tomto trigramu musí mít překryv
+            # ceil(threshold * min(|Q|, |L|)) <= |Q| - rank, jinak by ho
+            # zachytil některý ze vzácnějších trigramů
+            remaining = query_size - rank
+            if threshold * query_size <= remaining:
+                max_size = sys.maxsize
+            else:
+                max_size = math.floor(remaining / threshold)
+                if max_size < 1:
+                    break
+            postings = self._postings[gram]
+            end = bisect.bisect_right(postings, (max_size, sys.maxsize))
+            candidates.update(number for _, number in postings[:end])
+
+        scored = []
+        for number in candidates:
+            grams = self._grams[number]
+            common = len(query_grams & grams)
+            score = common / min(query_size, len(grams))
+            if score >= threshold:
+                dice = 2 * common / (query_size + len(grams))
+                scored.append((score, dice, -number))
+
+        best = (
+            heapq.nlargest(limit, scored) if limit is not None else sorted(scored)[::-1]
+        )
+        return [(self.names[-number], score) for score, _, number in best]
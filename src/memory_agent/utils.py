@@ -8,6 +8,7 @@ a dalšími komponentami Memory Agenta.
 from datetime import datetime
 from typing import Any, Dict, Tuple, Union
 
+from memory_agent.connector_registry import get_connector_registry
 from memory_agent.schema import MockMCPConnectorConfig
 from memory_agent.tools import MockMCPConnector
 
@@ -44,17 +45,17 @@ def create_mcp_connector_from_config(
     config_dict: Union[Dict[str, Any], MockMCPConnectorConfig],
 ) -> MockMCPConnector:
     """
-    Vytvoří instanci MockMCPConnector z konfiguračního objektu.
+    Vrátí sdílenou instanci MockMCPConnector pro konfiguraci z registru.
 
     Args:
         config_dict: Konfigurační slovník nebo instance MockMCPConnectorConfig
 
     Returns:
-        Instance MockMCPConnector
+        Sdílená instance MockMCPConnector
     """
     if isinstance(config_dict, dict):
         config = MockMCPConnectorConfig(**config_dict)
     else:
         config = config_dict
 
-    return MockMCPConnector(data_path=config.data_path)
+    return get_connector_registry().get(data_path=config.data_path)
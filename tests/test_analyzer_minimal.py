@@ -1,6 +1,8 @@
 # tests/test_analyzer_minimal.py - NOVÝ TEST
 """Test minimální funkcionality pro LangGraph deployment."""
 
+import asyncio
+import json
 import os
 import sys
 
@@ -9,7 +11,12 @@ sys.path.insert(
     0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
 )
 
-from memory_agent.analyzer import analyze_company_query
+from memory_agent.analyzer import (
+    analyze_companies_async,
+    analyze_company_query,
+    detect_analysis_type,
+    rank_analysis_types,
+)
 
 
 def test_company_extraction_simple():
@@ -24,3 +31,67 @@ def test_company_extraction_simple():
         company, analysis_type = analyze_company_query(input_text)
         assert company == expected
         assert analysis_type == "general"
+
+
+def test_company_extraction_returns_canonical_name():
+    """Malá písmena a chybějící diakritika vedou na kanonický název entity."""
+    assert analyze_company_query("flidr plast") == ("Flídr plast", "general")
+    assert analyze_company_query("Tell me about mb tool risk") == (
+        "MB TOOL",
+        "risk_comparison",
+    )
+    assert analyze_company_query("adis tachov")[0] == "ADIS TACHOV"
+
+
+def test_analysis_type_ranking():
+    """Typy analýzy se řadí podle vážených klíčových slov bez ohledu na diakritiku."""
+    assert rank_analysis_types("Jaká jsou RIZIKA?")[0][0] == "risk_comparison"
+    assert detect_analysis_type("dodavatelský řetězec a nakup") == "supplier_analysis"
+    # Při shodě má riziko přednost, více dodavatelských slov ale převáží
+    assert detect_analysis_type("supplier risk") == "risk_comparison"
+    assert detect_analysis_type("supplier tier risk") == "supplier_analysis"
+    # "supply chain" je jedno klíčové slovo, ne dvě
+    assert detect_analysis_type("supply chain risk of MB Tool") == "risk_comparison"
+    assert detect_analysis_type("risk of supply chain disruption") == (
+        "risk_comparison"
+    )
+    assert detect_analysis_type("MB TOOL; supplier_analysis") == "supplier_analysis"
+    assert rank_analysis_types("Tell me about MB TOOL") == []
+
+
+async def _collect(queries, max_concurrency=4):
+    return [item async for item in analyze_companies_async(queries, max_concurrency)]
+
+
+def test_analyze_companies_async_streams_all_queries():
+    """Dávková analýza vrátí výsledek pro každý dotaz a sdílí načtení entity."""
+    queries = [
+        "MB TOOL",
+        "Jaká jsou rizika MB TOOL?",
+        "Tell me about ADIS TACHOV",
+        "Tell me about the weather today",
+    ]
+
+    results = dict(asyncio.run(_collect(queries, 2)))
+
+    assert sorted(results) == [0, 1, 2, 3]
+    assert results[0].company_data["id"] == "entity_1001"
+    assert results[1].company_data is results[0].company_data
+    assert results[1].analysis_type == "risk_comparison"
+    assert results[2].company_name == "ADIS TACHOV"
+    assert results[3].analysis_complete is False
+    assert "company_data" not in json.loads(results[3].to_json())
+
+
+def test_company_analysis_encodes_prompt_only_on_request():
+    """Kompaktní JSON obsahuje prompt a formátovaná data jen na vyžádání."""
+    (_, result), *_ = asyncio.run(_collect(["Tell me about MB TOOL"]))
+
+    compact = json.loads(result.to_json())
+    full = json.loads(result.to_json(include_prompt=True))
+
+    assert compact["company_data"]["id"] == "entity_1001"
+    assert "analysis_prompt" not in compact and "formatted_data" not in compact
+    assert "MB TOOL" in full["analysis_prompt"]
+    assert full["formatted_data"] == result.formatted_data()
+    assert "\n" not in result.to_json() and "Třebařov" in result.to_json()
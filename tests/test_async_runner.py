@@ -0,0 +1,117 @@
+"""Testy event loopu v pozadí pro volání korutin ze synchronního kódu."""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+import pytest
+
+# Přidání src do pythonpath pro import
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+)
+
+from memory_agent.analyzer import analyze_company
+from memory_agent.async_runner import BackgroundLoopRunner, remaining_time
+from memory_agent.tools import AsyncMockMCPConnector
+
+MOCK_DATA_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mock_data_2"
+)
+
+
+def test_run_propagates_deadline_and_cancels_on_timeout():
+    """Korutina vidí termín volání a po jeho vypršení se zruší."""
+    runner = BackgroundLoopRunner()
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def nested():
+        # Vnořené volání nepřekročí termín vnějšího volání
+        return remaining_time(), await asyncio.to_thread(
+            runner.submit(asyncio.sleep(0, "hotovo"), timeout=60).result
+        )
+
+    try:
+        assert runner.run(asyncio.sleep(0, "ok")) == "ok"
+        remaining, result = runner.run(nested(), timeout=5)
+        assert 0 < remaining <= 5
+        assert result == "hotovo"
+
+        start = time.monotonic()
+        with pytest.raises(TimeoutError):
+            runner.run(slow(), timeout=0.05)
+        assert time.monotonic() - start < 2
+        assert cancelled == [True]
+    finally:
+        runner.close(timeout=5)
+
+
+def test_run_from_running_loop_and_own_loop_thread():
+    """Volání z vlákna s běžícím loopem funguje, z vlastního loopu se odmítne."""
+    runner = BackgroundLoopRunner()
+
+    async def inside_runner():
+        coro = asyncio.sleep(0)
+        with pytest.raises(RuntimeError):
+            runner.run(coro)
+        return "odmítnuto"
+
+    async def caller():
+        return runner.run(asyncio.sleep(0.01, "z loopu"), timeout=5)
+
+    try:
+        assert asyncio.run(caller()) == "z loopu"
+        assert runner.run(inside_runner(), timeout=5) == "odmítnuto"
+    finally:
+        runner.close(timeout=5)
+
+
+def test_analyze_company_inside_running_loop_uses_async_path():
+    """Synchronní nástroj volaný z běžícího loopu nečeká na vypršení limitu."""
+
+    async def caller():
+        return analyze_company("Tell me about MB TOOL")
+
+    start = time.monotonic()
+    result = json.loads(asyncio.run(caller()))
+
+    assert time.monotonic() - start < 10
+    assert result["analysis_complete"] is True
+    assert result["company_data"]["id"] == "entity_1001"
+
+
+def test_async_connector_builds_index_once_across_loops():
+    """Souběžné _get_index z loopu v pozadí i z asyncio.run sestaví index jednou."""
+    runner = BackgroundLoopRunner()
+    connector = AsyncMockMCPConnector(MOCK_DATA_PATH)
+    build_index = connector._build_index
+    builds = []
+
+    async def slow_build():
+        builds.append(True)
+        await asyncio.sleep(0.1)
+        return await build_index()
+
+    connector._build_index = slow_build
+
+    async def get_many():
+        return await asyncio.gather(*(connector._get_index() for _ in range(5)))
+
+    try:
+        background = runner.submit(get_many(), timeout=30)
+        indexes = asyncio.run(get_many()) + background.result(30)
+    finally:
+        runner.close(timeout=5)
+
+    assert builds == [True]
+    assert all(index is indexes[0] for index in indexes)
+    assert len(indexes[0].entities) == 5
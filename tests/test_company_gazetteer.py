@@ -0,0 +1,81 @@
+"""Testy gazetteeru názvů společností."""
+
+import os
+import sys
+
+# Přidání src do pythonpath pro import
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+)
+
+from memory_agent.company_gazetteer import (
+    CompanyGazetteer,
+    display_name,
+    strip_legal_form,
+)
+from memory_agent.tools import MockMCPConnector
+
+MOCK_DATA_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mock_data_2"
+)
+
+
+def test_spot_prefers_longest_leftmost_phrase():
+    """Nejdelší fráze vyhraje a zmínky se nepřekrývají."""
+    gazetteer = CompanyGazetteer()
+    gazetteer.add("Alfa", "a")
+    gazetteer.add("Alfa Beta Gama", "b")
+    gazetteer.add("Beta", "c")
+
+    mentions = gazetteer.spot("Porovnej ALFA beta gama a Betu s Alfa Beta.")
+
+    assert [(m.text, m.entity_ids) for m in mentions] == [
+        ("ALFA beta gama", ("b",)),
+        ("Alfa", ("a",)),
+        ("Beta", ("c",)),
+    ]
+    text = "Porovnej ALFA beta gama a Betu s Alfa Beta."
+    assert [text[m.start : m.end] for m in mentions] == [m.text for m in mentions]
+
+
+def test_add_entity_indexes_core_name_aliases_and_identifiers():
+    """Název bez právní formy, aliasy a identifikátory vedou na stejnou entitu."""
+    gazetteer = CompanyGazetteer()
+    gazetteer.add_entity(
+        "entity_1",
+        {
+            "label": "Šroubárna Žatec s.r.o.",
+            "identifiers": [{"type": "duns_number", "value": "12-345-6789"}],
+        },
+        aliases=["SZ Group"],
+    )
+
+    assert strip_legal_form(("mb", "tool", "s", "r", "o")) == ("mb", "tool")
+    assert strip_legal_form(("s", "r", "o")) == ("s", "r", "o")
+    assert display_name("Flídr plast s.r") == "Flídr plast"
+    assert display_name("ADIS TACHOV, zp") == "ADIS TACHOV"
+    assert display_name("BOS AUTOMOTIVE") == "BOS AUTOMOTIVE"
+    for text in ("sroubarna zatec", "SZ group", "DUNS 12 345 6789"):
+        assert [m.entity_id for m in gazetteer.spot(text)] == ["entity_1"]
+    assert gazetteer.spot("Žatec") == []
+
+
+def test_connector_finds_mentions_in_mock_data():
+    """Konektor rozpozná zmínky mock společností včetně aliasů a DUNS."""
+    connector = MockMCPConnector(MOCK_DATA_PATH)
+
+    mentions = connector.find_company_mentions(
+        "Compare ADIS TACHOV and Flidr Plast with DUNS 511391109"
+    )
+
+    assert [mention["entity_id"] for mention in mentions] == [
+        "entity_1004",
+        "entity_1005",
+        "entity_1001",
+    ]
+    assert mentions[0]["text"] == "ADIS TACHOV"
+    assert mentions[1]["text"] == "Flidr Plast"
+    assert mentions[1]["name"] == "Flídr plast"
+    assert mentions[2]["label"] == "MB TOOL s.r.o."
+    bos = connector.find_company_mentions("What is BOS AUTOMOTIVE")
+    assert bos[0]["entity_ids"] == ["entity_1002", "entity_1003"]
@@ -0,0 +1,48 @@
+"""Testy posting listů pro vyhledávání společností."""
+
+import os
+import sys
+
+# Přidání src do pythonpath pro import
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+)
+
+from memory_agent.company_postings import CompanyPostings
+
+
+def _postings():
+    records = [
+        {"id": "a", "countries": ["CZE"]},
+        {"id": "b", "countries": ["DEU", "CZE"]},
+        {"id": "c", "countries": ["USA"]},
+        {"id": "d", "countries": ["cze"]},
+    ]
+    industries = ["Automotive Parts", None, "Automotive", "Rubber Manufacturing"]
+    return CompanyPostings.from_records(records, industries)
+
+
+def test_candidates_intersect_filters():
+    """Filtry se kombinují průnikem, průmysl podřetězcem bez ohledu na velikost."""
+    postings = _postings()
+
+    assert list(postings.candidates()) == [0, 1, 2, 3]
+    assert list(postings.candidates(country="CZE")) == [0, 1, 3]
+    assert list(postings.candidates(industries=["automotive"])) == [0, 2]
+    assert list(postings.candidates(country="cze", industries=["AUTO", "rubber"])) == [
+        0,
+        3,
+    ]
+    assert list(postings.candidates(company_id="b", country="DEU")) == [1]
+    assert list(postings.candidates(company_id="x")) == []
+
+
+def test_select_keeps_requested_order():
+    """Výběr podle ID zachová pořadí ID a vynechá nevyhovující kandidáty."""
+    postings = _postings()
+
+    assert postings.select(["d", "c", "a"], postings.candidates(country="CZE")) == [
+        3,
+        0,
+    ]
+    assert postings.select(["c", "a"], postings.candidates()) == [2, 0]
@@ -0,0 +1,42 @@
+"""Testy registru sdílených konektorů."""
+
+import asyncio
+import os
+import sys
+
+# Přidání src do pythonpath pro import
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+)
+
+from memory_agent.connector_registry import ConnectorRegistry
+
+MOCK_DATA_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mock_data_2"
+)
+
+
+def test_registry_shares_connector_per_data_path():
+    """Pro stejný datový adresář registr vrací stejnou instanci."""
+    registry = ConnectorRegistry()
+    connector = registry.get(MOCK_DATA_PATH)
+
+    assert registry.get(MOCK_DATA_PATH + os.sep) is connector
+    assert registry.get(os.path.relpath(MOCK_DATA_PATH)) is connector
+    assert registry.get_async(MOCK_DATA_PATH)._sync_connector is connector
+
+
+def test_registry_warm_and_close():
+    """warm() sestaví index, close() jej uvolní a konektor odebere z registru."""
+    registry = ConnectorRegistry()
+    connector = registry.warm(MOCK_DATA_PATH)
+    assert connector._index is not None
+
+    # Asynchronní konektor používá index sestavený synchronním konektorem
+    async_connector = registry.get_async(MOCK_DATA_PATH)
+    detail = asyncio.run(async_connector.get_company_by_id("entity_1001"))
+    assert detail is connector.get_company_by_id("entity_1001")
+
+    registry.close(MOCK_DATA_PATH)
+    assert connector._index is None
+    assert registry.get(MOCK_DATA_PATH) is not connector
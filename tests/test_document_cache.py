@@ -0,0 +1,88 @@
+"""Testy procesní cache parsovaných JSON dokumentů."""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Přidání src do pythonpath pro import
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+)
+
+from memory_agent.document_cache import FrozenDict, FrozenList, JSONDocumentCache
+
+
+def _write_json(path, data):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+
+
+def test_cache_hit_and_mtime_invalidation(tmp_path):
+    """Druhé načtení je zásah, změna souboru vynutí nové parsování."""
+    cache = JSONDocumentCache()
+    file_path = tmp_path / "entity.json"
+    _write_json(file_path, {"id": "entity_1", "tags": ["a"]})
+
+    first = cache.load(str(file_path))
+    assert cache.load(str(file_path)) is first
+    assert cache.stats()["hits"] == 1
+
+    _write_json(file_path, {"id": "entity_1", "tags": ["a", "b"]})
+    os.utime(file_path, ns=(0, os.stat(file_path).st_mtime_ns + 1_000_000))
+
+    assert cache.load(str(file_path))["tags"] == ["a", "b"]
+    assert cache.stats()["misses"] == 2
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Při překročení počtu záznamů se vyřadí nejdéle nepoužitý dokument."""
+    cache = JSONDocumentCache(max_entries=2)
+    paths = []
+    for name in ("a", "b", "c"):
+        file_path = tmp_path / f"{name}.json"
+        _write_json(file_path, {"name": name})
+        paths.append(str(file_path))
+
+    cache.load(paths[0])
+    cache.load(paths[1])
+    cache.load(paths[0])
+    cache.load(paths[2])
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 2
+
+    cache.load(paths[0])
+    assert cache.stats()["hits"] == 2
+
+
+def test_cache_respects_byte_limit(tmp_path):
+    """Dokumenty nad limit v bajtech se vrátí, ale neuloží."""
+    cache = JSONDocumentCache(max_bytes=10)
+    file_path = tmp_path / "big.json"
+    _write_json(file_path, {"description": "x" * 100})
+
+    assert cache.load(str(file_path))["description"]
+    assert cache.stats()["entries"] == 0
+
+
+def test_cached_documents_are_read_only(tmp_path):
+    """Vydaná data nelze změnit na místě, kopie je běžný dict/list."""
+    cache = JSONDocumentCache()
+    file_path = tmp_path / "entity.json"
+    _write_json(file_path, {"risk": {"factors": ["x"]}})
+
+    document = cache.load(str(file_path))
+    assert isinstance(document, FrozenDict)
+    assert isinstance(document["risk"]["factors"], FrozenList)
+
+    with pytest.raises(TypeError):
+        document["risk"]["company_id"] = "entity_1"
+    with pytest.raises(TypeError):
+        document["risk"]["factors"].append("y")
+
+    editable = dict(document["risk"])
+    editable["company_id"] = "entity_1"
+    assert json.loads(json.dumps(document)) == {"risk": {"factors": ["x"]}}
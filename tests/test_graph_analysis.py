@@ -0,0 +1,145 @@
+"""Testy analýzy grafu entit."""
+
+import os
+import sys
+
+# Přidání src do pythonpath pro import
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+)
+
+from memory_agent.data_index import EdgeStore
+from memory_agent.graph_analysis import (
+    SUPPLY_CHAIN_EDGE_TYPE,
+    EntityGraph,
+    SupplierDependencyIndex,
+)
+from memory_agent.supply_chain_graph import SupplyChainGraph
+from memory_agent.tools import MockMCPConnector
+
+MOCK_DATA_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mock_data_2"
+)
+
+
+def _relationship(source_id, target_id, relationship_type="has_supplier"):
+    return {
+        "source": {"id": source_id},
+        "target": {"id": target_id},
+        "type": relationship_type,
+    }
+
+
+def _graph():
+    # a - b - c - f, a - d - e - f, a - f přes supply chain a ve formátu from_id/to_id
+    edge_store = EdgeStore()
+    for source_id, target_id in [("a", "b"), ("b", "c"), ("c", "f"), ("d", "a")]:
+        edge_store.add(_relationship(source_id, target_id))
+    edge_store.add({"from_id": "d", "to_id": "e", "type": "owned_by"})
+    supply_chain = SupplyChainGraph.from_items(
+        [{"path": [{"entity": {"id": "e"}}, {"entity": {"id": "f"}}]}]
+    )
+    return EntityGraph.from_sources([edge_store], supply_chain)
+
+
+def test_k_shortest_paths_ignore_edge_direction():
+    """Cesty se hledají bez ohledu na směr hran a jsou seřazené podle délky."""
+    graph = _graph()
+
+    paths = graph.k_shortest_paths("a", "f", k=5, max_hops=4)
+
+    assert paths == [["a", "b", "c", "f"], ["a", "d", "e", "f"]]
+    assert graph.k_shortest_paths("a", "f", k=5, max_hops=2) == []
+    assert graph.shortest_path("a", "a") == ["a"]
+    assert graph.shortest_path("a", "neexistujici") is None
+
+
+def test_relationship_type_filter_and_edge_records():
+    """Filtr typů omezuje cesty i vracené záznamy hran."""
+    graph = _graph()
+
+    assert graph.k_shortest_paths("a", "f", relationship_types={"has_supplier"}) == [
+        ["a", "b", "c", "f"]
+    ]
+
+    hops = graph.path_edges(["a", "d", "e", "f"])
+    assert [hop["edges"][0]["type"] for hop in hops] == [
+        "has_supplier",
+        "owned_by",
+        SUPPLY_CHAIN_EDGE_TYPE,
+    ]
+    assert hops[2]["edges"][0]["customer"] == "e"
+
+
+def test_shortest_path_avoids_blocked_entities():
+    """Blokované entity a hrany se při hledání vynechají."""
+    graph = _graph()
+
+    assert graph.shortest_path("a", "f", blocked_nodes={"b"}) == ["a", "d", "e", "f"]
+    assert graph.shortest_path("a", "f", blocked_edges={("e", "d"), ("b", "a")}) is None
+
+
+def test_connector_find_paths_returns_hops():
+    """Konektor vrací cesty mezi entitami mock dat včetně záznamů hran."""
+    connector = MockMCPConnector(MOCK_DATA_PATH)
+    graph = connector._get_index().entity_graph
+    source_id = next(iter(graph.adjacency))
+    target_id = next(iter(graph.adjacency[source_id]))
+
+    paths = connector.find_paths(source_id, target_id)
+
+    assert paths[0]["entities"] == [source_id, target_id]
+    assert paths[0]["length"] == 1
+    assert paths[0]["hops"][0]["edges"]
+    assert connector.find_paths(source_id, "neexistujici-id") == []
+
+
+def test_supplier_dependencies_find_single_points_of_failure():
+    """Dominátory a artikulační body odpovídají struktuře dodavatelů."""
+    # root -> a -> b -> c, root -> d -> b, b -> e
+    suppliers = {"root": ["a", "d"], "a": ["b"], "d": ["b"], "b": ["c", "e"]}
+    index = SupplierDependencyIndex(suppliers, ["root"])
+
+    result = index.analysis("root")
+
+    assert result["supplier_count"] == 5
+    assert [point["id"] for point in result["single_points_of_failure"]] == ["b"]
+    assert result["single_points_of_failure"][0]["dependent_count"] == 2
+    assert result["articulation_points"] == ["b"]
+    assert index.dependents("root", "b") == ["c", "e"]
+
+
+def test_supplier_dependencies_recompute_only_affected_roots():
+    """Změna hrany přepočítá jen kořeny, jejichž podgraf ji obsahuje."""
+    suppliers = {"x": ["a"], "a": ["b"], "y": ["c"]}
+    index = SupplierDependencyIndex(suppliers, ["x", "y"])
+    assert index.analysis("x")["articulation_points"] == ["a"]
+
+    index.add_edge("x", "b")
+    assert index.refresh() == 1
+    assert index.analysis("x")["articulation_points"] == []
+    assert index.analysis("x")["single_points_of_failure"] == []
+
+    index.remove_edge("x", "b")
+    index.remove_edge("y", "c")
+    assert index.refresh() == 2
+    assert index.analysis("x")["articulation_points"] == ["a"]
+    assert index.analysis("y")["supplier_count"] == 0
+
+
+def test_connector_supplier_dependencies_for_tracked_companies():
+    """Konektor vrací předpočítané závislosti sledovaných společností."""
+    connector = MockMCPConnector(MOCK_DATA_PATH)
+    index = connector._get_index()
+    company_id = sorted(index.supply_chain_items)[0]
+
+    result = connector.get_supplier_dependencies(company_id)
+
+    assert result["company_id"] == company_id
+    assert company_id in index.supplier_dependencies.roots
+    assert result["supplier_count"] == (
+        sum(
+            len(tier["suppliers"])
+            for tier in connector.get_supply_chain_graph(company_id, 100)["tiers"]
+        )
+    )
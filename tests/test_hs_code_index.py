@@ -0,0 +1,115 @@
+"""Testy prefixového indexu HS kódů."""
+
+import os
+import sys
+
+import pytest
+
+# Přidání src do pythonpath pro import
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+)
+
+from memory_agent.hs_code_index import (
+    SOURCE_INTERNAL_MATCH,
+    SOURCE_SUPPLY_CHAIN,
+    HSCodeIndex,
+    normalize_hs_code,
+)
+from memory_agent.tools import MockMCPConnector
+
+MOCK_DATA_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mock_data_2"
+)
+
+
+def _step(entity_id, code, min_date, max_date, departure):
+    return {
+        "entity": {"id": entity_id, "label": entity_id.upper()},
+        "products": [
+            {
+                "hs_code": {"code": code, "description": f"Produkt {code}"},
+                "min_date": min_date,
+                "max_date": max_date,
+                "departure_countries": [departure],
+                "arrival_countries": ["CZE"],
+            }
+        ],
+    }
+
+
+def _index():
+    items = [
+        {
+            "path": [
+                {"entity": {"id": "buyer"}, "products": []},
+                _step("a", "8708.29", "2023-01-01", "2023-06-30", "DEU"),
+                _step("b", "8708.99", "2023-02-01", "2024-01-31", "POL"),
+            ]
+        },
+        {
+            "path": [
+                {"entity": {"id": "buyer"}, "products": []},
+                _step("a", "8708.29", "2022-05-01", "2023-03-31", "AUT"),
+                _step("c", "3926.30", "2023-01-01", "2023-12-31", "CZE"),
+            ]
+        },
+    ]
+    internal_records = {
+        "d": {"hs_code_matches": [{"hsCode": "8708.29", "match_confidence": 0.9}]}
+    }
+    return HSCodeIndex.from_sources(items, internal_records)
+
+
+def test_normalize_hs_code():
+    """HS kód se normalizuje na číslice."""
+    assert normalize_hs_code("8708.29") == "870829"
+    assert normalize_hs_code(" 87 08 ") == "8708"
+    assert normalize_hs_code(None) == ""
+
+
+def test_lookup_by_chapter_heading_and_subheading():
+    """Prefix vrátí záznamy všech úrovní pod ním se sloučeným obdobím a zeměmi."""
+    index = _index()
+
+    assert {entry["entity_id"] for entry in index.lookup("87")} == {"a", "b", "d"}
+    assert {entry["entity_id"] for entry in index.lookup("8708.2")} == {"a", "d"}
+    assert index.lookup("9401") == []
+    assert [
+        entry["entity_id"]
+        for entry in index.lookup("870829", sources=[SOURCE_INTERNAL_MATCH])
+    ] == ["d"]
+
+    entry = index.lookup("8708.29", sources=[SOURCE_SUPPLY_CHAIN])[0]
+    assert (entry["min_date"], entry["max_date"]) == ("2022-05-01", "2023-06-30")
+    assert entry["departure_countries"] == ["DEU", "AUT"]
+    assert entry["customers"] == ["buyer"]
+
+    with pytest.raises(ValueError):
+        index.lookup("abc")
+
+
+def test_alternative_suppliers_rank_by_coverage_and_shipments():
+    """Náhrady pokrývají produkty entity a skutečné dodávky mají přednost."""
+    index = _index()
+
+    candidates = index.alternative_suppliers("a", "87")
+    assert [candidate["id"] for candidate in candidates] == ["b", "d"]
+    assert candidates[0]["label"] == "B"
+
+    # Bez prefixu se hledají náhrady za vlastní HS kódy entity
+    assert [c["id"] for c in index.alternative_suppliers("a")] == ["d"]
+    assert index.alternative_suppliers("c") == []
+
+
+def test_connector_find_alternative_suppliers():
+    """Konektor najde jiné entity se stejným HS kódem v mock datech."""
+    connector = MockMCPConnector(MOCK_DATA_PATH)
+    index = connector._get_index().hs_code_index
+    entity_id = index.lookup("8708.29")[0]["entity_id"]
+
+    candidates = connector.find_alternative_suppliers(entity_id, "8708.29")
+
+    assert candidates
+    assert entity_id not in [candidate["id"] for candidate in candidates]
+    assert all("870829" in candidate["matched_codes"] for candidate in candidates)
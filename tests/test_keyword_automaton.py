@@ -0,0 +1,62 @@
+"""Testy Aho–Corasickova automatu klíčových slov."""
+
+import os
+import sys
+
+import pytest
+
+# Přidání src do pythonpath pro import
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+)
+
+from memory_agent.keyword_automaton import KeywordAutomaton, fold_text
+
+
+def test_matches_find_overlapping_keywords_in_one_pass():
+    """Najdou se všechny výskyty včetně překrývajících se a vnořených slov."""
+    automaton = KeywordAutomaton(
+        [("he", "a", 1.0), ("she", "a", 1.0), ("his", "b", 1.0), ("hers", "b", 1.0)],
+        normalize=str.lower,
+    )
+
+    found = [
+        (position, keyword) for position, keyword, _, _ in automaton.matches("ushers")
+    ]
+
+    assert found == [(3, "she"), (3, "he"), (5, "hers")]
+
+
+def test_rank_scores_distinct_keywords_with_weights():
+    """Skóre je součet vah různých slov, shodu rozhodne pořadí štítků."""
+    automaton = KeywordAutomaton(
+        [
+            ("riziko", "risk", 1.0),
+            ("dodavatel", "supplier", 1.0),
+            ("tier", "supplier", 2.0),
+        ],
+    )
+
+    assert automaton.rank("Riziko dodavatele") == [("risk", 0.5), ("supplier", 0.5)]
+    assert automaton.rank("dodavatel, dodavatel a tier 2 RIZIKO") == [
+        ("supplier", 0.75),
+        ("risk", 0.25),
+    ]
+    assert automaton.rank("nic") == []
+
+
+def test_diacritics_are_ignored_and_keywords_can_be_added():
+    """Klíčová slova i text se porovnávají bez diakritiky."""
+    automaton = KeywordAutomaton()
+    automaton.add("dodávky", "supplier")
+    assert automaton.scores("Pravidelné DODAVKY") == {"supplier": 1.0}
+
+    automaton.add("nákup", "supplier")
+    assert automaton.scores("nakup a dodávky") == {"supplier": 2.0}
+    with pytest.raises(ValueError):
+        automaton.add(" - ", "supplier")
+
+
+def test_fold_text_removes_diacritics_and_separators():
+    """Normalizace odstraní diakritiku, velká písmena a oddělovače."""
+    assert fold_text("  Dodavatelský-ŘETĚZEC,  nákup ") == "dodavatelsky retezec nakup"
@@ -90,17 +90,16 @@ def test_agent_initialization(mock_init_chat_model, mock_init_chat_model_helper)
         pytest.fail(f"create_memory_agent vyvolal výjimku: {str(e)}")
 
 
-@patch("memory_agent.analyzer.AsyncMockMCPConnector")
-@patch("memory_agent.analyzer.MockMCPConnector")
-def test_analyze_company_tool(mock_connector, mock_async_connector):
+@patch("memory_agent.analyzer.get_connector_registry")
+def test_analyze_company_tool(mock_registry):
     """Test, že analyze_company tool funguje správně."""
-    # Mock pro MockMCPConnector (sync verze)
+    # Mock pro sdílený MockMCPConnector z registru (sync verze)
     connector_instance = MagicMock()
-    mock_connector.return_value = connector_instance
+    mock_registry.return_value.get.return_value = connector_instance
 
-    # Mock pro AsyncMockMCPConnector (async verze)
+    # Mock pro sdílený AsyncMockMCPConnector z registru (async verze)
     async_connector_instance = MagicMock()
-    mock_async_connector.return_value = async_connector_instance
+    mock_registry.return_value.get_async.return_value = async_connector_instance
 
     # Mock návratových hodnot pro metody connectoru (sync verze)
     connector_instance.get_company_by_name.return_value = {
@@ -0,0 +1,79 @@
+"""Testy cache rozborů dotazů."""
+
+import os
+import sys
+
+import pytest
+
+# Přidání src do pythonpath pro import
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+)
+
+from memory_agent.analyzer import get_query_parse_cache, parse_query
+from memory_agent.connector_registry import get_connector_registry
+from memory_agent.query_parse import QueryParse, QueryParseCache, normalize_query
+
+
+def _parse(query):
+    return QueryParse(query, query, None, (), "general", 0.0, ())
+
+
+def test_cache_evicts_least_recently_used_and_counts_hits():
+    """Cache vyřadí nejdéle nepoužitý rozbor a počítá zásahy."""
+    cache = QueryParseCache(max_entries=2)
+    calls = []
+
+    def parse(query):
+        calls.append(query)
+        return _parse(query)
+
+    cache.get_or_parse("a", lambda: parse("a"))
+    cache.get_or_parse("b", lambda: parse("b"))
+    cache.get_or_parse("a", lambda: parse("a"))
+    cache.get_or_parse("c", lambda: parse("c"))
+    cache.get_or_parse("a", lambda: parse("a"))
+    cache.get_or_parse("b", lambda: parse("b"))
+
+    assert calls == ["a", "b", "c", "b"]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 4, 2)
+    assert stats["hit_rate"] == pytest.approx(2 / 6)
+    with pytest.raises(ValueError):
+        QueryParseCache(max_entries=0)
+
+
+def test_parse_query_is_immutable_and_reused():
+    """Opakovaný dotaz se stejným textem vrací uložený neměnný rozbor."""
+    get_query_parse_cache().clear()
+    hits = get_query_parse_cache().stats()["hits"]
+
+    parsed = parse_query("Jaká jsou rizika  MB TOOL?")
+    again = parse_query("  Jaká jsou rizika MB TOOL? ")
+
+    assert again is parsed
+    assert get_query_parse_cache().stats()["hits"] == hits + 1
+    assert parsed.query == normalize_query("Jaká jsou rizika MB TOOL?")
+    mention = parsed.mentions[0]
+    assert parsed.query[mention["start"] : mention["end"]] == "MB TOOL"
+    assert (parsed.company_name, parsed.entity_id) == ("MB TOOL", "entity_1001")
+    assert parsed.analysis_type == "risk_comparison"
+    assert parsed.confidence == 1.0
+    with pytest.raises(TypeError):
+        parsed.mentions[0]["entity_id"] = "jina"
+    with pytest.raises(AttributeError):
+        parsed.analysis_type = "general"
+
+
+def test_parse_query_is_not_reused_after_registry_rebuild():
+    """Nový konektor začíná na generaci 0, přesto se starý rozbor nepoužije."""
+    get_query_parse_cache().clear()
+    parsed = parse_query("Jaká jsou rizika MB TOOL?")
+    assert parse_query("Jaká jsou rizika MB TOOL?") is parsed
+
+    get_connector_registry().close()
+
+    again = parse_query("Jaká jsou rizika MB TOOL?")
+    assert again is not parsed
+    assert again == parsed
+    assert get_connector_registry().get().generation == 0
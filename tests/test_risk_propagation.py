@@ -0,0 +1,131 @@
+"""Testy propagace rizika od dodavatelů."""
+
+import os
+import sys
+
+import pytest
+
+# Přidání src do pythonpath pro import
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+)
+
+from memory_agent.risk_propagation import RiskPropagation, tier_weights
+from memory_agent.supply_chain_graph import SupplyChainGraph
+from memory_agent.tools import MockMCPConnector
+
+MOCK_DATA_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mock_data_2"
+)
+
+
+def _graph(*paths):
+    return SupplyChainGraph.from_items(
+        {"path": [{"entity": {"id": entity_id}} for entity_id in path]}
+        for path in paths
+    )
+
+
+def test_propagate_decays_risk_per_tier():
+    """Riziko se průměruje přes dodavatele a tlumí podle tieru."""
+    # a -> b -> d, a -> c
+    graph = _graph(["a", "b", "d"], ["a", "c"])
+    propagation = RiskPropagation(graph, {"c": 0.4, "d": 0.8})
+
+    exposure = propagation.exposure(decay=0.5, max_depth=3)
+
+    # Tier 1: 0.5 * (0 + 0.4) / 2, Tier 2: 0.25 * 0.8 / 2
+    assert exposure["a"]["inherited_risk"] == pytest.approx(0.1 + 0.1)
+    assert exposure["b"]["inherited_risk"] == pytest.approx(0.4)
+    assert exposure["d"]["inherited_risk"] == 0
+    assert exposure["d"]["total_risk"] == pytest.approx(0.8)
+
+    # Hloubka omezuje počet tierů
+    assert propagation.exposure(["a"], decay=0.5, max_depth=1)["a"][
+        "inherited_risk"
+    ] == pytest.approx(0.1)
+
+
+def test_contributing_paths_sum_to_inherited_risk():
+    """Přispívající cesty vysvětlují celé zděděné riziko včetně cyklů."""
+    graph = _graph(["a", "b", "d"], ["a", "c", "d"], ["d", "a"])
+    propagation = RiskPropagation(graph, {"a": 0.2, "c": 0.4, "d": 0.8})
+
+    report = propagation.exposure(["a"], decay=[0.6, 0.3, 0.1], paths_per_entity=50)
+
+    paths = report["a"]["contributing_paths"]
+    assert sum(path["contribution"] for path in paths) == pytest.approx(
+        report["a"]["inherited_risk"]
+    )
+    assert paths[0]["path"] == ["a", "c", "d"]
+    assert paths[0]["tier"] == 2
+    assert [path["contribution"] for path in paths] == sorted(
+        (path["contribution"] for path in paths), reverse=True
+    )
+    assert len(propagation.contributing_paths("a", limit=1)) == 1
+    assert propagation.contributing_paths("a", limit=0) == []
+    assert propagation.contributing_paths("unknown") == []
+
+
+def test_total_risk_stays_within_unit_interval():
+    """Celkové riziko kombinuje základní a zděděné riziko a nepřekročí 1."""
+    graph = _graph(["a", "b"])
+    propagation = RiskPropagation(graph, {"a": 0.6, "b": 0.9})
+
+    report = propagation.exposure(["a"], decay=[1.0])["a"]
+
+    assert report["inherited_risk"] == pytest.approx(0.9)
+    assert report["total_risk"] == pytest.approx(1 - 0.4 * 0.1)
+    heavy = propagation.exposure(["a"], decay=[3.0])["a"]
+    assert heavy["inherited_risk"] > 1
+    assert heavy["total_risk"] == pytest.approx(1.0)
+
+
+def test_top_paths_match_full_enumeration():
+    """Prořezávání větví nemění nejsilnější cesty; hromadný dotaz je bez cest."""
+    # Každá entita vrstvy má za dodavatele všechny entity další vrstvy
+    layers = [["root"]] + [[f"l{depth}_{i}" for i in range(4)] for depth in range(4)]
+    paths = [["root"]]
+    for layer in layers[1:]:
+        paths = [path + [entity_id] for path in paths for entity_id in layer]
+    base = {
+        entity_id: (index * 7 % 10) / 10
+        for index, entity_id in enumerate(e for layer in layers for e in layer)
+    }
+    propagation = RiskPropagation(_graph(*paths), base)
+
+    everything = propagation.contributing_paths("root", max_depth=4, limit=10**6)
+    top = propagation.contributing_paths("root", max_depth=4, limit=5)
+
+    assert [path["contribution"] for path in top] == pytest.approx(
+        [path["contribution"] for path in everything[:5]]
+    )
+    bulk = propagation.exposure(max_depth=4)
+    assert all(report["contributing_paths"] == [] for report in bulk.values())
+    assert len(propagation.exposure(["root"])["root"]["contributing_paths"]) == 3
+
+
+def test_tier_weights_validation():
+    """Skalární útlum je geometrický, záporný útlum je chyba."""
+    assert tier_weights(0.5, 3) == [0.5, 0.25, 0.125]
+    assert tier_weights([1.0, 0.2, 0.1, 0.05], 2) == [1.0, 0.2]
+    with pytest.raises(ValueError):
+        tier_weights(-0.1, 2)
+
+
+def test_connector_risk_exposure_uses_mock_data():
+    """Konektor vrací zděděné riziko z grafu dodavatelů mock dat."""
+    connector = MockMCPConnector(MOCK_DATA_PATH)
+    graph = connector._get_index().supply_chain_graph
+    customer_id = next(iter(graph.suppliers))
+
+    exposure = connector.get_risk_exposure([customer_id, "neexistujici-id"])
+
+    assert list(exposure) == [customer_id]
+    assert exposure[customer_id]["inherited_risk"] >= 0
+    assert connector.get_risk_exposure(customer_id) == {
+        customer_id: exposure[customer_id]
+    }
+    assert len(connector.get_risk_exposure(paths_per_entity=0)) == len(
+        connector._get_index().risk_propagation.entity_ids
+    )
@@ -0,0 +1,131 @@
+"""Testy shardovaného uspořádání adresáře dat."""
+
+import os
+import shutil
+import sys
+
+import pytest
+
+# Přidání src do pythonpath pro import
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+)
+
+from memory_agent.__main__ import main
+from memory_agent.sharded_store import (
+    SHARD_DIRECTORY,
+    ShardLayoutError,
+    is_sharded,
+    migrate_to_shards,
+    shard_name,
+)
+from memory_agent.tools import CompanyQueryParams, MockMCPConnector
+
+MOCK_DATA_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mock_data_2"
+)
+
+COMPANY_IDS = ["entity_1001", "entity_1002", "entity_1003", "entity_1004"]
+
+
+@pytest.fixture
+def sharded_dir(tmp_path):
+    """Shardovaná kopie testovacích dat vytvořená přes příkazovou řádku."""
+    target = str(tmp_path / "sharded")
+    assert main(["migrate-shards", MOCK_DATA_PATH, target, "--prefix-length", "1"]) == 0
+    return target
+
+
+def test_migration_writes_manifest_and_shards(sharded_dir):
+    """Soubory entit se rozloží do shardů, hromadné exporty zůstanou."""
+    assert is_sharded(sharded_dir)
+    assert not is_sharded(MOCK_DATA_PATH)
+
+    files = set(os.listdir(sharded_dir))
+    assert {"entity_search.json", "relationships.json"} <= files
+    assert not any(name.startswith("entity_detail_") for name in files)
+    shards = os.listdir(os.path.join(sharded_dir, SHARD_DIRECTORY))
+    assert f"{shard_name('entity_1001', 1)}.jsonl" in shards
+    assert all(len(name) == len("0.jsonl") for name in shards)
+
+    with pytest.raises(ShardLayoutError):
+        migrate_to_shards(sharded_dir, sharded_dir + "_2")
+    with pytest.raises(ShardLayoutError):
+        migrate_to_shards(MOCK_DATA_PATH, sharded_dir + "_3", prefix_length=0)
+
+
+def test_connector_reads_sharded_layout_transparently(sharded_dir):
+    """Konektor nad shardy vrací stejná data jako nad plochým adresářem."""
+    sharded = MockMCPConnector(data_path=sharded_dir)
+    flat = MockMCPConnector(data_path=MOCK_DATA_PATH)
+
+    for company_id in COMPANY_IDS:
+        for method in (
+            "get_company_by_id",
+            "get_company_financials",
+            "get_company_relationships",
+            "get_supply_chain_data",
+            "get_risk_factors_data",
+        ):
+            assert getattr(sharded, method)(company_id) == getattr(flat, method)(
+                company_id
+            )
+        assert list(sharded.iter_company_relationships(company_id)) == list(
+            flat.iter_company_relationships(company_id)
+        )
+
+    assert sharded.get_company_by_name("ADIS")["id"] == "entity_1004"
+    assert sharded.get_company_by_identifier("duns_number", "511391109") == (
+        flat.get_company_by_identifier("duns_number", "511391109")
+    )
+    assert sharded.search_companies(CompanyQueryParams(name="bos automotive")) == (
+        flat.search_companies(CompanyQueryParams(name="bos automotive"))
+    )
+    assert sharded.read_resource("entity_detail_mb_tool") == flat.read_resource(
+        "entity_detail_mb_tool"
+    )
+    assert sharded.read_resource("entity_search") == flat.read_resource("entity_search")
+
+
+def test_entity_lookup_reads_one_shard_record(sharded_dir, monkeypatch):
+    """Dotaz na entitu přečte jen jeden záznam shardu, další jde z cache."""
+    connector = MockMCPConnector(data_path=sharded_dir)
+    store = connector._get_index().shards
+    reads = []
+    original_read = store.read
+
+    def counting_read(entity_id):
+        if entity_id not in store._cache:
+            reads.append(entity_id)
+        return original_read(entity_id)
+
+    monkeypatch.setattr(store, "read", counting_read)
+
+    connector.get_company_by_id("entity_1002")
+    connector.get_company_financials("entity_1002")
+
+    assert reads == ["entity_1002"]
+
+
+def test_search_order_matches_across_layouts(sharded_dir, tmp_path):
+    """Plochý adresář, snapshot i shardy vrací výsledky hledání ve stejném pořadí."""
+    snapshot_dir = str(tmp_path / "snapshot")
+    shutil.copytree(MOCK_DATA_PATH, snapshot_dir)
+    assert main(["compile-snapshot", snapshot_dir]) == 0
+    flat = MockMCPConnector(data_path=MOCK_DATA_PATH)
+    layouts = [
+        MockMCPConnector(data_path=snapshot_dir),
+        MockMCPConnector(data_path=sharded_dir),
+    ]
+
+    for params in (
+        CompanyQueryParams(),
+        CompanyQueryParams(country="CZE"),
+        CompanyQueryParams(name="bos automotive"),
+        CompanyQueryParams(name="tool"),
+    ):
+        expected = flat.search_companies(params, limit=100)
+        for connector in layouts:
+            assert connector.search_companies(params, limit=100) == expected
+    for connector in layouts:
+        assert list(connector._get_index().entities) == list(flat._get_index().entities)
@@ -0,0 +1,86 @@
+"""Testy kompilovaného binárního snapshotu mock dat."""
+
+import os
+import shutil
+import sys
+
+import pytest
+
+# Přidání src do pythonpath pro import
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+)
+
+from memory_agent.__main__ import main
+from memory_agent.snapshot import (
+    SNAPSHOT_FILENAME,
+    SnapshotError,
+    compute_content_hash,
+    load_snapshot,
+    read_snapshot_header,
+)
+from memory_agent.tools import MockMCPConnector
+
+MOCK_DATA_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mock_data_2"
+)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Kopie testovacích dat se zkompilovaným snapshotem."""
+    target = tmp_path / "data"
+    shutil.copytree(MOCK_DATA_PATH, target)
+    assert main(["compile-snapshot", str(target)]) == 0
+    return str(target)
+
+
+def test_snapshot_header_has_content_hash(data_dir):
+    """Hlavička snapshotu nese hash obsahu zdrojových souborů."""
+    header = read_snapshot_header(os.path.join(data_dir, SNAPSHOT_FILENAME))
+
+    assert header["content_hash"] == compute_content_hash(data_dir)
+    assert header["entity_count"] == 5
+
+
+def test_connector_reads_snapshot_lazily(data_dir, monkeypatch):
+    """Konektor použije snapshot a JSON soubory vůbec neparsuje."""
+    connector = MockMCPConnector(data_path=data_dir)
+    reference = MockMCPConnector(data_path=data_dir, snapshot_path="/neexistuje")
+
+    def fail_load(file_path):
+        raise AssertionError(f"Soubor {file_path} neměl být parsován")
+
+    monkeypatch.setattr(connector, "_load_json_file", fail_load)
+
+    for method in (
+        "get_company_by_id",
+        "get_company_financials",
+        "get_company_relationships",
+        "get_supply_chain_data",
+        "get_risk_factors_data",
+    ):
+        assert getattr(connector, method)("entity_1002") == getattr(reference, method)(
+            "entity_1002"
+        )
+    assert connector.get_company_by_name("ADIS")["id"] == "entity_1004"
+
+
+def test_stale_snapshot_falls_back_to_json(data_dir):
+    """Po změně zdrojového souboru se snapshot ignoruje."""
+    file_path = os.path.join(data_dir, "entity_detail_adis.json")
+    stat = os.stat(file_path)
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    connector = MockMCPConnector(data_path=data_dir)
+    assert connector._get_index().content_hash is None
+    assert connector.get_company_by_id("entity_1004")["id"] == "entity_1004"
+
+
+def test_invalid_snapshot_raises(tmp_path):
+    """Soubor bez hlavičky snapshotu vyvolá SnapshotError."""
+    snapshot_path = tmp_path / SNAPSHOT_FILENAME
+    snapshot_path.write_bytes(b"not a snapshot at all")
+
+    with pytest.raises(SnapshotError):
+        load_snapshot(str(snapshot_path), str(tmp_path))
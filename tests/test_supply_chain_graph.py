@@ -0,0 +1,83 @@
+"""Testy grafu dodavatelského řetězce."""
+
+import os
+import sys
+
+# Přidání src do pythonpath pro import
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+)
+
+from memory_agent.supply_chain_graph import SupplyChainGraph
+from memory_agent.tools import MockMCPConnector
+
+MOCK_DATA_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mock_data_2"
+)
+
+
+def _step(entity_id, hs_code=None):
+    products = [{"hs_code": {"code": hs_code}}] if hs_code else []
+    return {
+        "entity": {"id": entity_id, "label": entity_id.upper()},
+        "products": products,
+    }
+
+
+def test_expand_groups_suppliers_by_shortest_tier():
+    """Dodavatel je v tieru podle nejkratší cesty a hloubka je omezená."""
+    graph = SupplyChainGraph.from_items(
+        [
+            {"path": [_step("a"), _step("b", "01"), _step("c", "02"), _step("d")]},
+            {"path": [_step("a"), _step("c", "03")]},
+            # Cyklus zpět na výchozí společnost
+            {"path": [_step("d"), _step("a", "04")]},
+        ]
+    )
+
+    result = graph.expand("a")
+    tiers = {
+        tier["tier"]: [s["id"] for s in tier["suppliers"]] for tier in result["tiers"]
+    }
+    # Výchozí společnost se mezi dodavatele nezařadí ani přes cyklus
+    assert tiers == {1: ["b", "c"], 2: ["d"]}
+
+    c_node = result["tiers"][0]["suppliers"][1]
+    assert sorted(c_node["customers"]) == ["a", "b"]
+
+    limited = graph.expand("a", max_depth=1)
+    assert [tier["tier"] for tier in limited["tiers"]] == [1]
+    assert {(e["customer"], e["supplier"]) for e in limited["edges"]} == {
+        ("a", "b"),
+        ("a", "c"),
+    }
+
+
+def test_edge_products_are_merged_without_duplicates():
+    """Stejná hrana z více cest nese sjednocené produkty bez duplicit."""
+    graph = SupplyChainGraph.from_items(
+        [
+            {"path": [_step("a"), _step("b", "01")]},
+            {"path": [_step("a"), _step("b", "01")]},
+            {"path": [_step("a"), _step("b", "02")]},
+        ]
+    )
+
+    assert len(graph.edges) == 1
+    codes = [p["hs_code"]["code"] for p in graph.edges[0]["products"]]
+    assert codes == ["01", "02"]
+
+
+def test_connector_expands_mock_supply_chain():
+    """Konektor rozbalí Tier 1 -> Tier 2 řetězec z cest v mock datech."""
+    connector = MockMCPConnector(data_path=MOCK_DATA_PATH)
+    result = connector.get_supply_chain_graph("entity_1001")
+
+    tier1 = [s["id"] for s in result["tiers"][0]["suppliers"]]
+    tier2 = [s["id"] for s in result["tiers"][1]["suppliers"]]
+    assert tier1 == ["entity_2002", "entity_2003"]
+    assert tier2 == ["entity_3001", "entity_3002"]
+
+    edge = next(e for e in result["edges"] if e["supplier"] == "entity_2002")
+    assert edge["customer"] == "entity_1001"
+    assert edge["products"][0]["hs_code"]["code"] == "4008.21"
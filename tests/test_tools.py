@@ -0,0 +1,481 @@
+"""Testy MockMCPConnector nad daty v mock_data_2."""
+
+import asyncio
+import itertools
+import json
+import os
+import shutil
+import sys
+import threading
+
+import pytest
+
+# Přidání src do pythonpath pro import
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+)
+
+from memory_agent.data_index import DataIndex, EdgeStore
+from memory_agent.tools import (
+    AsyncMockMCPConnector,
+    CompanyQueryParams,
+    DataFormatError,
+    EntityNotFoundError,
+    MockMCPConnector,
+    iter_json_records,
+)
+
+MOCK_DATA_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mock_data_2"
+)
+
+
+@pytest.fixture
+def connector():
+    """Konektor nad testovacími daty."""
+    return MockMCPConnector(data_path=MOCK_DATA_PATH)
+
+
+def test_index_is_built_once(connector, monkeypatch):
+    """Index se sestaví jednou a další dotazy už soubory neparsují."""
+    connector.get_company_by_id("entity_1001")
+
+    def fail_load(file_path):
+        raise AssertionError(f"Soubor {file_path} byl načten znovu")
+
+    monkeypatch.setattr(connector, "_load_json_file", fail_load)
+
+    assert connector.get_company_financials("entity_1001")["duns_number"] == (
+        "511391109"
+    )
+    assert connector.get_company_search_data("entity_1004")["id"] == "entity_1004"
+    assert connector.get_supply_chain_data("entity_1005")
+    assert connector.get_risk_factors_data("entity_1002")["company_id"] == (
+        "entity_1002"
+    )
+
+
+def test_index_family_map(connector):
+    """Každá entita má mapu rodin souborů podle přípony entity_detail souboru."""
+    index = connector._get_index()
+
+    relationship_files = index.family_files("entity_1001", "relationships")
+    assert [os.path.basename(path) for path in relationship_files] == [
+        "relationships_mb_tool.json"
+    ]
+    assert index.family_files("entity_9999", "internal") == []
+
+
+def test_index_lazy_thread_safe_build(monkeypatch):
+    """Souběžné dotazy sestaví index pouze jednou."""
+    connector = MockMCPConnector(data_path=MOCK_DATA_PATH)
+    loaded = []
+    original_load = connector._load_json_file
+
+    def counting_load(file_path):
+        loaded.append(file_path)
+        return original_load(file_path)
+
+    monkeypatch.setattr(connector, "_load_json_file", counting_load)
+
+    threads = [
+        threading.Thread(target=connector.get_company_by_id, args=("entity_1003",))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loaded) == len(set(loaded))
+
+
+def test_risk_factors_do_not_modify_index(connector):
+    """Výsledek get_risk_factors_data nemění detail entity v indexu."""
+    risk_data = connector.get_risk_factors_data("entity_1001")
+    assert risk_data["all_risk_factors"]
+
+    detail = connector.get_company_by_id("entity_1001")
+    assert "all_risk_factors" not in detail["risk"]
+
+
+def test_unknown_company_raises(connector):
+    """Neznámé ID vyvolá EntityNotFoundError."""
+    with pytest.raises(EntityNotFoundError):
+        connector.get_company_by_id("entity_9999")
+
+
+def test_relationships_by_type_and_direction(connector):
+    """Vztahy lze filtrovat podle typu a směru přes seznamy sousednosti."""
+    all_relationships = connector.get_company_relationships("entity_2002")
+    suppliers = connector.get_company_relationships(
+        "entity_2002", relationship_type="has_supplier", direction="outgoing"
+    )
+    customers = connector.get_company_relationships(
+        "entity_2002", relationship_type="has_supplier", direction="incoming"
+    )
+
+    assert [r["target"]["id"] for r in suppliers] == ["entity_3001"]
+    assert [r["source"]["id"] for r in customers] == ["entity_1001"]
+    assert len(all_relationships) == len(suppliers) + len(customers)
+
+    with pytest.raises(ValueError):
+        connector.get_company_relationships("entity_2002", direction="sideways")
+
+
+def test_find_companies_by_name_ranked(connector):
+    """Vyhledání podle názvu vrací seřazené shody se skóre nad prahem."""
+    matches = connector.find_companies_by_name("Flidr")
+    assert matches[0]["id"] == "entity_1005"
+    assert matches[0]["score"] == 1.0
+
+    assert connector.find_companies_by_name("MB TOLL") == []
+    loose = connector.find_companies_by_name("MB TOLL", threshold=0.5)
+    assert [match["id"] for match in loose] == ["entity_1001"]
+
+    with pytest.raises(EntityNotFoundError):
+        connector.get_company_by_name("MB TOLL")
+    assert connector.get_company_by_name("MB TOLL", threshold=0.5)["id"] == (
+        "entity_1001"
+    )
+
+
+def test_search_companies_by_name_uses_index(connector):
+    """search_companies filtruje podle názvu přes trigramový index."""
+    page = connector.search_companies(CompanyQueryParams(name="bos automotive"))
+    assert [company["id"] for company in page.data] == ["entity_1002", "entity_1003"]
+    assert page.next is None
+
+
+def test_search_companies_pages_with_cursor(connector):
+    """Stránky navazují přes kurzor a filtry se vyhodnotí z posting listů."""
+    everything = connector.search_companies(CompanyQueryParams(), limit=100)
+    assert everything.next is None
+
+    ids, cursor = [], None
+    while True:
+        page = connector.search_companies(CompanyQueryParams(), limit=5, cursor=cursor)
+        assert page.offset == len(ids)
+        ids.extend(company["id"] for company in page.data)
+        cursor = page.next
+        if cursor is None:
+            break
+    assert ids == [company["id"] for company in everything.data]
+    assert everything.size == {"count": len(ids), "qualifier": "eq"}
+
+    country = everything.data[0]["countries"][0]
+    by_country = connector.search_companies(CompanyQueryParams(country=country.lower()))
+    assert by_country.data
+    assert all(country in company["countries"] for company in by_country.data)
+
+    first = connector.search_companies(CompanyQueryParams(), limit=1)
+    with pytest.raises(ValueError):
+        connector.search_companies(CompanyQueryParams(country="CZE"), cursor=first.next)
+    with pytest.raises(ValueError):
+        connector.search_companies(CompanyQueryParams(), limit=0)
+
+
+def test_search_companies_falls_back_to_entity_details(connector):
+    """Dotaz bez shody v entity_search.json se obslouží z detailů entit."""
+    page = connector.search_companies(CompanyQueryParams(id="entity_1001"))
+
+    assert [company["id"] for company in page.data] == ["entity_1001"]
+    assert page.data[0] == connector.get_company_by_id("entity_1001")
+
+
+def test_get_company_by_identifier(connector):
+    """Identifikátory se vyhledávají v normalizované podobě."""
+    assert connector.get_company_by_identifier("duns_number", "511391109")["id"] == (
+        "entity_1001"
+    )
+    assert connector.get_company_by_identifier("DUNS", "51-139-1109")["id"] == (
+        "entity_1001"
+    )
+    assert connector.get_company_by_identifier("vat", "cz 261 50 565")["id"] == (
+        "entity_1001"
+    )
+    with pytest.raises(EntityNotFoundError):
+        connector.get_company_by_identifier("vat_number", "CZ00000000")
+
+
+def test_internal_records_joined_by_duns(connector):
+    """Interní data jsou propojená s entitou přes DUNS číslo bez skenování."""
+    index = connector._get_index()
+    for entity_id, internal_data in index.internal_records.items():
+        assert entity_id in index.find_ids_by_identifier(
+            "duns_number", internal_data["duns_number"]
+        )
+
+
+def test_batch_lookups_report_missing_ids(connector):
+    """Dávkové dotazy vrací výsledky podle ID a chybějící ID zvlášť."""
+    ids = ["entity_1001", "entity_9999", "entity_1002", "entity_1001"]
+
+    companies = connector.get_companies_by_ids(ids)
+    assert list(companies.found) == ["entity_1001", "entity_1002"]
+    assert companies.missing == ["entity_9999"]
+
+    financials = connector.get_financials_for_many(ids)
+    assert financials.found["entity_1001"] == connector.get_company_financials(
+        "entity_1001"
+    )
+    assert financials.missing == ["entity_9999"]
+
+    risks = connector.get_risk_factors_for_many(ids)
+    assert risks.found["entity_1002"] == connector.get_risk_factors_data("entity_1002")
+    assert risks.missing == ["entity_9999"]
+
+
+def test_batch_relationships_and_supply_chain(connector):
+    """Vztahy a dodavatelský řetězec lze získat pro více entit najednou."""
+    relationships = connector.get_relationships_for_many(
+        ["entity_2002", "entity_9999"], relationship_type="has_supplier"
+    )
+    assert relationships.found["entity_2002"] == (
+        connector.get_company_relationships(
+            "entity_2002", relationship_type="has_supplier"
+        )
+    )
+    assert relationships.missing == ["entity_9999"]
+
+    supply_chain = connector.get_supply_chain_for_many(["entity_1005", "entity_9999"])
+    assert supply_chain.found["entity_1005"] == connector.get_supply_chain_data(
+        "entity_1005"
+    )
+    assert supply_chain.missing == ["entity_9999"]
+
+
+def test_async_connector_matches_sync(monkeypatch):
+    """Asynchronní konektor vrací stejná data jako synchronní a index sestaví jednou."""
+    connector = AsyncMockMCPConnector(data_path=MOCK_DATA_PATH, max_open_files=2)
+    sync_connector = MockMCPConnector(data_path=MOCK_DATA_PATH)
+    builds = []
+    original_build = connector._build_index
+
+    async def counting_build():
+        builds.append(True)
+        return await original_build()
+
+    monkeypatch.setattr(connector, "_build_index", counting_build)
+
+    async def run_queries():
+        return await asyncio.gather(
+            *(connector.get_company_financials("entity_1001") for _ in range(5)),
+            connector.get_company_relationships("entity_2002"),
+        )
+
+    *financials, relationships = asyncio.run(run_queries())
+    assert len(builds) == 1
+    assert financials[0] == sync_connector.get_company_financials("entity_1001")
+    assert relationships == sync_connector.get_company_relationships("entity_2002")
+
+    # Konektor lze použít i z dalšího event loopu
+    resource = asyncio.run(connector.read_resource("entity_detail_mb_tool"))
+    assert resource["id"] == "entity_1001"
+
+
+def test_iter_json_records_streams_top_level_arrays(tmp_path):
+    """Streamovaný parser vrací stejné záznamy jako json.load i při malých blocích."""
+    records = [{"id": f"rel_{i}", "value": i * 1.5, "note": "ž" * i} for i in range(50)]
+    file_path = tmp_path / "relationships.json"
+    file_path.write_text(
+        json.dumps({"limit": 5, "next": None, "data": records, "size": 50}),
+        encoding="utf-8",
+    )
+
+    for chunk_size in (1, 7, 1024):
+        assert list(iter_json_records(str(file_path), chunk_size=chunk_size)) == (
+            records
+        )
+
+    # Předčasné ukončení přečte jen začátek souboru
+    first_two = list(itertools.islice(iter_json_records(str(file_path)), 2))
+    assert first_two == records[:2]
+
+    broken_path = tmp_path / "broken.json"
+    broken_path.write_text('{"data": [{"id": 1}, {"id": ', encoding="utf-8")
+    with pytest.raises(DataFormatError):
+        list(iter_json_records(str(broken_path), chunk_size=4))
+
+
+def test_iter_company_relationships_matches_index(connector):
+    """Streamované vztahy odpovídají vztahům z indexu a respektují limit."""
+    for company_id in ("entity_1001", "entity_2002"):
+        assert list(connector.iter_company_relationships(company_id)) == list(
+            connector.get_company_relationships(company_id)
+        )
+
+    suppliers = connector.iter_company_relationships(
+        "entity_2002", relationship_type="has_supplier", direction="outgoing"
+    )
+    assert [r["target"]["id"] for r in suppliers] == ["entity_3001"]
+    assert len(list(connector.iter_company_relationships("entity_1001", limit=1))) == 1
+
+
+def test_iter_company_relationships_limit_stops_before_end_of_file(tmp_path):
+    """S limitem se shoda vrátí hned a zbytek souboru se nečte."""
+    relationship = {
+        "id": "rel_1",
+        "source": {"id": "a", "label": "A"},
+        "target": {"id": "b", "label": "B"},
+        "type": "has_supplier",
+    }
+    # Konec souboru je poškozený; jeho přečtení by vyvolalo DataFormatError
+    (tmp_path / "relationships_a.json").write_text(
+        '{"data": [' + json.dumps(relationship) + ', {"id": ', encoding="utf-8"
+    )
+    connector = MockMCPConnector(data_path=str(tmp_path))
+
+    relationships = list(connector.iter_company_relationships("a", limit=1))
+    assert [r["id"] for r in relationships] == ["rel_1"]
+    with pytest.raises(DataFormatError):
+        list(connector.iter_company_relationships("a"))
+
+
+def test_edge_store_merges_relationship_formats():
+    """Vztah ve formátu "data" i "relationships" se uloží jednou a sloučí."""
+    store = EdgeStore()
+    store.add(
+        {
+            "id": "rel_1",
+            "source": {"id": "a", "label": "A"},
+            "target": {"id": "b", "label": "B"},
+            "type": "has_supplier",
+            "metadata": {"tier": 1},
+        }
+    )
+    store.add(
+        {
+            "id": "rel_1",
+            "from_id": "a",
+            "from_type": "company",
+            "to_id": "b",
+            "type": "has_supplier",
+            "attributes": {
+                "tier": {"data": [{"value": 2}]},
+                "hs_codes": {"data": [{"value": "4008.21"}, {"value": "4016.99"}]},
+            },
+            "rev_attributes": {"relationship_type": {"data": [{"value": "Customer"}]}},
+        }
+    )
+    store.add({"id": "rel_2", "from_id": "c", "to_id": "a", "type": "owned_by"})
+
+    assert len(store) == 2
+    assert store.edges[0] == {
+        "id": "rel_1",
+        "type": "has_supplier",
+        "source": {"id": "a", "label": "A", "type": "company"},
+        "target": {"id": "b", "label": "B"},
+        "metadata": {"tier": 1, "hs_codes": ["4008.21", "4016.99"]},
+        "reverse_metadata": {"relationship_type": "Customer"},
+    }
+    assert [r["id"] for r in store.edges_for("a", direction="incoming")] == ["rel_2"]
+    assert store.edges_for("a", "owned_by", "outgoing") == []
+    assert store.endpoints(1) == ("c", "a", "owned_by")
+
+
+def test_edge_store_parts_round_trip():
+    """Sloupcové části úložiště přežijí serializaci do JSON beze ztráty."""
+    connector = MockMCPConnector(data_path=MOCK_DATA_PATH)
+    store = connector._get_index().relationships
+
+    restored = EdgeStore.from_parts(json.loads(json.dumps(store.to_parts())))
+
+    assert list(restored.edges) == list(store.edges)
+    assert restored.edges_for("entity_2002") == store.edges_for("entity_2002")
+
+
+def _write_json(path, data, mtime_offset):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + mtime_offset))
+
+
+def _index_state(index):
+    def live_edges(store):
+        return sorted(
+            json.dumps(store.record(position), sort_keys=True)
+            for position in range(len(store))
+            if store.endpoints(position)[:2] != (None, None)
+        )
+
+    return {
+        "entities": dict(index.entities),
+        "label_index": index.label_index,
+        "identifier_index": {
+            identifier_type: values
+            for identifier_type, values in index.identifier_index.items()
+            if values
+        },
+        "families": index.families,
+        "internal_records": dict(index.internal_records),
+        "search_records": dict(index.search_records),
+        "supply_chain_items": dict(index.supply_chain_items),
+        "general_search_results": list(index.general_search_results),
+        "relationships": live_edges(index.relationships),
+        "general_relationships": live_edges(index.general_relationships),
+    }
+
+
+def test_reload_applies_changed_files_like_full_build(tmp_path):
+    """Obnovení po změně souborů dá stejný index jako nové sestavení."""
+    data_path = str(tmp_path / "data")
+    shutil.copytree(MOCK_DATA_PATH, data_path)
+    connector = MockMCPConnector(data_path=data_path)
+    old_index = connector._get_index()
+
+    with open(os.path.join(data_path, "entity_detail_adis.json")) as file:
+        detail = json.load(file)
+    detail["label"] = "ADIS RENAMED"
+    detail["identifiers"] = detail["identifiers"][1:]
+    _write_json(os.path.join(data_path, "entity_detail_adis.json"), detail, 10**9)
+    with open(os.path.join(data_path, "relationships_adis.json")) as file:
+        relationships = json.load(file)
+    relationships["data"] = relationships["data"][1:]
+    _write_json(
+        os.path.join(data_path, "relationships_adis.json"), relationships, 10**9
+    )
+    os.remove(os.path.join(data_path, "internal_bos_cze.json"))
+    os.remove(os.path.join(data_path, "entity_search_flidr.json"))
+    shutil.copy(
+        os.path.join(data_path, "supply_chain_mb_tool.json"),
+        os.path.join(data_path, "supply_chain_mb_tool_copy.json"),
+    )
+
+    result = connector.reload()
+
+    assert result.incremental
+    assert result.generation == connector.generation == 1
+    assert result.added == ["supply_chain_mb_tool_copy.json"]
+    assert result.changed == ["entity_detail_adis.json", "relationships_adis.json"]
+    assert result.removed == ["entity_search_flidr.json", "internal_bos_cze.json"]
+    index = connector._get_index()
+    assert index is not old_index
+    assert _index_state(index) == _index_state(
+        DataIndex.build(data_path, connector._load_json_file)
+    )
+    assert connector.find_companies_by_name("ADIS RENAMED")[0]["id"] == "entity_1004"
+    # DUNS byl jen v detailu, takže entita už není propojená s interními daty
+    with pytest.raises(EntityNotFoundError):
+        connector.get_company_by_identifier("duns", "361672367")
+    assert "entity_1004" not in index.internal_records
+
+    # Předchozí generace zůstala beze změny pro rozpracované dotazy
+    assert old_index.entities["entity_1004"]["label"] == "ADIS TACHOV, zp"
+    assert old_index.generation == 0
+
+
+def test_reload_without_changes_keeps_index(tmp_path):
+    """Bez změny souborů se index nevymění a generace zůstane stejná."""
+    data_path = str(tmp_path / "data")
+    shutil.copytree(MOCK_DATA_PATH, data_path)
+    connector = MockMCPConnector(data_path=data_path)
+    index = connector._get_index()
+
+    result = connector.reload()
+
+    assert not result.incremental
+    assert (result.generation, result.changed) == (0, [])
+    assert connector._get_index() is index
+    assert connector.last_reload is result
@@ -0,0 +1,60 @@
+"""Testy trigramového indexu názvů společností."""
+
+import os
+import sys
+
+# Přidání src do pythonpath pro import
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+)
+
+from memory_agent.trigram_index import TrigramIndex, similarity, trigrams
+
+
+def _brute_force(names, query, threshold):
+    query_grams = trigrams(query)
+    return {
+        name for name in names if similarity(query_grams, trigrams(name)) >= threshold
+    }
+
+
+def test_contained_name_scores_one():
+    """Název obsažený celými slovy v jiném názvu má podobnost 1.0."""
+    assert similarity(trigrams("mb tool"), trigrams("mb tool s r o")) == 1.0
+    assert similarity(trigrams("mb toll"), trigrams("mb tool s r o")) < 0.8
+
+
+def test_search_ranks_and_respects_threshold():
+    """Výsledky jsou seřazené podle podobnosti a práh se dodržuje."""
+    index = TrigramIndex()
+    index.bulk_add(["mb tool s r o", "mb tooling", "bos automotive", "adis tachov zp"])
+
+    results = index.search("mb tool", threshold=0.5, limit=None)
+    assert [name for name, _ in results][:2] == ["mb tool s r o", "mb tooling"]
+    assert all(score >= 0.5 for _, score in results)
+    assert index.search("mb tool", threshold=1.0, limit=None) == [
+        ("mb tool s r o", 1.0)
+    ]
+    assert index.search("mb tool", threshold=0.5, limit=1) == results[:1]
+
+
+def test_candidates_match_brute_force():
+    """Prefix filtering nevynechá žádný název nad prahem."""
+    names = [
+        "alfa beta gmbh",
+        "alfa gmbh",
+        "beta s r o",
+        "gama delta a s",
+        "al",
+        "delta",
+        "alfa beta gama delta",
+    ]
+    index = TrigramIndex()
+    index.bulk_add(names[:3])
+    for name in names[3:]:
+        index.add(name)
+
+    for query in ["alfa", "alfa beta", "gmbh", "delta gmbh", "al", "x"]:
+        for threshold in (0.3, 0.6, 0.8, 1.0):
+            found = {name for name, _ in index.search(query, threshold, limit=None)}
+            assert found == _brute_force(names, query, threshold), (query, threshold)